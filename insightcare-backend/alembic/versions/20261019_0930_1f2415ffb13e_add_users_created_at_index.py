@@ -0,0 +1,25 @@
+"""add_users_created_at_index
+
+Revision ID: 1f2415ffb13e
+Revises: b4576bc80a40
+Create Date: 2026-10-19 09:30:12.402117
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "1f2415ffb13e"
+down_revision = "b4576bc80a40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Backs the incremental refresh of the login bloom filter
+    op.create_index(op.f("ix_users_created_at"), "users", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_users_created_at"), table_name="users")
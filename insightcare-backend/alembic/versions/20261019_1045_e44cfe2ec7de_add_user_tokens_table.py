@@ -0,0 +1,106 @@
+"""add_user_tokens_table
+
+Revision ID: e44cfe2ec7de
+Revises: 1f2415ffb13e
+Create Date: 2026-10-19 10:45:37.218406
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import hashlib
+import uuid
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "e44cfe2ec7de"
+down_revision = "1f2415ffb13e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    user_tokens = op.create_table(
+        "user_tokens",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("token_hash", sa.String(length=64), nullable=False),
+        sa.Column("purpose", sa.String(length=32), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_user_tokens_hash_purpose",
+        "user_tokens",
+        ["token_hash", "purpose"],
+        unique=True,
+        postgresql_include=["user_id", "expires_at"],
+    )
+    op.create_index(op.f("ix_user_tokens_user_id"), "user_tokens", ["user_id"])
+    op.create_index(op.f("ix_user_tokens_expires_at"), "user_tokens", ["expires_at"])
+
+    # Carry over outstanding tokens, hashed, so links already sent keep working
+    conn = op.get_bind()
+    rows = []
+    for column, purpose in (
+        ("reset_token", "password_reset"),
+        ("verification_token", "email_verification"),
+    ):
+        result = conn.execute(
+            sa.text(
+                f"SELECT id, {column}, {column}_expires FROM users "
+                f"WHERE {column} IS NOT NULL AND {column}_expires > now()"
+            )
+        )
+        for user_id, token, expires_at in result:
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "token_hash": hashlib.sha256(token.encode("utf-8")).hexdigest(),
+                    "purpose": purpose,
+                    "expires_at": expires_at,
+                }
+            )
+    if rows:
+        op.bulk_insert(user_tokens, rows)
+
+    # Stop storing raw tokens
+    op.drop_column("users", "reset_token_expires")
+    op.drop_column("users", "reset_token")
+    op.drop_column("users", "verification_token_expires")
+    op.drop_column("users", "verification_token")
+
+
+def downgrade() -> None:
+    # Outstanding tokens can't be restored: only their hashes were kept
+    op.add_column(
+        "users", sa.Column("verification_token", sa.String(length=255), nullable=True)
+    )
+    op.add_column(
+        "users",
+        sa.Column(
+            "verification_token_expires", sa.DateTime(timezone=True), nullable=True
+        ),
+    )
+    op.add_column(
+        "users", sa.Column("reset_token", sa.String(length=255), nullable=True)
+    )
+    op.add_column(
+        "users",
+        sa.Column("reset_token_expires", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.drop_index(op.f("ix_user_tokens_expires_at"), table_name="user_tokens")
+    op.drop_index(op.f("ix_user_tokens_user_id"), table_name="user_tokens")
+    op.drop_index("ix_user_tokens_hash_purpose", table_name="user_tokens")
+    op.drop_table("user_tokens")
@@ -0,0 +1,29 @@
+"""add_users_role
+
+Revision ID: 7c3e9a51d2b8
+Revises: e44cfe2ec7de
+Create Date: 2026-10-19 14:00:41.918305
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "7c3e9a51d2b8"
+down_revision = "e44cfe2ec7de"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "role", sa.String(length=20), server_default="patient", nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "role")
@@ -0,0 +1,39 @@
+"""add_patients_listing_indexes
+
+Revision ID: 8a4f6c2d9e10
+Revises: 5b8d0e7f3a21
+Create Date: 2026-10-19 21:00:41.118305
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "8a4f6c2d9e10"
+down_revision = "5b8d0e7f3a21"
+branch_labels = None
+depends_on = None
+
+
+def _has_patients() -> bool:
+    # The patients table belongs to the legacy routes and is only present
+    # where they were deployed (created with create_all)
+    return sa.inspect(op.get_bind()).has_table("patients")
+
+
+def upgrade() -> None:
+    if not _has_patients():
+        return
+    # Keyset-paginated listing: filters by age, diagnosis and creation time
+    op.create_index(op.f("ix_patients_age"), "patients", ["age"])
+    op.create_index(op.f("ix_patients_created_at"), "patients", ["created_at"])
+    op.create_index("ix_patients_diagnosis_id", "patients", ["diagnosis", "id"])
+
+
+def downgrade() -> None:
+    if not _has_patients():
+        return
+    op.drop_index("ix_patients_diagnosis_id", table_name="patients")
+    op.drop_index(op.f("ix_patients_created_at"), table_name="patients")
+    op.drop_index(op.f("ix_patients_age"), table_name="patients")
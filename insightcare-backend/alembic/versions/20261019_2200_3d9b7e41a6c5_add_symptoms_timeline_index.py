@@ -0,0 +1,36 @@
+"""add_symptoms_timeline_index
+
+Revision ID: 3d9b7e41a6c5
+Revises: 8a4f6c2d9e10
+Create Date: 2026-10-19 22:00:07.542961
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "3d9b7e41a6c5"
+down_revision = "8a4f6c2d9e10"
+branch_labels = None
+depends_on = None
+
+
+def _has_symptoms() -> bool:
+    # Legacy-routes table, only present where they were deployed
+    return sa.inspect(op.get_bind()).has_table("symptoms")
+
+
+def upgrade() -> None:
+    if not _has_symptoms():
+        return
+    # Patient timelines: bucketed counts and pages over a created_at range
+    op.create_index(
+        "ix_symptoms_patient_id_created_at", "symptoms", ["patient_id", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    if not _has_symptoms():
+        return
+    op.drop_index("ix_symptoms_patient_id_created_at", table_name="symptoms")
@@ -0,0 +1,119 @@
+"""add_full_text_search
+
+Revision ID: b27e5a9c4f18
+Revises: 3d9b7e41a6c5
+Create Date: 2026-10-19 23:00:52.903614
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "b27e5a9c4f18"
+down_revision = "3d9b7e41a6c5"
+branch_labels = None
+depends_on = None
+
+# Same structures app/models/search_ddl.py creates for new tables
+POSTGRES = {
+    "diagnoses": [
+        "CREATE OR REPLACE FUNCTION symptoms_text(text[]) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE "
+        "AS $$ SELECT array_to_string($1, ' ') $$",
+        "ALTER TABLE diagnoses ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', symptoms_text(symptoms))) "
+        "STORED",
+        "CREATE INDEX IF NOT EXISTS ix_diagnoses_search_vector "
+        "ON diagnoses USING gin (search_vector)",
+    ],
+    "symptoms": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "ALTER TABLE symptoms ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', coalesce(text, ''))) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_symptoms_search_vector "
+        "ON symptoms USING gin (search_vector)",
+        "CREATE INDEX IF NOT EXISTS ix_symptoms_text_trgm "
+        "ON symptoms USING gin (text gin_trgm_ops)",
+    ],
+}
+
+SQLITE = {
+    "diagnoses": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS diagnoses_fts "
+        "USING fts5(symptoms, content='diagnoses', content_rowid='rowid')",
+        "CREATE TRIGGER IF NOT EXISTS diagnoses_fts_insert AFTER INSERT ON diagnoses "
+        "BEGIN INSERT INTO diagnoses_fts(rowid, symptoms) "
+        "VALUES (new.rowid, new.symptoms); END",
+        "CREATE TRIGGER IF NOT EXISTS diagnoses_fts_delete AFTER DELETE ON diagnoses "
+        "BEGIN INSERT INTO diagnoses_fts(diagnoses_fts, rowid, symptoms) "
+        "VALUES ('delete', old.rowid, old.symptoms); END",
+        # Index the existing rows
+        "INSERT INTO diagnoses_fts(diagnoses_fts) VALUES ('rebuild')",
+    ],
+    "symptoms": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS symptoms_fts "
+        "USING fts5(text, content='symptoms', content_rowid='id')",
+        "CREATE TRIGGER IF NOT EXISTS symptoms_fts_insert AFTER INSERT ON symptoms "
+        "BEGIN INSERT INTO symptoms_fts(rowid, text) VALUES (new.id, new.text); END",
+        "CREATE TRIGGER IF NOT EXISTS symptoms_fts_delete AFTER DELETE ON symptoms "
+        "BEGIN INSERT INTO symptoms_fts(symptoms_fts, rowid, text) "
+        "VALUES ('delete', old.id, old.text); END",
+        "CREATE TRIGGER IF NOT EXISTS symptoms_fts_update AFTER UPDATE OF text "
+        "ON symptoms BEGIN INSERT INTO symptoms_fts(symptoms_fts, rowid, text) "
+        "VALUES ('delete', old.id, old.text); "
+        "INSERT INTO symptoms_fts(rowid, text) VALUES (new.id, new.text); END",
+        "INSERT INTO symptoms_fts(symptoms_fts) VALUES ('rebuild')",
+    ],
+}
+
+
+def _statements(ddl: dict):
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for table, statements in ddl.items():
+        # symptoms belongs to the legacy routes and may not exist
+        if inspector.has_table(table):
+            yield from statements
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    ddl = {"postgresql": POSTGRES, "sqlite": SQLITE}.get(dialect, {})
+    for statement in _statements(ddl):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        drop = {
+            "diagnoses": [
+                "DROP INDEX IF EXISTS ix_diagnoses_search_vector",
+                "ALTER TABLE diagnoses DROP COLUMN IF EXISTS search_vector",
+                "DROP FUNCTION IF EXISTS symptoms_text(text[])",
+            ],
+            "symptoms": [
+                "DROP INDEX IF EXISTS ix_symptoms_text_trgm",
+                "DROP INDEX IF EXISTS ix_symptoms_search_vector",
+                "ALTER TABLE symptoms DROP COLUMN IF EXISTS search_vector",
+            ],
+        }
+    elif dialect == "sqlite":
+        drop = {
+            "diagnoses": [
+                "DROP TRIGGER IF EXISTS diagnoses_fts_insert",
+                "DROP TRIGGER IF EXISTS diagnoses_fts_delete",
+                "DROP TABLE IF EXISTS diagnoses_fts",
+            ],
+            "symptoms": [
+                "DROP TRIGGER IF EXISTS symptoms_fts_insert",
+                "DROP TRIGGER IF EXISTS symptoms_fts_delete",
+                "DROP TRIGGER IF EXISTS symptoms_fts_update",
+                "DROP TABLE IF EXISTS symptoms_fts",
+            ],
+        }
+    else:
+        drop = {}
+    for statement in _statements(drop):
+        op.execute(statement)
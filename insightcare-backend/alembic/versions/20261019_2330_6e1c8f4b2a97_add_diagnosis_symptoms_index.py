@@ -0,0 +1,52 @@
+"""add_diagnosis_symptoms_index
+
+Revision ID: 6e1c8f4b2a97
+Revises: b27e5a9c4f18
+Create Date: 2026-10-19 23:30:14.271853
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "6e1c8f4b2a97"
+down_revision = "b27e5a9c4f18"
+branch_labels = None
+depends_on = None
+
+# Same structures app/models/search_ddl.py creates for new tables
+POSTGRES = [
+    "CREATE INDEX IF NOT EXISTS ix_diagnoses_symptoms "
+    "ON diagnoses USING gin (symptoms)",
+]
+
+SQLITE = [
+    "CREATE TABLE IF NOT EXISTS diagnosis_symptoms ("
+    "symptom VARCHAR(100) NOT NULL, diagnosis_id CHAR(36) NOT NULL, "
+    "PRIMARY KEY (symptom, diagnosis_id)) WITHOUT ROWID",
+    "CREATE TRIGGER IF NOT EXISTS diagnosis_symptoms_insert AFTER INSERT "
+    "ON diagnoses BEGIN INSERT OR IGNORE INTO diagnosis_symptoms "
+    "SELECT value, new.id FROM json_each(new.symptoms); END",
+    "CREATE TRIGGER IF NOT EXISTS diagnosis_symptoms_delete AFTER DELETE "
+    "ON diagnoses BEGIN DELETE FROM diagnosis_symptoms "
+    "WHERE diagnosis_id = old.id; END",
+    # The existing diagnoses
+    "INSERT OR IGNORE INTO diagnosis_symptoms "
+    "SELECT json_each.value, diagnoses.id FROM diagnoses, json_each(diagnoses.symptoms)",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for statement in {"postgresql": POSTGRES, "sqlite": SQLITE}.get(dialect, []):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_diagnoses_symptoms")
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS diagnosis_symptoms_insert")
+        op.execute("DROP TRIGGER IF EXISTS diagnosis_symptoms_delete")
+        op.execute("DROP TABLE IF EXISTS diagnosis_symptoms")
@@ -0,0 +1,61 @@
+"""add_analytics_tables
+
+Revision ID: c84d2f6a1e35
+Revises: 6e1c8f4b2a97
+Create Date: 2026-10-20 00:00:41.538207
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "c84d2f6a1e35"
+down_revision = "6e1c8f4b2a97"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analytics_disease_daily",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("disease", sa.String(length=200), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "analytics_symptom_daily",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("symptom", sa.String(length=100), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "analytics_symptom_pairs",
+        sa.Column("symptom_a", sa.String(length=100), primary_key=True),
+        sa.Column("symptom_b", sa.String(length=100), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_analytics_symptom_pairs_symptom_b",
+        "analytics_symptom_pairs",
+        ["symptom_b"],
+    )
+    op.create_table(
+        "analytics_watermarks",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("diagnosis_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("rows_processed", sa.Integer(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analytics_watermarks")
+    op.drop_index(
+        "ix_analytics_symptom_pairs_symptom_b", table_name="analytics_symptom_pairs"
+    )
+    op.drop_table("analytics_symptom_pairs")
+    op.drop_table("analytics_symptom_daily")
+    op.drop_table("analytics_disease_daily")
@@ -0,0 +1,42 @@
+"""add_jobs_heartbeat
+
+Revision ID: e5a7c3d91b46
+Revises: c84d2f6a1e35
+Create Date: 2026-10-20 01:00:18.204571
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e5a7c3d91b46"
+down_revision = "c84d2f6a1e35"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Running jobs' lease: the stale sweep reads it instead of started_at
+    op.add_column(
+        "jobs", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.execute("UPDATE jobs SET heartbeat_at = started_at WHERE status = 'running'")
+    op.drop_index("ix_jobs_running_started_at", table_name="jobs")
+    op.create_index(
+        "ix_jobs_running_heartbeat_at",
+        "jobs",
+        ["heartbeat_at"],
+        postgresql_where=sa.text("status = 'running'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_running_heartbeat_at", table_name="jobs")
+    op.create_index(
+        "ix_jobs_running_started_at",
+        "jobs",
+        ["started_at"],
+        postgresql_where=sa.text("status = 'running'"),
+    )
+    op.drop_column("jobs", "heartbeat_at")
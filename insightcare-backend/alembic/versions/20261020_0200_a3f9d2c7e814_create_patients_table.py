@@ -0,0 +1,44 @@
+"""create_patients_table
+
+Revision ID: a3f9d2c7e814
+Revises: e5a7c3d91b46
+Create Date: 2026-10-20 02:00:09.731254
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a3f9d2c7e814"
+down_revision = "e5a7c3d91b46"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # /api/patient is served by the app now. Databases where the legacy
+    # routes ran already have the table (and its indexes, from 8a4f6c2d9e10).
+    if sa.inspect(op.get_bind()).has_table("patients"):
+        return
+    op.create_table(
+        "patients",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=120), nullable=False),
+        sa.Column("age", sa.Integer(), nullable=True),
+        sa.Column("blood_pressure", sa.Float(), nullable=True),
+        sa.Column("cholesterol", sa.Float(), nullable=True),
+        sa.Column("diagnosis", sa.String(length=255), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True
+        ),
+    )
+    op.create_index(op.f("ix_patients_id"), "patients", ["id"])
+    op.create_index(op.f("ix_patients_age"), "patients", ["age"])
+    op.create_index(op.f("ix_patients_created_at"), "patients", ["created_at"])
+    op.create_index("ix_patients_diagnosis_id", "patients", ["diagnosis", "id"])
+
+
+def downgrade() -> None:
+    # Left in place: it may hold data created before this revision
+    pass
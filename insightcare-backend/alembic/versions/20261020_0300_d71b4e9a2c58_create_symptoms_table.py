@@ -0,0 +1,86 @@
+"""create_symptoms_table
+
+Revision ID: d71b4e9a2c58
+Revises: a3f9d2c7e814
+Create Date: 2026-10-20 03:00:41.208734
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "d71b4e9a2c58"
+down_revision = "a3f9d2c7e814"
+branch_labels = None
+depends_on = None
+
+# Same structures app/models/search_ddl.py creates for new tables
+POSTGRES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE symptoms ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', coalesce(text, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_symptoms_search_vector "
+    "ON symptoms USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_symptoms_text_trgm "
+    "ON symptoms USING gin (text gin_trgm_ops)",
+]
+
+SQLITE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS symptoms_fts "
+    "USING fts5(text, content='symptoms', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS symptoms_fts_insert AFTER INSERT ON symptoms "
+    "BEGIN INSERT INTO symptoms_fts(rowid, text) VALUES (new.id, new.text); END",
+    "CREATE TRIGGER IF NOT EXISTS symptoms_fts_delete AFTER DELETE ON symptoms "
+    "BEGIN INSERT INTO symptoms_fts(symptoms_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER IF NOT EXISTS symptoms_fts_update AFTER UPDATE OF text "
+    "ON symptoms BEGIN INSERT INTO symptoms_fts(symptoms_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO symptoms_fts(rowid, text) VALUES (new.id, new.text); END",
+]
+
+
+def upgrade() -> None:
+    # /api/symptoms is served by the app now. Databases where the legacy
+    # routes ran already have the table, its indexes and search structures
+    # (3d9b7e41a6c5, b27e5a9c4f18); only reported_by changes, from the
+    # legacy integer ids to user UUIDs. Those never matched a user.
+    bind = op.get_bind()
+    if sa.inspect(bind).has_table("symptoms"):
+        if bind.dialect.name == "postgresql":
+            op.execute(
+                "ALTER TABLE symptoms ALTER COLUMN reported_by TYPE uuid USING NULL"
+            )
+        return
+    op.create_table(
+        "symptoms",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "patient_id", sa.Integer(), sa.ForeignKey("patients.id"), nullable=False
+        ),
+        sa.Column("reported_by", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("text", sa.String(length=2000), nullable=True),
+        sa.Column("structured", sa.JSON(), nullable=True),
+        sa.Column("severity", sa.String(length=50), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+    )
+    op.create_index(op.f("ix_symptoms_id"), "symptoms", ["id"])
+    op.create_index(op.f("ix_symptoms_patient_id"), "symptoms", ["patient_id"])
+    op.create_index(
+        "ix_symptoms_patient_id_created_at", "symptoms", ["patient_id", "created_at"]
+    )
+    ddl = {"postgresql": POSTGRES, "sqlite": SQLITE}.get(bind.dialect.name, [])
+    for statement in ddl:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    # Left in place: it may hold data created before this revision
+    pass
@@ -0,0 +1,122 @@
+# app/api/analytics.py
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from app.database import get_db, get_read_db
+from app.models.user import User
+from app.schemas.analytics_schema import (
+    AnalyticsRefreshOut,
+    AnalyticsStatus,
+    DiseaseTrendsResponse,
+    SymptomCooccurrenceResponse,
+    SymptomFrequencyResponse,
+)
+from app.schemas.job_schema import JobOut
+from app.services.analytics_service import (
+    analytics_window,
+    get_analytics_status,
+    get_disease_trends,
+    get_symptom_cooccurrence,
+    get_symptom_frequency,
+    rebuild_analytics,
+    refresh_analytics,
+)
+from app.services.export_service import ARROW, PARQUET
+from app.services.job_queue import enqueue_job, serialize_job
+from app.tasks import EXPORT_JOB
+from app.utils.dependencies import get_current_admin
+from app.utils.serialization import ORJSONResponse
+
+router = APIRouter(prefix="/admin/analytics", tags=["Analytics"])
+
+
+@router.get("/status", response_model=AnalyticsStatus)
+def analytics_status(
+    admin: User = Depends(get_current_admin), db: Session = Depends(get_read_db)
+):
+    """How current the aggregates are. Admin only."""
+    return get_analytics_status(db)
+
+
+@router.post("/refresh", response_model=AnalyticsRefreshOut)
+def refresh(
+    full: bool = Query(False, description="Recount every diagnosis"),
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Count the diagnoses created since the last refresh now, rather than at
+    the next background refresh. `full=true` rebuilds the aggregates from
+    scratch, e.g. after diagnoses were deleted. Admin only.
+    """
+    processed = rebuild_analytics(db) if full else refresh_analytics(db)
+    return {"processed": processed, **get_analytics_status(db)}
+
+
+@router.get("/diseases", response_model=DiseaseTrendsResponse)
+def disease_trends(
+    start: Optional[date] = Query(None, description="First day (default: 30 days ago)"),
+    end: Optional[date] = Query(None, description="Last day (default: today, UTC)"),
+    top: int = Query(10, ge=1, le=100, description="Most frequent diseases"),
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Daily diagnosis counts per top predicted disease. Read from the
+    precomputed aggregates, as of `as_of`. Admin only.
+    """
+    start, end = analytics_window(start, end)
+    return get_disease_trends(db, start, end, top)
+
+
+@router.get("/symptoms", response_model=SymptomFrequencyResponse)
+def symptom_frequency(
+    start: Optional[date] = Query(None, description="First day (default: 30 days ago)"),
+    end: Optional[date] = Query(None, description="Last day (default: today, UTC)"),
+    limit: int = Query(50, ge=1, le=500, description="Most frequent symptoms"),
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_read_db),
+):
+    """
+    How many diagnoses listed each symptom. Read from the precomputed
+    aggregates, as of `as_of`. Admin only.
+    """
+    start, end = analytics_window(start, end)
+    return get_symptom_frequency(db, start, end, limit)
+
+
+@router.get("/cooccurrence", response_model=SymptomCooccurrenceResponse)
+def symptom_cooccurrence(
+    symptom: Optional[str] = Query(
+        None, min_length=2, max_length=100, description="Only pairs with this symptom"
+    ),
+    limit: int = Query(50, ge=1, le=500, description="Most frequent pairs"),
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Symptoms most often reported together, all time. Read from the
+    precomputed aggregates, as of `as_of`. Admin only.
+    """
+    return get_symptom_cooccurrence(db, symptom, limit)
+
+
+@router.post("/export", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
+def export_diagnosis_history(
+    format: str = Query(PARQUET, pattern=f"^({PARQUET}|{ARROW})$"),
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Queue a columnar export of the diagnoses created since the last one, to
+    month-partitioned Parquet (or Arrow IPC) files in the workers'
+    EXPORT_DIR. `python -m app.export` does the same from a shell. Admin
+    only.
+    """
+    job = enqueue_job(db, EXPORT_JOB, {"format": format}, user_id=admin.id)
+    return ORJSONResponse(
+        serialize_job(job),
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"/api/jobs/{job.id}"},
+    )
@@ -1,6 +1,9 @@
 # app/api/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+import structlog
+import time
 from app.database import get_db
 from app.schemas.user_schema import (
     UserRegister,
@@ -17,6 +20,10 @@ from app.utils.dependencies import get_current_user
 from app.utils.security import create_access_token
 from app.models.user import User
 from app.utils.audit import AuditLogger
+from app.utils.login_throttle import login_throttle
+from app.middleware.rate_limit import get_client_ip, trusted_proxy_networks
+
+logger = structlog.get_logger()
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -40,6 +47,7 @@ async def register(
     """
     try:
         user = await register_user(db, user_data)
+        await login_throttle.add_email(user.email)
 
         # Log successful registration
         AuditLogger.log_registration(db, request, str(user.id), user.email)
@@ -64,39 +72,89 @@ async def register(
         )
 
 
+async def _record_login_failure(
+    db: Session, request: Request, email: str, ip_address: str
+):
+    """Count a failed login; audit the client once it gets locked out."""
+    if await login_throttle.record_failure(email, ip_address):
+        logger.warning("Credential stuffing suspected", ip_address=ip_address)
+        await run_in_threadpool(
+            AuditLogger.log_credential_stuffing,
+            db,
+            request,
+            ip_address,
+            login_throttle.max_per_ip,
+        )
+
+
 @router.post("/login", response_model=LoginResponse)
-def login(login_data: UserLogin, request: Request, db: Session = Depends(get_db)):
+async def login(login_data: UserLogin, request: Request, db: Session = Depends(get_db)):
     """
     Authenticate user and get JWT access token.
 
     - **email**: User email address
     - **password**: User password
 
-    Returns JWT token and user info. Raises 401 if credentials invalid.
+    Returns JWT token and user info. Raises 401 if credentials invalid,
+    429 after too many failed attempts for the email or client address.
     """
-    try:
-        user, access_token = authenticate_user(db, login_data)
+    ip_address = get_client_ip(request, trusted_proxy_networks)
 
-        # Log successful login
-        AuditLogger.log_login_success(db, request, str(user.id), user.email)
+    # Throttled attempts are refused before any DB or bcrypt work
+    retry_after = await login_throttle.check(login_data.email, ip_address)
+    if retry_after:
+        logger.info("Login throttled", email=login_data.email, ip_address=ip_address)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts. Please try again later.",
+            headers={"Retry-After": str(retry_after)},
+        )
 
-        return LoginResponse(
-            access_token=access_token,
-            token_type="Bearer",
-            user=UserOut.model_validate(user),
+    # Unknown emails are answered from the bloom filter, in the same time
+    # a real password check takes, and without an audit row per attempt
+    if not await login_throttle.might_exist(db, login_data.email):
+        await login_throttle.equalize()
+        await _record_login_failure(db, request, login_data.email, ip_address)
+        logger.info("Login failed for unknown account", ip_address=ip_address)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password"
         )
+
+    started = time.perf_counter()
+    try:
+        user, access_token = await run_in_threadpool(authenticate_user, db, login_data)
     except HTTPException as e:
+        if e.status_code == status.HTTP_401_UNAUTHORIZED:
+            login_throttle.observe_verify(time.perf_counter() - started)
+            await _record_login_failure(db, request, login_data.email, ip_address)
         # Log failed login attempt
-        AuditLogger.log_login_failure(db, request, login_data.email, str(e.detail))
+        await run_in_threadpool(
+            AuditLogger.log_login_failure, db, request, login_data.email, str(e.detail)
+        )
         raise
     except Exception as e:
         # Log failed login attempt
-        AuditLogger.log_login_failure(db, request, login_data.email, str(e))
+        await run_in_threadpool(
+            AuditLogger.log_login_failure, db, request, login_data.email, str(e)
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Login failed: {str(e)}",
         )
 
+    await login_throttle.record_success(login_data.email)
+
+    # Log successful login
+    await run_in_threadpool(
+        AuditLogger.log_login_success, db, request, str(user.id), user.email
+    )
+
+    return LoginResponse(
+        access_token=access_token,
+        token_type="Bearer",
+        user=UserOut.model_validate(user),
+    )
+
 
 @router.get("/me", response_model=UserProfile)
 def get_profile(current_user: User = Depends(get_current_user)):
@@ -1,28 +1,87 @@
 # app/api/diagnosis.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import uuid
-from app.database import get_db
+from app.database import get_db, get_read_db, open_session
 from app.schemas.diagnosis_schema import (
     DiagnosisRequest,
     DiagnosisOut,
     DiagnosisHistoryResponse,
-    DiagnosisHistoryItem,
-    PredictionOut,
+    DiagnosisSearchResponse,
+    DiagnosisCohortResponse,
 )
 from app.services.diagnosis_service import (
     create_diagnosis,
+    find_diagnoses_by_symptoms,
     get_user_diagnosis_history,
+    get_history_version,
     get_diagnosis_by_id,
+    get_diagnosis_created_at,
+    history_entry,
+    iter_ai_diagnosis,
 )
+from app.config import EVENTS_HEARTBEAT_SECONDS
+from app.services.events import (
+    KEEP_ALIVE,
+    SSE_HEADERS,
+    event_bus,
+    format_event,
+    user_channel,
+)
+from app.services.lifecycle import shutdown_coordinator
+from app.services.search_service import search_diagnoses
+from app.schemas.job_schema import JobOut
+from app.services.job_queue import enqueue_job, serialize_job
+from app.tasks import DIAGNOSIS_JOB
 from app.utils.dependencies import get_current_user
 from app.models.user import User
+from app.models.diagnosis import Diagnosis
+from app.utils.serialization import ORJSONResponse
+from app.utils.http_cache import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
 
 router = APIRouter(prefix="/diagnosis", tags=["Diagnosis"])
 # Create a separate router for frontend compatibility (without /diagnosis prefix)
 diagnose_router = APIRouter(tags=["Diagnosis"])
 
+DISCLAIMER = DiagnosisOut.model_fields["disclaimer"].default
+
+
+# Responses below are built from rows this service wrote itself, so they are
+# returned as ORJSONResponse without a second round of Pydantic validation;
+# the response_model declarations keep documenting their shape.
+
+
+def serialize_diagnosis(diagnosis: Diagnosis) -> dict:
+    """DiagnosisOut-shaped dict for a stored diagnosis."""
+    return {
+        "diagnosis_id": diagnosis.id,
+        "timestamp": diagnosis.created_at,
+        "symptoms_analyzed": diagnosis.symptoms,
+        "predictions": diagnosis.predictions,
+        "disclaimer": DISCLAIMER,
+    }
+
+
+def serialize_history(
+    diagnoses: List[Diagnosis], total: int, page: int, limit: int
+) -> dict:
+    """DiagnosisHistoryResponse-shaped dict for a page of diagnoses."""
+    return {
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "results": [history_entry(diag) for diag in diagnoses],
+    }
+
 
 @router.post("/analyze", response_model=DiagnosisOut)
 def analyze_symptoms(
@@ -42,16 +101,7 @@ def analyze_symptoms(
     """
     try:
         diagnosis = create_diagnosis(db, current_user.id, request_data)
-
-        # Convert to response model
-        predictions = [PredictionOut(**pred) for pred in diagnosis.predictions]
-
-        return DiagnosisOut(
-            diagnosis_id=diagnosis.id,
-            timestamp=diagnosis.created_at,
-            symptoms_analyzed=diagnosis.symptoms,
-            predictions=predictions,
-        )
+        return ORJSONResponse(serialize_diagnosis(diagnosis))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -72,12 +122,121 @@ def diagnose_symptoms(
     return analyze_symptoms(request_data, current_user, db)
 
 
+@router.post("/stream")
+async def stream_diagnosis(
+    request_data: DiagnosisRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Analyze symptoms, streaming progress as Server-Sent Events.
+
+    Takes the same body as `/analyze`. Events, in order:
+    - `accepted`: the request passed validation
+    - `normalized`: the symptoms as they will be analyzed
+    - `partial`: the top predictions so far (one or more)
+    - `final`: the saved diagnosis, shaped like the `/analyze` response
+    - `error`: sent instead of `final` if the analysis failed
+
+    Requires valid JWT token.
+    """
+
+    user_id = current_user.id
+
+    async def events():
+        # Its own session: the body is sent after the dependencies' are closed
+        db = open_session(request)
+        try:
+            yield format_event(
+                "accepted", {"symptom_count": len(request_data.symptoms)}
+            )
+            yield format_event("normalized", {"symptoms": request_data.symptoms})
+            predictions = []
+            for predictions in iter_ai_diagnosis(request_data.symptoms):
+                yield format_event("partial", {"predictions": predictions})
+            diagnosis = await run_in_threadpool(
+                create_diagnosis,
+                db,
+                user_id,
+                request_data,
+                predictions=predictions,
+            )
+            yield format_event("final", serialize_diagnosis(diagnosis))
+        except Exception as e:
+            yield format_event(
+                "error", {"detail": f"Diagnosis analysis failed: {str(e)}"}
+            )
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+
+@router.get("/events")
+async def stream_history_events(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Stream the user's new diagnoses as Server-Sent Events (dashboards).
+
+    Each `history` event carries one history entry, shaped like the items of
+    `/history` results, as soon as it is saved: by `/analyze`, `/stream` or
+    a background job, on any worker. Comment lines keep idle connections
+    open. Requires valid JWT token.
+    """
+
+    # Nothing from the dependencies' session is used once streaming starts
+    channel = user_channel(current_user.id)
+
+    async def events():
+        with event_bus.subscribe(channel) as subscription:
+            yield KEEP_ALIVE
+            while not shutdown_coordinator.draining:
+                event = await subscription.get(EVENTS_HEARTBEAT_SECONDS)
+                if await request.is_disconnected():
+                    return
+                yield event.encode() if event is not None else KEEP_ALIVE
+            # EventSource clients reconnect (to another worker)
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+
+@router.post("/jobs", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
+def enqueue_diagnosis(
+    request_data: DiagnosisRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Queue a diagnosis to run on a background worker.
+
+    Takes the same body as `/analyze` and returns at once with a job id.
+    Poll `GET /api/jobs/{job_id}` (the `Location` header) or subscribe to
+    `GET /api/jobs/{job_id}/events`; the finished job's result holds the
+    `diagnosis_id`. Requires valid JWT token.
+    """
+    job = enqueue_job(
+        db, DIAGNOSIS_JOB, request_data.model_dump(), user_id=current_user.id
+    )
+    return ORJSONResponse(
+        serialize_job(job),
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"/api/jobs/{job.id}"},
+    )
+
+
 @router.get("/history", response_model=DiagnosisHistoryResponse)
 def get_history(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=50, description="Items per page (max 50)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Get paginated diagnosis history for current user.
@@ -86,33 +245,21 @@ def get_history(
     - **limit**: Items per page (default 10, max 50)
 
     Returns list of past diagnoses with timestamps and top predictions.
-    Requires valid JWT token.
+    Responses carry an ETag; send it back in `If-None-Match` to get an empty
+    304 when nothing changed. Requires valid JWT token.
     """
     try:
-        diagnoses, total = get_user_diagnosis_history(db, current_user.id, page, limit)
-
-        # Convert to history items
-        results = []
-        for diag in diagnoses:
-            top_pred = (
-                diag.predictions[0]
-                if diag.predictions
-                else {"disease": "Unknown", "confidence": 0.0}
-            )
-            results.append(
-                DiagnosisHistoryItem(
-                    diagnosis_id=diag.id,
-                    timestamp=diag.created_at,
-                    symptoms=diag.symptoms,
-                    top_prediction={
-                        "disease": top_pred["disease"],
-                        "confidence": top_pred["confidence"],
-                    },
-                )
-            )
+        total, newest = get_history_version(db, current_user.id)
+        etag = make_etag("history", current_user.id, total, newest, page, limit)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, REVALIDATE_CACHE_CONTROL)
 
-        return DiagnosisHistoryResponse(
-            total=total, page=page, limit=limit, results=results
+        diagnoses, total = get_user_diagnosis_history(
+            db, current_user.id, page, limit, total=total
+        )
+        return ORJSONResponse(
+            serialize_history(diagnoses, total, page, limit),
+            headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
         )
     except Exception as e:
         raise HTTPException(
@@ -121,11 +268,65 @@ def get_history(
         )
 
 
+@router.get("/search", response_model=DiagnosisSearchResponse)
+def search_diagnosis_symptoms(
+    q: str = Query(..., min_length=2, max_length=200, description="Search words"),
+    page: int = Query(1, ge=1, le=100, description="Page number"),
+    limit: int = Query(20, ge=1, le=50, description="Items per page (max 50)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Search diagnoses by symptom, best matches first.
+
+    Every word must match the start of a word in the diagnosis's symptoms
+    (`fev` finds "fever"). Each result lists the symptoms that matched.
+    Doctors and admins search all diagnoses; other users their own.
+    Requires valid JWT token.
+    """
+    user_id = None if current_user.role in ("doctor", "admin") else current_user.id
+    results, has_more = search_diagnoses(db, q, user_id, page, limit)
+    return ORJSONResponse(
+        {"page": page, "limit": limit, "has_more": has_more, "results": results}
+    )
+
+
+@router.get("/cohort", response_model=DiagnosisCohortResponse)
+def get_symptom_cohort(
+    # Checked by the service: required list parameters break 422 responses
+    symptom: List[str] = Query(
+        [], description="Symptoms (repeat the parameter, 1 to 20)"
+    ),
+    match: str = Query(
+        "all", pattern="^(all|any)$", description="Include all or any of them"
+    ),
+    limit: int = Query(50, ge=1, le=200, description="Items per page (max 200)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the last page"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Diagnoses whose symptoms include all (or any) of the given ones, newest
+    first.
+
+    Symptoms match exactly, case-insensitively
+    (`?symptom=fever&symptom=cough`). `total` is given on the first page
+    only. Doctors and admins see all diagnoses; other users their own.
+    Requires valid JWT token.
+    """
+    user_id = None if current_user.role in ("doctor", "admin") else current_user.id
+    items, total, next_cursor = find_diagnoses_by_symptoms(
+        db, symptom, match, user_id, limit, cursor
+    )
+    return ORJSONResponse({"total": total, "items": items, "next_cursor": next_cursor})
+
+
 @router.get("/{diagnosis_id}", response_model=DiagnosisOut)
 def get_diagnosis_detail(
     diagnosis_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Get detailed diagnosis by ID.
@@ -134,17 +335,23 @@ def get_diagnosis_detail(
 
     Returns full diagnosis details including all predictions.
     Only accessible by the user who created it. Raises 404 if not found.
+    Diagnoses never change, so responses are cacheable (`immutable`) and a
+    matching `If-None-Match` gets a 304 without loading the diagnosis.
     Requires valid JWT token.
     """
-    diagnosis = get_diagnosis_by_id(db, diagnosis_id, current_user.id)
-
-    predictions = [PredictionOut(**pred) for pred in diagnosis.predictions]
+    if if_none_match:
+        created_at = get_diagnosis_created_at(db, diagnosis_id, current_user.id)
+        etag = make_etag("diagnosis", diagnosis_id, created_at)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, IMMUTABLE_CACHE_CONTROL)
 
-    return DiagnosisOut(
-        diagnosis_id=diagnosis.id,
-        timestamp=diagnosis.created_at,
-        symptoms_analyzed=diagnosis.symptoms,
-        predictions=predictions,
+    diagnosis = get_diagnosis_by_id(db, diagnosis_id, current_user.id)
+    return ORJSONResponse(
+        serialize_diagnosis(diagnosis),
+        headers={
+            "ETag": make_etag("diagnosis", diagnosis.id, diagnosis.created_at),
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        },
     )
 
 
@@ -167,10 +374,11 @@ def get_history_frontend(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=50, description="Items per page (max 50)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Get diagnosis history endpoint for frontend compatibility.
     Maps to /api/history
     """
-    return get_history(page, limit, current_user, db)
+    return get_history(page, limit, current_user, db, if_none_match)
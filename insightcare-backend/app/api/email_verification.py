@@ -2,10 +2,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from datetime import datetime, timedelta, timezone
-import secrets
+from datetime import timedelta
 from app.database import get_db
 from app.models.user import User
+from app.services.token_service import issue_token, lookup_token, EMAIL_VERIFICATION
 from app.utils.email import send_verification_email
 from app.utils.dependencies import get_current_user
 import structlog
@@ -24,29 +24,26 @@ def verify_email(request: VerifyEmailRequest, db: Session = Depends(get_db)):
     """
     Verify email address using token from email.
     """
-    # Find user by verification token
-    user = db.query(User).filter(User.verification_token == request.token).first()
+    # Find verification token (indexed lookup on its hash)
+    record = lookup_token(db, request.token, EMAIL_VERIFICATION)
 
-    if not user:
+    if not record:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired verification token",
         )
 
     # Check token expiration
-    if (
-        not user.verification_token_expires
-        or user.verification_token_expires < datetime.now(timezone.utc)
-    ):
+    if record.is_expired():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Verification token has expired",
         )
 
     # Verify email
+    user = db.get(User, record.user_id)
     user.is_verified = True
-    user.verification_token = None
-    user.verification_token_expires = None
+    db.delete(record)
 
     db.commit()
 
@@ -65,11 +62,9 @@ async def resend_verification(
     if current_user.is_verified:
         return {"message": "Email is already verified"}
 
-    # Generate new verification token
-    verification_token = secrets.token_urlsafe(32)
-    current_user.verification_token = verification_token
-    current_user.verification_token_expires = datetime.now(timezone.utc) + timedelta(
-        hours=24
+    # Generate new verification token (replaces any outstanding one)
+    verification_token = issue_token(
+        db, current_user.id, EMAIL_VERIFICATION, timedelta(hours=24)
     )
 
     db.commit()
@@ -1,26 +1,27 @@
 # app/api/health.py
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from datetime import datetime, timezone
-from app.database import get_db
+from app.services.health_prober import health_prober
+from app.services.lifecycle import shutdown_coordinator
 
 router = APIRouter(tags=["Health"])
 
+# Mounted at the root for orchestrator probes
+probe_router = APIRouter(tags=["Health"])
+
 
 @router.get("/health")
-def health_check(db: Session = Depends(get_db)):
+def health_check():
     """
     Health check endpoint to verify API and database status.
 
-    Returns API status, timestamp, version, and database connection status.
+    Returns API status, timestamp, version, and the database status from the
+    last background probe (no query is run per request).
     """
-    # Test database connection
-    try:
-        db.execute(text("SELECT 1"))
-        db_status = "connected"
-    except Exception as e:
-        db_status = f"disconnected: {str(e)}"
+    db_status = {"ok": "connected", "down": "disconnected"}.get(
+        health_prober.check_status("database"), "unknown"
+    )
 
     return {
         "status": "healthy",
@@ -28,3 +29,26 @@ def health_check(db: Session = Depends(get_db)):
         "version": "1.0.0",
         "database": db_status,
     }
+
+
+@probe_router.get("/livez")
+async def liveness():
+    """Liveness: the worker's event loop is answering. No I/O."""
+    return {"status": "alive"}
+
+
+@probe_router.get("/readyz")
+async def readiness():
+    """
+    Readiness from the cached dependency snapshot.
+
+    503 until the first probe completes, while a critical dependency is down,
+    if the snapshot has gone stale, or once the worker is shutting down.
+    """
+    snapshot = health_prober.snapshot()
+    if shutdown_coordinator.draining:
+        snapshot.update(ready=False, reason="draining")
+    return JSONResponse(
+        status_code=200 if snapshot["ready"] else 503,
+        content={"status": "ready" if snapshot["ready"] else "not ready", **snapshot},
+    )
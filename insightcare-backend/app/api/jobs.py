@@ -0,0 +1,117 @@
+# app/api/jobs.py
+import time
+import uuid
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import JOB_EVENTS_HEARTBEAT_SECONDS, JOB_EVENTS_POLL_SECONDS
+from app.database import get_db, open_session
+from app.models.user import User
+from app.schemas.job_schema import JobOut
+from app.services.events import (
+    KEEP_ALIVE,
+    SSE_HEADERS,
+    event_bus,
+    format_event,
+    job_channel,
+)
+from app.services.job_queue import get_user_job, serialize_job
+from app.services.lifecycle import shutdown_coordinator
+from app.utils.dependencies import get_current_user
+from app.utils.serialization import ORJSONResponse, dumps
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job_status(
+    job_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get a background job's status; poll until it has `succeeded` or `failed`.
+
+    Only accessible by the user who queued it. Raises 404 if not found.
+    """
+    job = get_user_job(db, job_id, current_user.id)
+    return ORJSONResponse(serialize_job(job))
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: uuid.UUID,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream a job's status changes as Server-Sent Events.
+
+    Sends a `status` event with the current state, then one per change, and
+    closes after `succeeded` or `failed`. Jobs may also send `progress`
+    events while running. Comment lines keep idle connections open. Raises
+    404 if the job isn't the user's.
+    """
+
+    user_id = current_user.id
+
+    def poll(session: Session) -> dict:
+        try:
+            return serialize_job(get_user_job(session, job_id, user_id))
+        finally:
+            # Fresh snapshot next time; don't hold a connection between polls
+            session.rollback()
+
+    # Subscribe before reading the state, so no change falls in between
+    subscription = event_bus.subscribe(job_channel(job_id))
+    try:
+        first = await run_in_threadpool(poll, db)
+    except Exception:
+        subscription.close()
+        raise
+
+    # Changes are pushed; the state is still re-read now and then in case an
+    # event was missed, often if other processes' events can't reach this one
+    recheck = (
+        JOB_EVENTS_HEARTBEAT_SECONDS if event_bus.bridged else JOB_EVENTS_POLL_SECONDS
+    )
+
+    async def events():
+        # Its own session: the body is sent after the dependencies' are closed
+        stream_db = open_session(request)
+        try:
+            with subscription:
+                state = dumps(first)
+                yield format_event("status", first)
+                done = first["status"] in ("succeeded", "failed")
+                last_sent = time.monotonic()
+                while not done:
+                    event = await subscription.get(recheck)
+                    if await request.is_disconnected() or shutdown_coordinator.draining:
+                        # EventSource clients reconnect (to another worker)
+                        return
+                    if event is not None and event.event != "status":
+                        yield event.encode()
+                        last_sent = time.monotonic()
+                        continue
+                    current = (
+                        event.json()
+                        if event is not None
+                        else await run_in_threadpool(poll, stream_db)
+                    )
+                    if dumps(current) != state:
+                        state = dumps(current)
+                        yield format_event("status", current)
+                        done = current["status"] in ("succeeded", "failed")
+                        last_sent = time.monotonic()
+                    elif time.monotonic() - last_sent >= JOB_EVENTS_HEARTBEAT_SECONDS:
+                        yield KEEP_ALIVE
+                        last_sent = time.monotonic()
+        finally:
+            stream_db.close()
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers=SSE_HEADERS
+    )
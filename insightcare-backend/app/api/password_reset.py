@@ -2,10 +2,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
-from datetime import datetime, timedelta, timezone
-import secrets
+from datetime import timedelta
 from app.database import get_db
 from app.models.user import User
+from app.services.token_service import issue_token, lookup_token, PASSWORD_RESET
 from app.utils.email import send_password_reset_email
 from app.utils.security import get_password_hash
 
@@ -71,10 +71,8 @@ async def forgot_password(
     user = db.query(User).filter(User.email == request.email).first()
 
     if user:
-        # Generate reset token
-        reset_token = secrets.token_urlsafe(32)
-        user.reset_token = reset_token
-        user.reset_token_expires = datetime.now(timezone.utc) + timedelta(hours=1)
+        # Generate reset token (replaces any outstanding one)
+        reset_token = issue_token(db, user.id, PASSWORD_RESET, timedelta(hours=1))
 
         db.commit()
 
@@ -94,19 +92,17 @@ def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db))
     """
     Reset password using token from email.
     """
-    # Find user by reset token
-    user = db.query(User).filter(User.reset_token == request.token).first()
+    # Find reset token (indexed lookup on its hash)
+    record = lookup_token(db, request.token, PASSWORD_RESET)
 
-    if not user:
+    if not record:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired reset token",
         )
 
     # Check token expiration
-    if not user.reset_token_expires or user.reset_token_expires < datetime.now(
-        timezone.utc
-    ):
+    if record.is_expired():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Reset token has expired"
         )
@@ -119,9 +115,9 @@ def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db))
         )
 
     # Update password
+    user = db.get(User, record.user_id)
     user.password_hash = get_password_hash(request.new_password)
-    user.reset_token = None
-    user.reset_token_expires = None
+    db.delete(record)
 
     db.commit()
 
@@ -0,0 +1,102 @@
+# app/api/patients.py
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.database import get_db, get_read_db
+from app.models.user import User
+from app.schemas.patient_schema import PatientCreate, PatientPage, PatientResponse
+from app.services.bulk_import import PATIENT_IMPORT, detect_format, import_stream
+from app.services.patient_service import create_patient, get_patient, list_patient_page
+from app.utils.audit import AuditLogger
+from app.utils.dependencies import require_roles
+from app.utils.serialization import ORJSONResponse
+
+router = APIRouter(prefix="/patient", tags=["Patients"])
+
+
+@router.get("/", response_model=PatientPage)
+def list_patients(
+    limit: int = Query(50, ge=1, le=200, description="Items per page (max 200)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the last page"),
+    min_age: Optional[int] = Query(None, ge=0),
+    max_age: Optional[int] = Query(None, ge=0),
+    diagnosis: Optional[str] = Query(None, max_length=255),
+    created_after: Optional[datetime] = Query(None),
+    created_before: Optional[datetime] = Query(None),
+    current_user: User = Depends(require_roles("doctor", "admin")),
+    db: Session = Depends(get_read_db),
+):
+    """
+    List patients, newest first, one page at a time.
+
+    Pass the response's `next_cursor` as `cursor` for the next page; it is
+    null on the last one. Filters can be combined. Doctors and admins only.
+    """
+    items, next_cursor = list_patient_page(
+        db,
+        limit=limit,
+        cursor=cursor,
+        min_age=min_age,
+        max_age=max_age,
+        diagnosis=diagnosis,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+@router.post("/", response_model=PatientResponse, status_code=status.HTTP_201_CREATED)
+def add_patient(
+    patient_data: PatientCreate,
+    current_user: User = Depends(require_roles("doctor", "admin")),
+    db: Session = Depends(get_db),
+):
+    """Create a patient record. Doctors and admins only."""
+    return create_patient(db, patient_data)
+
+
+@router.post("/import")
+async def import_patients(
+    request: Request,
+    current_user: User = Depends(require_roles("doctor", "admin")),
+    db: Session = Depends(get_db),
+):
+    """
+    Bulk-create patients from a CSV (`text/csv`, header row first) or NDJSON
+    (`application/x-ndjson`) upload, streamed rather than buffered.
+
+    Valid rows are imported even when others fail; the response counts both
+    and lists each failed row's number and errors. One audit entry records
+    the whole import. Doctors and admins only.
+    """
+    report = await import_stream(
+        db,
+        request.stream(),
+        detect_format(request.headers.get("content-type")),
+        PATIENT_IMPORT,
+    )
+    await run_in_threadpool(
+        AuditLogger.log_from_request,
+        db=db,
+        request=request,
+        event_type="bulk_import",
+        event_category="data",
+        description=f"Imported {report.imported} of {report.total} patients",
+        status="success" if report.imported else "failure",
+        user_id=str(current_user.id),
+        user_email=current_user.email,
+        metadata=report.summary(),
+    )
+    return ORJSONResponse(report.to_dict())
+
+
+@router.get("/{patient_id}", response_model=PatientResponse)
+def get_patient_detail(
+    patient_id: int,
+    current_user: User = Depends(require_roles("doctor", "admin")),
+    db: Session = Depends(get_read_db),
+):
+    """Get a patient's record. Doctors and admins only; 404 if not found."""
+    return get_patient(db, patient_id)
@@ -0,0 +1,123 @@
+# app/api/profiling.py
+import asyncio
+import os
+import time
+from enum import Enum
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+import structlog
+from app.config import PROFILING_ENABLED, PROFILING_MAX_SECONDS
+from app.models.user import User
+from app.utils.dependencies import get_current_admin
+from app.utils.profiler import SamplingProfiler, profile_store, sign_profile_token
+
+logger = structlog.get_logger()
+
+
+def require_profiling():
+    """Hide the profiling endpoints entirely unless PROFILING_ENABLED."""
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+router = APIRouter(
+    prefix="/admin/profiling",
+    tags=["Profiling"],
+    dependencies=[Depends(require_profiling)],
+)
+
+# One worker-wide capture at a time
+_capture_lock = asyncio.Lock()
+
+
+class ProfileFormat(str, Enum):
+    collapsed = "collapsed"
+    speedscope = "speedscope"
+
+
+def _profile_response(profiler: SamplingProfiler, name: str, fmt: ProfileFormat):
+    if fmt == ProfileFormat.speedscope:
+        return JSONResponse(
+            profiler.speedscope(name),
+            headers={
+                "Content-Disposition": f'attachment; filename="{name}.speedscope.json"'
+            },
+        )
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={"Content-Disposition": f'attachment; filename="{name}.collapsed.txt"'},
+    )
+
+
+@router.post("/capture")
+async def capture_profile(
+    seconds: float = Query(10, gt=0, le=PROFILING_MAX_SECONDS),
+    format: ProfileFormat = Query(ProfileFormat.collapsed),
+    admin: User = Depends(get_current_admin),
+):
+    """
+    Sample every thread of the worker serving this request for `seconds`.
+
+    Returns a collapsed-stack file (for flamegraph.pl / speedscope) or a
+    speedscope JSON profile. Each call profiles one worker process; the
+    `X-Worker-PID` header says which.
+    """
+    if _capture_lock.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A capture is already running on this worker",
+        )
+
+    async with _capture_lock:
+        logger.info("Profile capture started", seconds=seconds, admin=str(admin.id))
+        profiler = SamplingProfiler().start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+
+    pid = os.getpid()
+    response = _profile_response(profiler, f"worker-{pid}-{int(time.time())}", format)
+    response.headers["X-Worker-PID"] = str(pid)
+    return response
+
+
+@router.post("/token")
+def create_profile_token(
+    ttl: int = Query(600, gt=0, le=3600, description="Seconds the token is valid"),
+    admin: User = Depends(get_current_admin),
+):
+    """
+    Issue a signed `X-Profile` header value.
+
+    Requests sent with it are profiled individually; fetch the result from
+    `/requests/{request_id}` using the response's `X-Request-ID`.
+    """
+    expires_at = int(time.time()) + ttl
+    return {
+        "header": "X-Profile",
+        "value": sign_profile_token(expires_at),
+        "expires_at": expires_at,
+    }
+
+
+@router.get("/requests")
+def list_request_profiles(admin: User = Depends(get_current_admin)):
+    """Per-request profiles held by this worker, newest first."""
+    return {"worker_pid": os.getpid(), "profiles": profile_store.list()}
+
+
+@router.get("/requests/{request_id}")
+def get_request_profile(
+    request_id: str,
+    format: ProfileFormat = Query(ProfileFormat.collapsed),
+    admin: User = Depends(get_current_admin),
+):
+    """Download the profile of one request."""
+    profiler = profile_store.get(request_id)
+    if profiler is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No profile for this request on this worker",
+        )
+    return _profile_response(profiler, f"request-{request_id}", format)
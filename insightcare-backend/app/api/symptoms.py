@@ -0,0 +1,152 @@
+# app/api/symptoms.py
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.database import get_db, get_read_db
+from app.models.user import User
+from app.schemas.symptom_schema import (
+    SymptomCreate,
+    SymptomPage,
+    SymptomResponse,
+    SymptomSearchResponse,
+    SymptomTimeline,
+)
+from app.services.bulk_import import detect_format, import_stream, symptom_import_spec
+from app.services.search_service import search_symptom_notes
+from app.services.symptom_service import (
+    create_symptom,
+    get_symptom_timeline,
+    list_symptom_entries,
+)
+from app.utils.audit import AuditLogger
+from app.utils.dependencies import require_roles
+from app.utils.serialization import ORJSONResponse
+
+router = APIRouter(prefix="/symptoms", tags=["Symptoms"])
+
+
+@router.post("/", response_model=SymptomResponse, status_code=status.HTTP_201_CREATED)
+def add_symptom(
+    symptom_data: SymptomCreate,
+    request: Request,
+    current_user: User = Depends(require_roles("doctor", "admin")),
+    db: Session = Depends(get_db),
+):
+    """
+    Record a symptom for a patient. Doctors and admins only; 404 if the
+    patient doesn't exist.
+    """
+    symptom = create_symptom(db, symptom_data, reported_by=current_user.id)
+    AuditLogger.log_from_request(
+        db=db,
+        request=request,
+        event_type="create_symptom",
+        event_category="data",
+        description=f"Recorded symptom {symptom.id} for patient {symptom.patient_id}",
+        status="success",
+        user_id=str(current_user.id),
+        user_email=current_user.email,
+        metadata={"symptom_id": symptom.id, "patient_id": symptom.patient_id},
+    )
+    return symptom
+
+
+@router.post("/import")
+async def import_symptoms(
+    request: Request,
+    current_user: User = Depends(require_roles("doctor", "admin")),
+    db: Session = Depends(get_db),
+):
+    """
+    Bulk-create symptoms from a CSV (`text/csv`, header row first) or NDJSON
+    (`application/x-ndjson`) upload, streamed rather than buffered.
+
+    Rows for unknown patients are rejected; the rest are imported. The
+    response counts both and lists each failed row's number and errors. One
+    audit entry records the whole import instead of one per symptom. Doctors
+    and admins only.
+    """
+    report = await import_stream(
+        db,
+        request.stream(),
+        detect_format(request.headers.get("content-type")),
+        symptom_import_spec(reported_by=current_user.id),
+    )
+    await run_in_threadpool(
+        AuditLogger.log_from_request,
+        db=db,
+        request=request,
+        event_type="bulk_import",
+        event_category="data",
+        description=f"Imported {report.imported} of {report.total} symptoms",
+        status="success" if report.imported else "failure",
+        user_id=str(current_user.id),
+        user_email=current_user.email,
+        metadata=report.summary(),
+    )
+    return ORJSONResponse(report.to_dict())
+
+
+@router.get("/search", response_model=SymptomSearchResponse)
+def search_symptoms(
+    q: str = Query(..., min_length=2, max_length=200, description="Search words"),
+    patient_id: Optional[int] = Query(None, description="Only this patient"),
+    page: int = Query(1, ge=1, le=100),
+    limit: int = Query(20, ge=1, le=50),
+    current_user: User = Depends(require_roles("doctor", "admin")),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Search symptom notes, best matches first, with highlighted snippets.
+
+    Every word must match the start of a word in the note (`fev` finds
+    "fever"); on Postgres near-misspellings match too. Snippets are HTML
+    with matches in `<mark>`. Doctors and admins only.
+    """
+    results, has_more = search_symptom_notes(db, q, page, limit, patient_id)
+    return ORJSONResponse(
+        {"page": page, "limit": limit, "has_more": has_more, "results": results}
+    )
+
+
+@router.get("/patient/{patient_id}", response_model=SymptomPage)
+def list_symptoms(
+    patient_id: int,
+    limit: int = Query(50, ge=1, le=200, description="Items per page (max 200)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the last page"),
+    start: Optional[datetime] = Query(None, description="Reported at or after"),
+    end: Optional[datetime] = Query(None, description="Reported before"),
+    current_user: User = Depends(require_roles("doctor", "admin")),
+    db: Session = Depends(get_read_db),
+):
+    """
+    A patient's symptoms, newest first, one page at a time.
+
+    Pass the response's `next_cursor` as `cursor` for the next page; it is
+    null on the last one. Entries leave out the `structured` data. Doctors
+    and admins only.
+    """
+    items, next_cursor = list_symptom_entries(
+        db, patient_id, limit=limit, cursor=cursor, start=start, end=end
+    )
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+@router.get("/patient/{patient_id}/timeline", response_model=SymptomTimeline)
+def get_timeline(
+    patient_id: int,
+    bucket: str = Query("day", pattern="^(day|week)$"),
+    start: Optional[datetime] = Query(None, description="Window start"),
+    end: Optional[datetime] = Query(None, description="Window end (default now)"),
+    current_user: User = Depends(require_roles("doctor", "admin")),
+    db: Session = Depends(get_read_db),
+):
+    """
+    A patient's symptoms counted per day or week, with each bucket's worst
+    severity. Windows span at most 366 buckets (the default); days without
+    symptoms are left out. Page through the entries themselves with
+    `GET /api/symptoms/patient/{patient_id}`. Doctors and admins only.
+    """
+    return ORJSONResponse(get_symptom_timeline(db, patient_id, bucket, start, end))
@@ -1,16 +1,95 @@
 # app/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import DATABASE_URL
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from app.config import (
+    DATABASE_URL,
+    DATABASE_REPLICA_URLS,
+    RATE_LIMIT_STORAGE_URL,
+    READ_YOUR_WRITES_SECONDS,
+    REPLICA_CONNECT_TIMEOUT_SECONDS,
+    REPLICA_RETRY_SECONDS,
+)
+from app.utils.query_stats import install_query_hooks
+from app.utils.read_replicas import (
+    ReadOnlySession,
+    ReplicaRouter,
+    create_write_marks,
+    request_user_key,
+)
 
 engine = create_engine(DATABASE_URL, echo=False, future=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
 
 
-def get_db():
+def _replica_engine(url: str):
+    # Checked on checkout, so a replica that went away is noticed before use
+    connect_args = {}
+    if url.startswith("postgresql"):
+        connect_args["connect_timeout"] = REPLICA_CONNECT_TIMEOUT_SECONDS
+    return create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+
+
+replica_router = ReplicaRouter(
+    engine,
+    [_replica_engine(url) for url in DATABASE_REPLICA_URLS],
+    create_write_marks(RATE_LIMIT_STORAGE_URL),
+    READ_YOUR_WRITES_SECONDS,
+    REPLICA_RETRY_SECONDS,
+)
+
+# Per-request statement counts and DB time (see LoggingMiddleware)
+install_query_hooks()
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _note_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_flush(session):
+    session.info.pop("wrote", None)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _note_write(session):
+    # Read-your-writes: the writer's reads skip the replicas for a while
+    if session.info.pop("wrote", False):
+        replica_router.note_write(session.info.get("user_key"))
+
+
+def open_session(request: Request) -> Session:
+    """
+    Primary session for ``request``, tagged for read-your-writes. The caller
+    closes it; streamed responses use this, since their bodies are sent
+    after get_db's session is closed.
+    """
     db = SessionLocal()
+    if replica_router.replicas:
+        db.info["user_key"] = request_user_key(request)
+    return db
+
+
+def get_db(request: Request):
+    db = open_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """
+    Session for read-only endpoints: on a replica when any are configured
+    (see app/utils/read_replicas.py), otherwise like get_db.
+    """
+    key = request_user_key(request) if replica_router.replicas else None
+    connection = replica_router.connect(key)
+    db = ReadOnlySession(bind=connection, autoflush=False)
     try:
         yield db
     finally:
         db.close()
+        connection.close()
@@ -0,0 +1,62 @@
+# app/export.py
+"""
+Columnar export of diagnoses (see app/services/export_service.py).
+
+    python -m app.export [--out exports] [--format parquet|arrow]
+                         [--database-url URL]
+
+Each run continues from the high-water mark in the output directory, so
+run it on a schedule. Point --database-url at a replica to keep the load
+off the primary. Needs the optional pyarrow package.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.config import (
+    ANALYTICS_REFRESH_LAG_SECONDS,
+    DATABASE_URL,
+    EXPORT_CHUNK_SIZE,
+    EXPORT_COMPRESSION,
+    EXPORT_DIR,
+)
+from app.services.export_service import ARROW, PARQUET, export_diagnoses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.export")
+    parser.add_argument("--out", type=Path, default=Path(EXPORT_DIR))
+    parser.add_argument("--format", choices=[PARQUET, ARROW], default=PARQUET)
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    parser.add_argument("--compression", default=EXPORT_COMPRESSION)
+    parser.add_argument(
+        "--lag-seconds", type=int, default=ANALYTICS_REFRESH_LAG_SECONDS
+    )
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    try:
+        with Session(engine) as db:
+            summary = export_diagnoses(
+                db,
+                args.out,
+                args.format,
+                chunk_size=args.chunk_size,
+                lag_seconds=args.lag_seconds,
+                compression=args.compression,
+            )
+    except (RuntimeError, ValueError) as e:
+        sys.exit(str(e))
+    finally:
+        engine.dispose()
+    print(
+        f"{summary['rows']} diagnoses exported to {args.out} "
+        f"({len(summary['files'])} files)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,48 @@
 # app/main.py
+from app.startup import startup_timer, check_schema_revision  # starts the clock
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 import structlog
 import logging
-from app.database import Base, engine
+from app.database import Base, SessionLocal, engine, replica_router
 from app.api.auth import router as auth_router
 from app.api.diagnosis import router as diagnosis_router, diagnose_router
-from app.api.health import router as health_router
+from app.api.health import router as health_router, probe_router
 from app.api.password_reset import router as password_reset_router
 from app.api.email_verification import router as email_verification_router
-from app.config import FRONTEND_URL
-from app.middleware.rate_limit import limiter
+from app.api.profiling import router as profiling_router
+from app.api.jobs import router as jobs_router
+from app.api.analytics import router as analytics_router
+from app.api.patients import router as patients_router
+from app.api.symptoms import router as symptoms_router
+from app.openapi import docs_router, get_openapi_payload, schema_router
+from app.config import (
+    FRONTEND_URL,
+    SCHEMA_CHECK_ON_STARTUP,
+    DB_CREATE_ALL,
+    PROFILING_ENABLED,
+    DOCS_ENABLED,
+    JOB_EMBEDDED_WORKER,
+    ANALYTICS_REFRESH_INTERVAL_SECONDS,
+)
+from app.middleware.rate_limit import RateLimitMiddleware
 from app.middleware.logging import LoggingMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.drain import DrainMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
+from app.services.token_service import run_token_sweeper
+from app.services.analytics_service import run_analytics_refresher
+from app.services.google_certs import google_certs
+from app.services.health_prober import health_prober
+from app.services.lifecycle import shutdown_coordinator
+from app.services.events import event_bus
+from app.services.job_queue import JobWorker
+from app.utils.serialization import ORJSONResponse
+from app.utils.compression import PrecompressedPayload
 
 # Configure structured logging
 structlog.configure(
@@ -32,28 +60,100 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
-# Create database tables (in development; use Alembic in production)
-Base.metadata.create_all(bind=engine)
+startup_timer.mark("imports")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Worker startup: no database work happens at import time.
+
+    Only the Alembic revision is checked here (tables are managed by
+    migrations); a database that is down is reported, not fatal.
+    """
+    if DB_CREATE_ALL:
+        # Local development convenience; use Alembic everywhere else
+        with startup_timer.phase("create_all"):
+            await run_in_threadpool(Base.metadata.create_all, bind=engine)
+
+    if SCHEMA_CHECK_ON_STARTUP:
+        with startup_timer.phase("schema_check"):
+            app.state.schema_status = await run_in_threadpool(
+                check_schema_revision, engine
+            )
+
+    # Generate (or load) the schema now, not on the first /openapi.json hit
+    with startup_timer.phase("openapi"):
+        get_openapi_payload(app)
+
+    app.state.startup_timings = startup_timer.phases
+    startup_timer.report()
+
+    # Background jobs, cancelled once requests and queues have drained
+    shutdown_coordinator.reset()
+    shutdown_coordinator.add_task(
+        "token_sweeper", asyncio.create_task(run_token_sweeper())
+    )
+    shutdown_coordinator.add_task(
+        "health_prober", asyncio.create_task(health_prober.run())
+    )
+    if ANALYTICS_REFRESH_INTERVAL_SECONDS > 0:
+        # Every worker runs one; the watermark row lock serializes them
+        shutdown_coordinator.add_task(
+            "analytics_refresher", asyncio.create_task(run_analytics_refresher())
+        )
+    # Live updates from other processes (Postgres LISTEN/NOTIFY)
+    event_bus.configure(engine)
+    if event_bus.bridged:
+        shutdown_coordinator.add_task(
+            "event_bridge", asyncio.create_task(event_bus.listen())
+        )
+    if JOB_EMBEDDED_WORKER:
+        # Development convenience; run `python -m app.worker` in production
+        worker = JobWorker(SessionLocal)
+        shutdown_coordinator.register_queue("jobs", worker.drain)
+        shutdown_coordinator.add_task("job_worker", asyncio.create_task(worker.run()))
+
+    yield
+
+    app.state.shutdown_report = await shutdown_coordinator.shutdown(engine)
+    replica_router.dispose()
+    google_certs.close()
+
 
 # Initialize FastAPI application
 app = FastAPI(
     title="InsightCare Backend API",
     description="AI-powered disease diagnosis system backend",
     version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
+    # Served from app.openapi: cached schema bytes, docs only if DOCS_ENABLED
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Add rate limiting
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # Add security headers middleware (add first for all responses)
 app.add_middleware(SecurityHeadersMiddleware)
 
+# Add rate limiting (inside logging so rejected requests are still logged)
+app.add_middleware(RateLimitMiddleware)
+
 # Add logging middleware
 app.add_middleware(LoggingMiddleware)
 
+# Per-request profiling (outside logging, to see its X-Request-ID); not even
+# installed unless enabled
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Compress everything the layers above produce
+app.add_middleware(CompressionMiddleware)
+
+# Track in-flight requests; refuse new ones while shutting down
+app.add_middleware(DrainMiddleware)
+
 # Configure CORS to allow frontend access
 app.add_middleware(
     CORSMiddleware,
@@ -74,16 +174,34 @@ app.include_router(diagnose_router, prefix="/api")  # Frontend-compatible endpoi
 app.include_router(health_router, prefix="/api")
 app.include_router(password_reset_router, prefix="/api")
 app.include_router(email_verification_router, prefix="/api")
+app.include_router(profiling_router, prefix="/api")
+app.include_router(jobs_router, prefix="/api")
+app.include_router(analytics_router, prefix="/api")
+app.include_router(patients_router, prefix="/api")
+app.include_router(symptoms_router, prefix="/api")
+app.include_router(schema_router)
+app.include_router(probe_router)  # /livez, /readyz
+if DOCS_ENABLED:
+    app.include_router(docs_router)
+
+startup_timer.mark("app_setup")
 
 logger.info("InsightCare API initialized", version="1.0.0")
 
 
+ROOT_PAYLOAD = PrecompressedPayload(
+    ORJSONResponse(
+        {
+            "message": "InsightCare Backend API",
+            "version": "1.0.0",
+            "docs": "/docs" if DOCS_ENABLED else None,
+            "health": "/api/health",
+        }
+    ).body
+)
+
+
 @app.get("/")
-def root():
+def root(request: Request):
     """Root endpoint - API info."""
-    return {
-        "message": "InsightCare Backend API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "health": "/api/health",
-    }
+    return ROOT_PAYLOAD.response(request.headers.get("accept-encoding"))
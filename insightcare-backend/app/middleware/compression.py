@@ -0,0 +1,154 @@
+# app/middleware/compression.py
+from typing import Dict, Iterable, List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import (
+    COMPRESSION_CONTENT_TYPES,
+    COMPRESSION_ENABLED,
+    COMPRESSION_MIN_SIZE,
+)
+from app.utils.compression import (
+    StreamCompressor,
+    available_encodings,
+    default_levels,
+    negotiate_encoding,
+)
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with the best encoding the client accepts
+    (zstd, br or gzip, depending on what is installed).
+
+    Skipped for bodies under ``minimum_size``, content types outside the
+    allowlist, and responses that already have a Content-Encoding (e.g.
+    PrecompressedPayload). Bodies are compressed incrementally, so streamed
+    responses are not buffered beyond ``minimum_size``. A strong ETag is
+    weakened on compressed responses, as the bytes now differ from the
+    identity representation; If-None-Match still matches (weak comparison).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        content_types: str = COMPRESSION_CONTENT_TYPES,
+        encodings: Optional[Iterable[str]] = None,
+        levels: Optional[Dict[str, int]] = None,
+        enabled: bool = COMPRESSION_ENABLED,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = {t.strip() for t in content_types.split(",") if t}
+        self.encodings = tuple(
+            available_encodings() if encodings is None else encodings
+        )
+        self.levels = {**default_levels(), **(levels or {})}
+        self.enabled = enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if not self.enabled or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding"), self.encodings
+        )
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def should_compress(self, headers: Headers, status: int) -> bool:
+        if status < 200 or status in (204, 206, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip()
+        return content_type in self.content_types
+
+
+class _CompressingResponder:
+    """Send wrapper for one response."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start: Optional[Message] = None
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+        self.compressor: Optional[StreamCompressor] = None
+        # None: undecided, False: pass through, True: compressing
+        self.active: Optional[bool] = None
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message.get("headers", []))
+            self.active = (
+                None
+                if self.middleware.should_compress(headers, message["status"])
+                else False
+            )
+            if self.active is False:
+                await self.downstream(message)
+            return
+
+        if message["type"] != "http.response.body" or self.active is False:
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.active is None:
+            self.pending.append(body)
+            self.pending_size += len(body)
+            if more_body and self.pending_size < self.middleware.minimum_size:
+                return
+            body = b"".join(self.pending)
+            self.pending = []
+            if self.pending_size < self.middleware.minimum_size:
+                # Whole body is small: send it as it was
+                self.active = False
+                start = MutableHeaders(raw=list(self.start.get("headers", [])))
+                start.add_vary_header("Accept-Encoding")
+                await self.downstream({**self.start, "headers": start.raw})
+                await self.downstream(
+                    {"type": "http.response.body", "body": body, "more_body": False}
+                )
+                return
+            self.active = True
+            self.compressor = StreamCompressor(
+                self.encoding, self.middleware.levels[self.encoding]
+            )
+            data = self.compressor.compress(body)
+            if not more_body:
+                data += self.compressor.finish()
+            await self.downstream(self._compressed_start(data, more_body))
+            await self.downstream(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+            return
+
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.finish()
+        if data or not more_body:
+            await self.downstream(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+
+    def _compressed_start(self, first_chunk: bytes, streaming: bool) -> Message:
+        headers = MutableHeaders(raw=list(self.start.get("headers", [])))
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if streaming:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(first_chunk))
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+        return {**self.start, "headers": headers.raw}
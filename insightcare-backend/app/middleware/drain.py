@@ -0,0 +1,57 @@
+# app/middleware/drain.py
+import asyncio
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.services.lifecycle import ShutdownCoordinator, shutdown_coordinator
+
+# Always answered, so orchestrators can watch the worker drain
+PROBE_PATHS = ("/livez", "/readyz")
+
+CLOSING_BODY = b'{"detail":"Server is shutting down. Please retry."}'
+
+
+class DrainMiddleware:
+    """
+    Counts in-flight requests for the shutdown coordinator.
+
+    Once the worker is closing, new requests are refused with a 503 and
+    ``Connection: close`` (so clients retry on another worker) instead of
+    being cut off mid-way; requests cancelled by the server are counted as
+    dropped.
+    """
+
+    def __init__(
+        self, app: ASGIApp, coordinator: ShutdownCoordinator = shutdown_coordinator
+    ):
+        self.app = app
+        self.coordinator = coordinator
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in PROBE_PATHS:
+            return await self.app(scope, receive, send)
+
+        coordinator = self.coordinator
+        if coordinator.closing:
+            coordinator.rejected += 1
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 503,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(CLOSING_BODY)).encode()),
+                        (b"connection", b"close"),
+                        (b"retry-after", b"1"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": CLOSING_BODY})
+            return
+
+        coordinator.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        except asyncio.CancelledError:
+            coordinator.cancelled += 1
+            raise
+        finally:
+            coordinator.in_flight -= 1
@@ -5,6 +5,8 @@ from starlette.responses import Response
 import structlog
 import time
 import uuid
+from app.config import QUERY_DEBUG, QUERY_REPEAT_THRESHOLD
+from app.utils.query_stats import begin_request, end_request
 
 logger = structlog.get_logger()
 
@@ -12,6 +14,11 @@ logger = structlog.get_logger()
 class LoggingMiddleware(BaseHTTPMiddleware):
     """
     Middleware to log all HTTP requests and responses with structured logging.
+
+    Each completed request also reports how many SQL statements it ran and
+    the time spent in them. With QUERY_DEBUG, statements repeated within one
+    request (likely N+1) are logged as warnings and the totals are sent in a
+    Server-Timing header.
     """
 
     async def dispatch(self, request: Request, call_next):
@@ -22,6 +29,8 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         structlog.contextvars.clear_contextvars()
         structlog.contextvars.bind_contextvars(request_id=request_id)
 
+        query_stats, query_token = begin_request(track_shapes=QUERY_DEBUG)
+
         # Log request
         start_time = time.time()
         logger.info(
@@ -48,8 +57,23 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 url=str(request.url),
                 status_code=response.status_code,
                 process_time=f"{process_time:.3f}s",
+                db_queries=query_stats.count,
+                db_time=f"{query_stats.duration:.3f}s",
             )
 
+            if QUERY_DEBUG:
+                for statement, count in query_stats.repeated(QUERY_REPEAT_THRESHOLD):
+                    logger.warning(
+                        "Repeated query (possible N+1)",
+                        url=str(request.url),
+                        count=count,
+                        statement=statement,
+                    )
+                response.headers["Server-Timing"] = (
+                    f"db;dur={query_stats.duration * 1000:.1f};"
+                    f'desc="{query_stats.count} queries"'
+                )
+
             return response
 
         except Exception as e:
@@ -63,5 +87,9 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 url=str(request.url),
                 error=str(e),
                 process_time=f"{process_time:.3f}s",
+                db_queries=query_stats.count,
             )
             raise
+
+        finally:
+            end_request(query_token)
@@ -0,0 +1,69 @@
+# app/middleware/profiling.py
+import structlog
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.profiler import (
+    ProfileStore,
+    SamplingProfiler,
+    profile_store,
+    verify_profile_token,
+)
+
+logger = structlog.get_logger()
+
+PROFILE_HEADER = b"x-profile"
+
+# Requests are short; sample them more finely than worker-wide captures
+REQUEST_SAMPLE_INTERVAL = 0.001
+
+
+class ProfilingMiddleware:
+    """
+    Profiles single requests that carry a valid signed ``X-Profile`` header.
+
+    The profile is stored under the request's ``X-Request-ID`` (set by
+    LoggingMiddleware, so this must wrap it) and can be downloaded from
+    ``/api/admin/profiling/requests/{request_id}``.
+
+    Plain ASGI rather than BaseHTTPMiddleware: requests without the header
+    pass straight through. Only added to the app when PROFILING_ENABLED.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        token = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                token = value.decode("latin-1")
+                break
+        if token is None or not verify_profile_token(token):
+            return await self.app(scope, receive, send)
+
+        request_id = None
+
+        async def send_wrapper(message: Message):
+            nonlocal request_id
+            if message["type"] == "http.response.start":
+                for name, value in message.get("headers", []):
+                    if name == b"x-request-id":
+                        request_id = value.decode("latin-1")
+            await send(message)
+
+        profiler = SamplingProfiler(interval=REQUEST_SAMPLE_INTERVAL).start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            if request_id:
+                self.store.add(request_id, profiler)
+                logger.info(
+                    "Request profiled",
+                    profiled_request_id=request_id,
+                    path=scope["path"],
+                    samples=profiler.samples,
+                )
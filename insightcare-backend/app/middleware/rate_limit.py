@@ -1,16 +1,288 @@
 # app/middleware/rate_limit.py
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+import ipaddress
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+import structlog
+from app.config import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_STORAGE_URL,
+    RATE_LIMIT_CAPACITY,
+    RATE_LIMIT_PER_MINUTE,
+    TRUSTED_PROXIES,
+)
+from app.utils.security import verify_token
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
+logger = structlog.get_logger()
 
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
 
-# Custom rate limit exceeded handler
-def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
-    return {
-        "detail": "Rate limit exceeded. Please try again later.",
-        "retry_after": exc.detail,
-    }
+# Tokens charged per request, matched by longest path prefix.
+# Anything not listed costs DEFAULT_ROUTE_COST; cost 0 skips the limiter.
+DEFAULT_ROUTE_COST = 1
+ROUTE_COSTS: Dict[str, int] = {
+    "/api/diagnosis/analyze": 10,
+    "/api/diagnosis/diagnose": 10,
+    "/api/diagnosis/jobs": 10,
+    "/api/diagnosis/stream": 10,
+    "/api/diagnose": 10,
+    "/api/auth/login": 5,
+    "/api/auth/register": 5,
+    "/api/auth/google": 5,
+    "/api/auth/forgot-password": 5,
+    "/api/health": 1,
+    # Orchestrator probes, answered without I/O
+    "/livez": 0,
+    "/readyz": 0,
+}
+
+# Refill and consume in a single atomic round-trip. Redis' own clock is used
+# so workers with skewed clocks share one notion of time.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+class MemoryTokenBucketBackend:
+    """
+    In-process token buckets.
+
+    Limits are per worker, so this is the local/test stand-in for the shared
+    Redis backend. Buckets idle long enough to have refilled are dropped
+    every PRUNE_EVERY checks, like the Redis keys' expiry.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._ops = 0
+
+    async def consume(
+        self, key: str, cost: int, capacity: int, rate: float
+    ) -> Tuple[bool, float, float]:
+        """Take ``cost`` tokens; returns (allowed, remaining, retry_after)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                allowed, retry_after = True, 0.0
+            else:
+                allowed, retry_after = False, (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._ops += 1
+            if self._ops % self.PRUNE_EVERY == 0:
+                # A full bucket is the same as no bucket
+                idle = now - capacity / rate
+                self._buckets = {k: v for k, v in self._buckets.items() if v[1] > idle}
+        return allowed, tokens, retry_after
+
+    def reset(self):
+        """Forget all buckets."""
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisTokenBucketBackend:
+    """
+    Token buckets shared by all workers through any Redis-protocol server.
+
+    Each check is one EVALSHA of ``TOKEN_BUCKET_LUA``.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        # Optional dependency, only needed when a shared backend is configured
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(TOKEN_BUCKET_LUA)
+        self._prefix = prefix
+
+    async def consume(
+        self, key: str, cost: int, capacity: int, rate: float
+    ) -> Tuple[bool, float, float]:
+        """Take ``cost`` tokens; returns (allowed, remaining, retry_after)."""
+        allowed, remaining, retry_after = await self._script(
+            keys=[self._prefix + key], args=[capacity, rate, cost]
+        )
+        return bool(int(allowed)), float(remaining), float(retry_after)
+
+    def reset(self):
+        """Buckets expire on their own in Redis."""
+
+
+def create_backend(url: str):
+    """Build a backend from a storage URL (memory:// or redis://...)."""
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisTokenBucketBackend(url)
+    return MemoryTokenBucketBackend()
+
+
+# Shared by all middleware instances in this worker
+rate_limit_backend = create_backend(RATE_LIMIT_STORAGE_URL)
+
+
+def parse_trusted_proxies(value: str) -> List[Network]:
+    """Parse a comma-separated list of proxy IPs/CIDRs."""
+    return [
+        ipaddress.ip_network(part.strip(), strict=False)
+        for part in value.split(",")
+        if part.strip()
+    ]
+
+
+# Parsed once; shared with handlers that need the real client address
+trusted_proxy_networks = parse_trusted_proxies(TRUSTED_PROXIES)
+
+
+def _is_trusted(address: str, trusted: Iterable[Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted)
+
+
+def get_client_ip(request: Request, trusted: List[Network]) -> str:
+    """
+    Resolve the real client address behind trusted proxies.
+
+    X-Forwarded-For is only honoured when the direct peer is a trusted proxy.
+    The header is then walked right to left, skipping trusted hops, so a
+    client can't spoof its address by prepending entries.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not trusted or not _is_trusted(peer, trusted):
+        return peer
+
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded:
+        return peer
+
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, trusted):
+            return hop
+    return hops[0] if hops else peer
+
+
+def get_route_cost(path: str, costs: Dict[str, int] = ROUTE_COSTS) -> int:
+    """Tokens charged for ``path`` (longest matching prefix wins)."""
+    best, best_len = DEFAULT_ROUTE_COST, -1
+    for prefix, cost in costs.items():
+        if path.startswith(prefix) and len(prefix) > best_len:
+            best, best_len = cost, len(prefix)
+    return best
+
+
+def get_rate_limit_key(request: Request, trusted: List[Network]) -> str:
+    """
+    Per-user key for authenticated requests, per-client-IP otherwise.
+
+    Only the JWT signature is checked here (no DB lookup); the route
+    dependencies still do full authentication.
+    """
+    authorization = request.headers.get("authorization", "")
+    if authorization[:7].lower() == "bearer ":
+        payload = verify_token(authorization[7:])
+        if payload and payload.get("user_id"):
+            return f"user:{payload['user_id']}"
+    return f"ip:{get_client_ip(request, trusted)}"
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """
+    Token-bucket rate limiting with per-route cost weights.
+
+    Headers included on every limited response:
+    - X-RateLimit-Limit: Bucket capacity
+    - X-RateLimit-Remaining: Tokens left after this request
+    - Retry-After: Seconds until the request would be allowed (429 only)
+    """
+
+    def __init__(
+        self,
+        app,
+        backend=None,
+        capacity: int = RATE_LIMIT_CAPACITY,
+        per_minute: int = RATE_LIMIT_PER_MINUTE,
+        route_costs: Optional[Dict[str, int]] = None,
+        trusted_proxies: Optional[str] = None,
+        enabled: bool = RATE_LIMIT_ENABLED,
+    ):
+        super().__init__(app)
+        self.backend = backend or rate_limit_backend
+        self.capacity = capacity
+        self.rate = per_minute / 60.0
+        self.route_costs = ROUTE_COSTS if route_costs is None else route_costs
+        self.trusted = (
+            trusted_proxy_networks
+            if trusted_proxies is None
+            else parse_trusted_proxies(trusted_proxies)
+        )
+        self.enabled = enabled
+
+    async def dispatch(self, request: Request, call_next):
+        if not self.enabled or request.method == "OPTIONS":
+            return await call_next(request)
+
+        key = get_rate_limit_key(request, self.trusted)
+        cost = get_route_cost(request.url.path, self.route_costs)
+        if cost == 0:
+            return await call_next(request)
+
+        try:
+            allowed, remaining, retry_after = await self.backend.consume(
+                key, cost, self.capacity, self.rate
+            )
+        except Exception as e:
+            # Fail open: a rate limiter outage must not take the API down
+            logger.error("Rate limit backend unavailable", error=str(e))
+            return await call_next(request)
+
+        headers = {
+            "X-RateLimit-Limit": str(self.capacity),
+            "X-RateLimit-Remaining": str(int(remaining)),
+        }
+
+        if not allowed:
+            headers["Retry-After"] = str(math.ceil(retry_after))
+            logger.info("Rate limit exceeded", key=key, cost=cost)
+            return JSONResponse(
+                status_code=429,
+                content={
+                    "detail": "Rate limit exceeded. Please try again later.",
+                    "retry_after": math.ceil(retry_after),
+                },
+                headers=headers,
+            )
+
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
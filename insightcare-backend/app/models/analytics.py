@@ -0,0 +1,57 @@
+from sqlalchemy import Column, Date, DateTime, Index, Integer, String
+from app.database import Base
+from app.models.user import GUID
+
+
+class DiseaseDailyCount(Base):
+    """Diagnoses per day (UTC) and top predicted disease."""
+
+    __tablename__ = "analytics_disease_daily"
+
+    day = Column(Date, primary_key=True)
+    disease = Column(String(200), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class SymptomDailyCount(Base):
+    """Diagnoses per day (UTC) that list a symptom."""
+
+    __tablename__ = "analytics_symptom_daily"
+
+    day = Column(Date, primary_key=True)
+    symptom = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class SymptomPairCount(Base):
+    """
+    Diagnoses that list both symptoms, all time. Each pair is stored once,
+    with ``symptom_a < symptom_b``.
+    """
+
+    __tablename__ = "analytics_symptom_pairs"
+
+    symptom_a = Column(String(100), primary_key=True)
+    symptom_b = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    # Pairs of a symptom on either side
+    __table_args__ = (Index("ix_analytics_symptom_pairs_symptom_b", "symptom_b"),)
+
+
+class AnalyticsWatermark(Base):
+    """
+    How far an aggregate has been refreshed: the last diagnosis counted, in
+    (created_at, id) order.
+    """
+
+    __tablename__ = "analytics_watermarks"
+
+    name = Column(String(50), primary_key=True)
+    created_at = Column(DateTime(timezone=True), nullable=True)
+    diagnosis_id = Column(GUID(), nullable=True)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<AnalyticsWatermark(name={self.name}, created_at={self.created_at})>"
@@ -14,6 +14,11 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.search_ddl import (
+    DIAGNOSES_POSTGRES,
+    DIAGNOSES_SQLITE,
+    attach_search_ddl,
+)
 
 
 class GUID(TypeDecorator):
@@ -58,8 +63,8 @@ class Diagnosis(Base):
         nullable=False,
         index=True,
     )
-    # Symptoms as array of text strings (PostgreSQL ARRAY type)
-    symptoms = Column(ARRAY(String), nullable=False)
+    # Symptoms as array of text strings (PostgreSQL ARRAY type, JSON on SQLite)
+    symptoms = Column(ARRAY(String).with_variant(JSON(), "sqlite"), nullable=False)
     severity = Column(String(50), nullable=True)
     duration = Column(String(100), nullable=True)
     predictions = Column(JSON, nullable=False)
@@ -72,3 +77,11 @@ class Diagnosis(Base):
 
     def __repr__(self):
         return f"<Diagnosis(id={self.id}, user_id={self.user_id}, created_at={self.created_at})>"
+
+
+attach_search_ddl(
+    Diagnosis.__table__,
+    DIAGNOSES_POSTGRES,
+    DIAGNOSES_SQLITE,
+    ["diagnoses_fts", "diagnosis_symptoms"],
+)
@@ -0,0 +1,85 @@
+import uuid
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+    func,
+    text,
+)
+from app.database import Base
+from app.models.user import GUID
+
+
+class Job(Base):
+    """
+    A unit of background work, queued in the database.
+
+    Workers claim queued rows with ``SELECT ... FOR UPDATE SKIP LOCKED``, so
+    any number of them share the table without an external broker and
+    without claiming the same job twice.
+
+    Statuses:
+    - queued: waiting for a worker (or for ``run_at``, when retrying)
+    - running: claimed by ``locked_by``, which refreshes ``heartbeat_at``
+    - succeeded: ``result`` is set
+    - failed: out of attempts; ``error`` is set
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")
+    payload = Column(JSON, nullable=False, default=dict)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    user_id = Column(
+        GUID(),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_by = Column(String(100), nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        # Claim query: only queued rows, oldest due first. Partial on
+        # Postgres, so finished jobs don't bloat it.
+        Index(
+            "ix_jobs_queued_run_at",
+            "run_at",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        # Stale-claim sweep
+        Index(
+            "ix_jobs_running_heartbeat_at",
+            "heartbeat_at",
+            postgresql_where=text("status = 'running'"),
+        ),
+    )
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status})>"
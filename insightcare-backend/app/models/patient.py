@@ -1,6 +1,5 @@
 # app/models/patient.py
-from sqlalchemy import Column, Integer, String, Float, DateTime
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, func
 from app.database import Base
 
 
@@ -8,8 +7,13 @@ class Patient(Base):
     __tablename__ = "patients"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(120), nullable=False)
-    age = Column(Integer, nullable=True)
+    age = Column(Integer, nullable=True, index=True)
     blood_pressure = Column(Float, nullable=True)
     cholesterol = Column(Float, nullable=True)
     diagnosis = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=datetime)
+    created_at = Column(DateTime, server_default=func.now(), index=True)
+
+    __table_args__ = (
+        # Listing filtered by diagnosis, newest (highest id) first
+        Index("ix_patients_diagnosis_id", "diagnosis", "id"),
+    )
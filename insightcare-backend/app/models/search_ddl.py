@@ -0,0 +1,98 @@
+# app/models/search_ddl.py
+"""
+Search structures the ORM models don't describe.
+
+- Full-text search (app/services/search_service.py). Postgres: a generated
+  ``tsvector`` column with a GIN index, plus a trigram index on symptom
+  notes for fuzzy matches. SQLite (local development and tests): FTS5
+  tables kept in sync by triggers.
+- Symptom containment queries on diagnoses (``symptoms_filter`` in
+  app/services/diagnosis_service.py). Postgres: a GIN index on the
+  ``symptoms`` array. SQLite has no arrays (they are stored as JSON), so a
+  ``diagnosis_symptoms`` table, one row per symptom, is kept by triggers.
+
+They are created along with their tables (``create_all``); databases that
+already have the tables get them from the Alembic migration.
+"""
+
+from typing import List
+from sqlalchemy import DDL, Table, event
+
+SYMPTOMS_POSTGRES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE symptoms ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', coalesce(text, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_symptoms_search_vector "
+    "ON symptoms USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_symptoms_text_trgm "
+    "ON symptoms USING gin (text gin_trgm_ops)",
+]
+
+SYMPTOMS_SQLITE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS symptoms_fts "
+    "USING fts5(text, content='symptoms', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS symptoms_fts_insert AFTER INSERT ON symptoms "
+    "BEGIN INSERT INTO symptoms_fts(rowid, text) VALUES (new.id, new.text); END",
+    "CREATE TRIGGER IF NOT EXISTS symptoms_fts_delete AFTER DELETE ON symptoms "
+    "BEGIN INSERT INTO symptoms_fts(symptoms_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER IF NOT EXISTS symptoms_fts_update AFTER UPDATE OF text "
+    "ON symptoms BEGIN INSERT INTO symptoms_fts(symptoms_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO symptoms_fts(rowid, text) VALUES (new.id, new.text); END",
+]
+
+# array_to_string isn't IMMUTABLE, which generated columns require
+DIAGNOSES_POSTGRES = [
+    "CREATE OR REPLACE FUNCTION symptoms_text(text[]) RETURNS text "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$ SELECT array_to_string($1, ' ') $$",
+    "ALTER TABLE diagnoses ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', symptoms_text(symptoms))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_diagnoses_search_vector "
+    "ON diagnoses USING gin (search_vector)",
+    # symptoms @> / && (contains all / any of)
+    "CREATE INDEX IF NOT EXISTS ix_diagnoses_symptoms "
+    "ON diagnoses USING gin (symptoms)",
+]
+
+# Symptoms are stored as JSON text on SQLite; the tokenizer skips the
+# brackets and quotes. Diagnosis ids aren't integers, so the implicit rowid
+# links the two tables.
+DIAGNOSES_SQLITE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS diagnoses_fts "
+    "USING fts5(symptoms, content='diagnoses', content_rowid='rowid')",
+    "CREATE TRIGGER IF NOT EXISTS diagnoses_fts_insert AFTER INSERT ON diagnoses "
+    "BEGIN INSERT INTO diagnoses_fts(rowid, symptoms) "
+    "VALUES (new.rowid, new.symptoms); END",
+    "CREATE TRIGGER IF NOT EXISTS diagnoses_fts_delete AFTER DELETE ON diagnoses "
+    "BEGIN INSERT INTO diagnoses_fts(diagnoses_fts, rowid, symptoms) "
+    "VALUES ('delete', old.rowid, old.symptoms); END",
+    # One row per (symptom, diagnosis), filled from the JSON array
+    "CREATE TABLE IF NOT EXISTS diagnosis_symptoms ("
+    "symptom VARCHAR(100) NOT NULL, diagnosis_id CHAR(36) NOT NULL, "
+    "PRIMARY KEY (symptom, diagnosis_id)) WITHOUT ROWID",
+    "CREATE TRIGGER IF NOT EXISTS diagnosis_symptoms_insert AFTER INSERT "
+    "ON diagnoses BEGIN INSERT OR IGNORE INTO diagnosis_symptoms "
+    "SELECT value, new.id FROM json_each(new.symptoms); END",
+    "CREATE TRIGGER IF NOT EXISTS diagnosis_symptoms_delete AFTER DELETE "
+    "ON diagnoses BEGIN DELETE FROM diagnosis_symptoms "
+    "WHERE diagnosis_id = old.id; END",
+]
+
+
+def attach_search_ddl(
+    table: Table, postgres: List[str], sqlite: List[str], sqlite_tables: List[str]
+):
+    """Create the search structures with ``table``, and drop their tables."""
+    for statement in postgres:
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
+    for statement in sqlite:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for name in sqlite_tables:
+        event.listen(
+            table,
+            "after_drop",
+            DDL(f"DROP TABLE IF EXISTS {name}").execute_if(dialect="sqlite"),
+        )
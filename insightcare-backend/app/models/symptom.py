@@ -1,17 +1,30 @@
 # app/models/symptom.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, JSON, func
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.user import GUID
+from app.models.search_ddl import SYMPTOMS_POSTGRES, SYMPTOMS_SQLITE, attach_search_ddl
 
 
 class Symptom(Base):
     __tablename__ = "symptoms"
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False, index=True)
-    reported_by = Column(Integer, nullable=True)
+    # The user who reported it
+    reported_by = Column(GUID(), nullable=True)
     text = Column(String(2000))
     structured = Column(JSON, default={})
     severity = Column(String(50), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     patient = relationship("Patient", backref="symptoms")
+
+    __table_args__ = (
+        # Patient timelines: buckets and pages over a created_at range
+        Index("ix_symptoms_patient_id_created_at", "patient_id", "created_at"),
+    )
+
+
+attach_search_ddl(
+    Symptom.__table__, SYMPTOMS_POSTGRES, SYMPTOMS_SQLITE, ["symptoms_fts"]
+)
@@ -46,7 +46,7 @@ class User(Base):
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
     created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
     )
     updated_at = Column(
         DateTime(timezone=True),
@@ -56,15 +56,13 @@ class User(Base):
     )
     last_login = Column(DateTime(timezone=True), nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
+    # 'patient', 'doctor' or 'admin'
+    role = Column(
+        String(20), default="patient", server_default="patient", nullable=False
+    )
 
-    # Email verification
+    # Email verification (tokens live hashed in user_tokens)
     is_verified = Column(Boolean, default=False, nullable=False)
-    verification_token = Column(String(255), nullable=True)
-    verification_token_expires = Column(DateTime(timezone=True), nullable=True)
-
-    # Password reset
-    reset_token = Column(String(255), nullable=True)
-    reset_token_expires = Column(DateTime(timezone=True), nullable=True)
 
     # OAuth/Social Login
     oauth_provider = Column(String(50), nullable=True)  # 'google', 'facebook', etc.
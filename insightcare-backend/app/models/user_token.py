@@ -0,0 +1,58 @@
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, func
+from app.database import Base
+from app.models.user import GUID
+
+
+class UserToken(Base):
+    """
+    Single-use tokens sent to users by email.
+
+    Only the SHA-256 of the token is stored, so a database leak doesn't expose
+    usable reset or verification links. Redemption is one point lookup on the
+    unique (token_hash, purpose) index.
+
+    Purposes:
+    - password_reset
+    - email_verification
+    """
+
+    __tablename__ = "user_tokens"
+
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    user_id = Column(
+        GUID(),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    token_hash = Column(String(64), nullable=False)  # hex SHA-256
+    purpose = Column(String(32), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_user_tokens_hash_purpose",
+            "token_hash",
+            "purpose",
+            unique=True,
+            # Covering on Postgres: redemption never touches the heap
+            postgresql_include=["user_id", "expires_at"],
+        ),
+    )
+
+    def is_expired(self) -> bool:
+        expires_at = self.expires_at
+        if expires_at.tzinfo is None:
+            # SQLite returns naive datetimes
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return expires_at < datetime.now(timezone.utc)
+
+    def __repr__(self):
+        return (
+            f"<UserToken(id={self.id}, user_id={self.user_id}, purpose={self.purpose})>"
+        )
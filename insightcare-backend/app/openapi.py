@@ -0,0 +1,106 @@
+# app/openapi.py
+"""
+OpenAPI schema served as pre-serialized, precompressed bytes.
+
+The schema is generated once (at startup, or on first use), or loaded from
+a file written at build time:
+
+    python -m app.openapi --output openapi.json
+    OPENAPI_SCHEMA_FILE=openapi.json uvicorn app.main:app
+"""
+
+import argparse
+from pathlib import Path
+from typing import Optional
+import orjson
+import structlog
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from app.config import OPENAPI_SCHEMA_FILE
+from app.utils.compression import PrecompressedPayload
+
+logger = structlog.get_logger()
+
+OPENAPI_URL = "/openapi.json"
+DOCS_URL = "/docs"
+REDOC_URL = "/redoc"
+OAUTH2_REDIRECT_URL = "/docs/oauth2-redirect"
+
+
+def render_openapi(app: FastAPI) -> bytes:
+    """Generate the app's OpenAPI schema as JSON bytes."""
+    return orjson.dumps(app.openapi())
+
+
+def get_openapi_payload(app: FastAPI) -> PrecompressedPayload:
+    """
+    The schema, serialized and compressed once per process.
+
+    Uses OPENAPI_SCHEMA_FILE when set, otherwise generates from the routes.
+    """
+    payload: Optional[PrecompressedPayload] = getattr(
+        app.state, "openapi_payload", None
+    )
+    if payload is None:
+        if OPENAPI_SCHEMA_FILE:
+            body = Path(OPENAPI_SCHEMA_FILE).read_bytes()
+            source = OPENAPI_SCHEMA_FILE
+        else:
+            body = render_openapi(app)
+            source = "generated"
+        payload = PrecompressedPayload(body)
+        app.state.openapi_payload = payload
+        logger.info("OpenAPI schema ready", source=source, size=len(body))
+    return payload
+
+
+schema_router = APIRouter(include_in_schema=False)
+
+
+@schema_router.get(OPENAPI_URL)
+def openapi_json(request: Request):
+    """OpenAPI schema (cached bytes, precompressed variants)."""
+    return get_openapi_payload(request.app).response(
+        request.headers.get("accept-encoding")
+    )
+
+
+docs_router = APIRouter(include_in_schema=False)
+
+
+@docs_router.get(DOCS_URL)
+def swagger_ui(request: Request):
+    return get_swagger_ui_html(
+        openapi_url=OPENAPI_URL,
+        title=f"{request.app.title} - Swagger UI",
+        oauth2_redirect_url=OAUTH2_REDIRECT_URL,
+    )
+
+
+@docs_router.get(OAUTH2_REDIRECT_URL)
+def swagger_ui_redirect():
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+@docs_router.get(REDOC_URL)
+def redoc(request: Request):
+    return get_redoc_html(openapi_url=OPENAPI_URL, title=f"{request.app.title} - ReDoc")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.openapi")
+    parser.add_argument("--output", type=Path, default=Path("openapi.json"))
+    args = parser.parse_args(argv)
+
+    from app.main import app
+
+    args.output.write_bytes(render_openapi(app))
+    print(f"OpenAPI schema written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,3 +3,8 @@
 
 def predict_symptoms(data):
     return {"prediction": "unknown"}
+
+
+def run_quantum_simulation(data):
+    # Placeholder until the simulation model lands; same shape as the job result
+    return {"model": "quantum_v1", **predict_symptoms(data)}
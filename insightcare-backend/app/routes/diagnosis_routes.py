@@ -7,7 +7,8 @@ from app.models.diagnosis_result import DiagnosisResult
 from app.models.patient import Patient
 from app.models.audit import AuditLog
 from app.utils.auth_helpers import get_current_user
-from app.tasks import run_diagnosis_task
+from app.services.job_queue import enqueue_job
+from app.tasks import DIAGNOSIS_RESULT_JOB, run_diagnosis_result
 from typing import Optional
 
 router = APIRouter(prefix="/api/diagnosis", tags=["Diagnosis"])
@@ -49,13 +50,13 @@ def request_diagnosis(
     db.refresh(diag)
 
     if payload.run_async:
-        celery_task = run_diagnosis_task.delay(diag.id)
+        job = enqueue_job(db, DIAGNOSIS_RESULT_JOB, {"diagnosis_result_id": diag.id})
         audit = AuditLog(
             user_id=user.id,
             action="start_diagnosis_task",
             resource=f"diagnosis:{diag.id}",
             ip=request.client.host,
-            metadata={"celery_task_id": celery_task.id},
+            metadata={"job_id": str(job.id)},
         )
         db.add(audit)
         db.commit()
@@ -67,7 +68,12 @@ def request_diagnosis(
             output={},
         )
     else:
-        res = run_diagnosis_task.apply(args=[diag.id]).get()
+        try:
+            run_diagnosis_result(db, diag)
+        except Exception as e:
+            diag.status = "failed"
+            diag.output_payload = {"error": str(e)}
+        db.commit()
         db.refresh(diag)
         return DiagnosisResponse(
             diagnosis_id=diag.id,
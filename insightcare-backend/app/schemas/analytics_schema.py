@@ -0,0 +1,72 @@
+# app/schemas/analytics_schema.py
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import List, Optional
+
+
+class AnalyticsStatus(BaseModel):
+    """Schema for how current the analytics aggregates are."""
+
+    as_of: Optional[datetime] = Field(
+        None, description="Creation time of the last diagnosis counted"
+    )
+    refreshed_at: Optional[datetime] = None
+    diagnoses_counted: int
+
+
+class AnalyticsRefreshOut(AnalyticsStatus):
+    """Schema for the result of an analytics refresh."""
+
+    processed: int = Field(..., description="Diagnoses counted by this refresh")
+
+
+class DailyCount(BaseModel):
+    """Schema for one day's count."""
+
+    day: date
+    count: int
+
+
+class DiseaseTrend(BaseModel):
+    """Schema for one disease's diagnoses over the window."""
+
+    disease: str
+    total: int
+    daily: List[DailyCount] = Field(..., description="Days with diagnoses only")
+
+
+class DiseaseTrendsResponse(AnalyticsStatus):
+    """Schema for disease trends response."""
+
+    start: date
+    end: date
+    diseases: List[DiseaseTrend]
+
+
+class SymptomCount(BaseModel):
+    """Schema for how many diagnoses list a symptom."""
+
+    symptom: str
+    count: int
+
+
+class SymptomFrequencyResponse(AnalyticsStatus):
+    """Schema for symptom frequency response."""
+
+    start: date
+    end: date
+    symptoms: List[SymptomCount]
+
+
+class SymptomPair(BaseModel):
+    """Schema for how many diagnoses list both symptoms."""
+
+    symptoms: List[str]
+    count: int
+
+
+class SymptomCooccurrenceResponse(AnalyticsStatus):
+    """Schema for symptom co-occurrence response."""
+
+    symptom: Optional[str] = None
+    pairs: List[SymptomPair]
@@ -76,3 +76,27 @@ class DiagnosisHistoryResponse(BaseModel):
     page: int
     limit: int
     results: List[DiagnosisHistoryItem]
+
+
+class DiagnosisSearchItem(DiagnosisHistoryItem):
+    """Schema for a diagnosis search result."""
+
+    matched_symptoms: List[str]
+    rank: float
+
+
+class DiagnosisSearchResponse(BaseModel):
+    """Schema for diagnosis search response."""
+
+    page: int
+    limit: int
+    has_more: bool
+    results: List[DiagnosisSearchItem]
+
+
+class DiagnosisCohortResponse(BaseModel):
+    """Schema for diagnoses matching a set of symptoms."""
+
+    total: Optional[int] = None
+    items: List[DiagnosisHistoryItem]
+    next_cursor: Optional[str] = None
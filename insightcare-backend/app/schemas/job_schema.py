@@ -0,0 +1,19 @@
+# app/schemas/job_schema.py
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional
+import uuid
+
+
+class JobOut(BaseModel):
+    """Schema for a background job's status."""
+
+    job_id: uuid.UUID
+    kind: str
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    attempts: int
+    result: Optional[dict] = Field(None, description="Handler output once succeeded")
+    error: Optional[str] = Field(None, description="Last error once failed")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -1,11 +1,11 @@
 # app/schemas/patient_schema.py
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
 
 
 class PatientCreate(BaseModel):
     name: str
-    age: Optional[int]
+    age: Optional[int] = None
     blood_pressure: Optional[float] = None
     cholesterol: Optional[float] = None
     diagnosis: Optional[str] = None
@@ -14,5 +14,9 @@ class PatientCreate(BaseModel):
 class PatientResponse(PatientCreate):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PatientPage(BaseModel):
+    items: List[PatientResponse]
+    next_cursor: Optional[str] = None
@@ -1,18 +1,33 @@
-# app/schemas/symptom_schema.py
-from pydantic import BaseModel, Field, validator
-from typing import Optional, Dict
-import bleach
+from html.parser import HTMLParser
+import html
+import uuid
+from pydantic import BaseModel, ConfigDict, Field, validator
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+
+class _TextOnly(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+
+    def handle_data(self, data: str):
+        self.parts.append(data)
 
 
 def sanitize_text(s: str) -> str:
-    return bleach.clean(s or "", tags=[], strip=True)
+    """Strip markup from ``s``, keeping its text with &, < and > escaped."""
+    parser = _TextOnly()
+    parser.feed(s or "")
+    parser.close()
+    return html.escape("".join(parser.parts), quote=False)
 
 
 class SymptomCreate(BaseModel):
     patient_id: int
     text: str = Field(..., min_length=1, max_length=2000)
     structured: Optional[Dict] = {}
-    severity: Optional[str] = Field(None, regex="^(mild|moderate|severe|unknown)$")
+    severity: Optional[str] = Field(None, pattern="^(mild|moderate|severe|unknown)$")
 
     @validator("text")
     def clean_text(cls, v):
@@ -21,8 +36,49 @@ class SymptomCreate(BaseModel):
 
 class SymptomResponse(SymptomCreate):
     id: int
-    reported_by: Optional[int]
-    created_at: Optional[str]
+    reported_by: Optional[uuid.UUID]
+    created_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SymptomEntry(BaseModel):
+    id: int
+    reported_by: Optional[uuid.UUID]
+    text: str
+    severity: Optional[str]
+    created_at: datetime
+
+
+class SymptomPage(BaseModel):
+    items: List[SymptomEntry]
+    next_cursor: Optional[str] = None
+
+
+class TimelineBucket(BaseModel):
+    start: date
+    count: int
+    max_severity: Optional[str]
+
+
+class SymptomTimeline(BaseModel):
+    bucket: str
+    start: datetime
+    end: datetime
+    buckets: List[TimelineBucket]
+
+
+class SymptomSearchResult(BaseModel):
+    id: int
+    patient_id: int
+    severity: Optional[str]
+    created_at: datetime
+    rank: float
+    snippet: str
+
 
-    class Config:
-        orm_mode = True
+class SymptomSearchResponse(BaseModel):
+    page: int
+    limit: int
+    has_more: bool
+    results: List[SymptomSearchResult]
@@ -0,0 +1,64 @@
+# app/server.py
+"""
+Production entry point: uvicorn with a drain period before shutdown.
+
+    python -m app.server --host 0.0.0.0 --port 8000
+
+Plain uvicorn closes its listening socket the moment SIGTERM arrives, while
+load balancers may still be routing to the worker (connection resets during
+rolling deploys). Here the first SIGTERM only fails /readyz; the worker keeps
+serving for SHUTDOWN_GRACE_SECONDS, then stops accepting connections and
+waits up to SHUTDOWN_DRAIN_SECONDS for in-flight requests before the
+lifespan shutdown drains queues and disposes the engine. A second signal
+exits immediately.
+"""
+
+import argparse
+import asyncio
+import signal
+import uvicorn
+from app.config import SHUTDOWN_DRAIN_SECONDS, SHUTDOWN_GRACE_SECONDS
+from app.services.lifecycle import shutdown_coordinator
+
+
+class GracefulServer(uvicorn.Server):
+    def __init__(self, config: uvicorn.Config, grace: float = SHUTDOWN_GRACE_SECONDS):
+        super().__init__(config)
+        self.grace = grace
+        self._grace_handle = None
+
+    def handle_exit(self, sig, frame):
+        if self._grace_handle is not None or sig != signal.SIGTERM or not self.grace:
+            # Second signal, or Ctrl+C in development: stop now
+            if self._grace_handle is not None:
+                self._grace_handle.cancel()
+            shutdown_coordinator.close()
+            return super().handle_exit(sig, frame)
+
+        shutdown_coordinator.begin_drain()
+        self._grace_handle = asyncio.get_event_loop().call_later(
+            self.grace, self._stop, sig, frame
+        )
+
+    def _stop(self, sig, frame):
+        shutdown_coordinator.close()
+        super().handle_exit(sig, frame)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    config = uvicorn.Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        timeout_graceful_shutdown=int(SHUTDOWN_DRAIN_SECONDS),
+    )
+    GracefulServer(config).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+# app/services/analytics_service.py
+"""
+Disease and symptom analytics, precomputed from diagnoses.
+
+The ``analytics_*`` tables (app/models/analytics.py) hold daily counts per
+top predicted disease and per symptom, and symptom co-occurrence counts.
+A refresh reads only the diagnoses after the watermark, in (created_at, id)
+order, adds their counts and moves the watermark in the same transaction,
+so readers never scan ``diagnoses`` or parse its JSON.
+
+Deleted diagnoses stay counted until a full rebuild.
+"""
+
+import asyncio
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from itertools import combinations
+from typing import List, Optional
+import structlog
+from fastapi import HTTPException, status
+from sqlalchemy import Table, delete, func, literal, or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import (
+    ANALYTICS_REFRESH_BATCH_SIZE,
+    ANALYTICS_REFRESH_INTERVAL_SECONDS,
+    ANALYTICS_REFRESH_LAG_SECONDS,
+)
+from app.database import SessionLocal
+from app.models.analytics import (
+    AnalyticsWatermark,
+    DiseaseDailyCount,
+    SymptomDailyCount,
+    SymptomPairCount,
+)
+from app.models.diagnosis import GUID, Diagnosis
+
+logger = structlog.get_logger()
+
+WATERMARK = "diagnoses"
+# Widest window the trend endpoints aggregate over
+MAX_WINDOW_DAYS = 366
+
+
+def _insert(db: Session, table: Table):
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(table)
+
+
+def _add_counts(db: Session, table: Table, keys: List[str], counts: Counter):
+    """Add ``counts`` (key tuple -> n) to ``table``'s rows, creating them."""
+    if not counts:
+        return
+    statement = _insert(db, table)
+    statement = statement.on_conflict_do_update(
+        index_elements=keys, set_={"count": table.c.count + statement.excluded.count}
+    )
+    db.execute(statement, [dict(zip(keys, key), count=n) for key, n in counts.items()])
+
+
+def _lock_watermark(db: Session) -> AnalyticsWatermark:
+    """The watermark row, locked until commit (concurrent refreshes queue)."""
+    db.execute(
+        _insert(db, AnalyticsWatermark.__table__)
+        .values(name=WATERMARK, rows_processed=0)
+        .on_conflict_do_nothing()
+    )
+    return db.scalars(
+        select(AnalyticsWatermark)
+        .where(AnalyticsWatermark.name == WATERMARK)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).one()
+
+
+def _utc_day(value: datetime) -> date:
+    # SQLite returns naive timestamps, already UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def refresh_analytics(
+    db: Session,
+    batch_size: int = ANALYTICS_REFRESH_BATCH_SIZE,
+    lag_seconds: int = ANALYTICS_REFRESH_LAG_SECONDS,
+) -> int:
+    """
+    Count the diagnoses created since the last refresh.
+
+    Batches of ``batch_size`` diagnoses are counted and committed with the
+    watermark, so an interrupted refresh resumes where it stopped.
+    Diagnoses younger than ``lag_seconds`` wait for the next refresh: their
+    timestamp is set before they commit, so one still committing could
+    otherwise land behind the watermark.
+
+    Args:
+        db: Database session
+        batch_size: Diagnoses per transaction
+        lag_seconds: Leave diagnoses this recent for later
+
+    Returns:
+        Number of diagnoses counted
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=lag_seconds)
+    processed = 0
+    while True:
+        watermark = _lock_watermark(db)
+        query = select(
+            Diagnosis.id,
+            Diagnosis.created_at,
+            Diagnosis.symptoms,
+            Diagnosis.predictions,
+        ).where(Diagnosis.created_at < cutoff)
+        if watermark.created_at is not None:
+            query = query.where(
+                tuple_(Diagnosis.created_at, Diagnosis.id)
+                > tuple_(watermark.created_at, literal(watermark.diagnosis_id, GUID()))
+            )
+        rows = db.execute(
+            query.order_by(Diagnosis.created_at, Diagnosis.id).limit(batch_size)
+        ).all()
+
+        diseases, symptoms, pairs = Counter(), Counter(), Counter()
+        for row in rows:
+            day = _utc_day(row.created_at)
+            disease = row.predictions[0]["disease"] if row.predictions else "Unknown"
+            diseases[day, disease] += 1
+            names = sorted(set(row.symptoms))
+            symptoms.update((day, name) for name in names)
+            pairs.update(combinations(names, 2))
+        _add_counts(db, DiseaseDailyCount.__table__, ["day", "disease"], diseases)
+        _add_counts(db, SymptomDailyCount.__table__, ["day", "symptom"], symptoms)
+        _add_counts(db, SymptomPairCount.__table__, ["symptom_a", "symptom_b"], pairs)
+
+        if rows:
+            watermark.created_at = rows[-1].created_at
+            watermark.diagnosis_id = rows[-1].id
+            watermark.rows_processed += len(rows)
+        watermark.refreshed_at = datetime.now(timezone.utc)
+        db.commit()
+        processed += len(rows)
+        if len(rows) < batch_size:
+            break
+
+    if processed:
+        logger.info("Analytics refreshed", diagnoses=processed)
+    return processed
+
+
+def rebuild_analytics(db: Session, **kwargs) -> int:
+    """
+    Recount every diagnosis from scratch (e.g. after deletions).
+
+    Returns:
+        Number of diagnoses counted
+    """
+    watermark = _lock_watermark(db)
+    for model in (DiseaseDailyCount, SymptomDailyCount, SymptomPairCount):
+        db.execute(delete(model))
+    watermark.created_at = None
+    watermark.diagnosis_id = None
+    watermark.rows_processed = 0
+    db.commit()
+    return refresh_analytics(db, **kwargs)
+
+
+def get_analytics_status(db: Session) -> dict:
+    """How current the aggregates are."""
+    watermark = db.get(AnalyticsWatermark, WATERMARK)
+    return {
+        "as_of": watermark.created_at if watermark else None,
+        "refreshed_at": watermark.refreshed_at if watermark else None,
+        "diagnoses_counted": watermark.rows_processed if watermark else 0,
+    }
+
+
+def analytics_window(start: Optional[date], end: Optional[date]) -> tuple[date, date]:
+    """
+    Inclusive day range, by default the last 30 days.
+
+    Raises:
+        HTTPException: 400 if the range is empty or too wide
+    """
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=29)
+    if start > end or (end - start).days >= MAX_WINDOW_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must be positive and at most {MAX_WINDOW_DAYS} days",
+        )
+    return start, end
+
+
+def get_disease_trends(db: Session, start: date, end: date, top: int = 10) -> dict:
+    """
+    Daily diagnosis counts of the ``top`` diseases between two days.
+
+    Args:
+        db: Database session
+        start: First day (UTC)
+        end: Last day (UTC), inclusive
+        top: Most frequent diseases to include
+
+    Returns:
+        Dict with the window, freshness and, per disease (most frequent
+        first), its total and the days it was diagnosed
+    """
+    in_window = (DiseaseDailyCount.day >= start, DiseaseDailyCount.day <= end)
+    total = func.sum(DiseaseDailyCount.count)
+    totals = db.execute(
+        select(DiseaseDailyCount.disease, total)
+        .where(*in_window)
+        .group_by(DiseaseDailyCount.disease)
+        .order_by(total.desc(), DiseaseDailyCount.disease)
+        .limit(top)
+    ).all()
+    diseases = {
+        disease: {"disease": disease, "total": count, "daily": []}
+        for disease, count in totals
+    }
+    days = db.execute(
+        select(
+            DiseaseDailyCount.disease, DiseaseDailyCount.day, DiseaseDailyCount.count
+        )
+        .where(*in_window, DiseaseDailyCount.disease.in_(diseases))
+        .order_by(DiseaseDailyCount.day)
+    ).all()
+    for disease, day, count in days:
+        diseases[disease]["daily"].append({"day": day, "count": count})
+
+    return {
+        "start": start,
+        "end": end,
+        **get_analytics_status(db),
+        "diseases": list(diseases.values()),
+    }
+
+
+def get_symptom_frequency(db: Session, start: date, end: date, limit: int = 50) -> dict:
+    """
+    The most reported symptoms between two days.
+
+    Args:
+        db: Database session
+        start: First day (UTC)
+        end: Last day (UTC), inclusive
+        limit: Symptoms to include
+
+    Returns:
+        Dict with the window, freshness and symptoms (most frequent first)
+        with the number of diagnoses listing them
+    """
+    total = func.sum(SymptomDailyCount.count)
+    rows = db.execute(
+        select(SymptomDailyCount.symptom, total)
+        .where(SymptomDailyCount.day >= start, SymptomDailyCount.day <= end)
+        .group_by(SymptomDailyCount.symptom)
+        .order_by(total.desc(), SymptomDailyCount.symptom)
+        .limit(limit)
+    ).all()
+    return {
+        "start": start,
+        "end": end,
+        **get_analytics_status(db),
+        "symptoms": [{"symptom": symptom, "count": count} for symptom, count in rows],
+    }
+
+
+def get_symptom_cooccurrence(
+    db: Session, symptom: Optional[str] = None, limit: int = 50
+) -> dict:
+    """
+    Symptoms most often reported together (all time).
+
+    Args:
+        db: Database session
+        symptom: Only pairs including this symptom
+        limit: Pairs to include
+
+    Returns:
+        Dict with freshness and pairs (most frequent first) with the number
+        of diagnoses listing both
+    """
+    query = select(SymptomPairCount)
+    if symptom is not None:
+        symptom = symptom.strip().lower()
+        query = query.where(
+            or_(
+                SymptomPairCount.symptom_a == symptom,
+                SymptomPairCount.symptom_b == symptom,
+            )
+        )
+    pairs = db.scalars(
+        query.order_by(
+            SymptomPairCount.count.desc(),
+            SymptomPairCount.symptom_a,
+            SymptomPairCount.symptom_b,
+        ).limit(limit)
+    ).all()
+    return {
+        "symptom": symptom,
+        **get_analytics_status(db),
+        "pairs": [
+            {"symptoms": [pair.symptom_a, pair.symptom_b], "count": pair.count}
+            for pair in pairs
+        ],
+    }
+
+
+def _refresh_once() -> int:
+    db = SessionLocal()
+    try:
+        return refresh_analytics(db)
+    finally:
+        db.close()
+
+
+async def run_analytics_refresher(
+    interval: float = ANALYTICS_REFRESH_INTERVAL_SECONDS,
+):
+    """Periodically refresh the analytics aggregates until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(_refresh_once)
+        except Exception as e:
+            logger.error("Analytics refresh failed", error=str(e))
@@ -2,10 +2,15 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta, timezone
-import secrets
 from app.models.user import User
 from app.schemas.user_schema import UserRegister, UserLogin
-from app.utils.security import get_password_hash, verify_password, create_access_token
+from app.utils.security import (
+    get_password_hash,
+    verify_password,
+    create_access_token,
+    DUMMY_PASSWORD_HASH,
+)
+from app.services.token_service import issue_token, EMAIL_VERIFICATION
 
 
 async def register_user(db: Session, user_data: UserRegister) -> User:
@@ -32,10 +37,6 @@ async def register_user(db: Session, user_data: UserRegister) -> User:
     # Hash password
     hashed_password = get_password_hash(user_data.password)
 
-    # Generate verification token
-    verification_token = secrets.token_urlsafe(32)
-    verification_token_expires = datetime.now(timezone.utc) + timedelta(hours=24)
-
     # Create new user
     new_user = User(
         name=user_data.name,
@@ -43,11 +44,15 @@ async def register_user(db: Session, user_data: UserRegister) -> User:
         password_hash=hashed_password,
         is_active=True,
         is_verified=False,
-        verification_token=verification_token,
-        verification_token_expires=verification_token_expires,
     )
 
     db.add(new_user)
+    db.flush()
+
+    # Generate verification token
+    verification_token = issue_token(
+        db, new_user.id, EMAIL_VERIFICATION, timedelta(hours=24)
+    )
     db.commit()
     db.refresh(new_user)
 
@@ -80,6 +85,8 @@ def authenticate_user(db: Session, login_data: UserLogin) -> tuple[User, str]:
     # Find user by email
     user = db.query(User).filter(User.email == login_data.email).first()
     if not user:
+        # Spend the same bcrypt time as a real check so timing doesn't leak
+        verify_password(login_data.password, DUMMY_PASSWORD_HASH)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password"
         )
@@ -0,0 +1,376 @@
+# app/services/bulk_import.py
+"""
+Bulk import of patients and symptoms from CSV or NDJSON uploads.
+
+The request body is parsed as it arrives, validated row by row and written a
+chunk at a time (``COPY`` on Postgres, executemany elsewhere), so memory use
+doesn't grow with the upload. Invalid rows are collected in the report
+instead of failing the whole load.
+"""
+
+import codecs
+import csv
+import io
+import json
+import uuid
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+import orjson
+import structlog
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import Table, insert, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import BULK_IMPORT_CHUNK_SIZE, BULK_IMPORT_MAX_ERRORS
+from app.models.patient import Patient
+from app.models.symptom import Symptom
+from app.schemas.patient_schema import PatientCreate
+from app.schemas.symptom_schema import SymptomCreate
+
+logger = structlog.get_logger()
+
+CSV = "csv"
+NDJSON = "ndjson"
+CONTENT_TYPES = {
+    "text/csv": CSV,
+    "application/csv": CSV,
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+}
+
+# A parsed record, or the reason it couldn't be parsed
+Record = Tuple[int, Optional[dict], Optional[str]]
+
+
+def detect_format(content_type: Optional[str]) -> str:
+    """
+    Upload format from the Content-Type header.
+
+    Raises:
+        HTTPException: 415 for anything but CSV or NDJSON
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type not in CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload text/csv (with a header row) or application/x-ndjson",
+        )
+    return CONTENT_TYPES[media_type]
+
+
+class RecordParser:
+    """
+    Incremental CSV/NDJSON parser: feed it text in any pieces, get back the
+    records completed so far, numbered from 1 (the CSV header isn't counted).
+    """
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.header: Optional[List[str]] = None
+        self.count = 0
+        self._buffer = ""
+        # Physical lines of a CSV record whose quoted field spans lines
+        self._open: List[str] = []
+
+    def feed(self, text: str) -> List[Record]:
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split("\n")
+        return self._parse(lines)
+
+    def close(self) -> List[Record]:
+        """Records left at the end of the upload."""
+        lines, self._buffer = [self._buffer], ""
+        records = self._parse(lines)
+        if self._open:
+            self._open = []
+            records.append(self._error("unterminated quoted field"))
+        return records
+
+    def _error(self, message: str) -> Record:
+        self.count += 1
+        return self.count, None, message
+
+    def _parse(self, lines: List[str]) -> List[Record]:
+        records = []
+        for line in lines:
+            if self.fmt == NDJSON:
+                record = self._parse_json(line)
+            else:
+                record = self._parse_csv(line)
+            if record is not None:
+                records.append(record)
+        return records
+
+    def _parse_json(self, line: str) -> Optional[Record]:
+        if not line.strip():
+            return None
+        try:
+            value = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            return self._error(f"invalid JSON: {e}")
+        if not isinstance(value, dict):
+            return self._error("expected a JSON object")
+        self.count += 1
+        return self.count, value, None
+
+    def _parse_csv(self, line: str) -> Optional[Record]:
+        self._open.append(line)
+        # An odd number of quotes so far means a quoted field continues on
+        # the next line ("" escapes come in pairs)
+        if sum(part.count('"') for part in self._open) % 2:
+            return None
+        text = "\n".join(self._open).rstrip("\r")
+        self._open = []
+        if not text.strip():
+            return None
+        try:
+            fields = next(csv.reader([text]))
+        except csv.Error as e:
+            return self._error(f"invalid CSV: {e}")
+        if self.header is None:
+            self.header = [name.strip() for name in fields]
+            return None
+        if len(fields) != len(self.header):
+            return self._error(f"expected {len(self.header)} fields, got {len(fields)}")
+        self.count += 1
+        # Empty cells are missing values
+        values = {
+            name: (value if value != "" else None)
+            for name, value in zip(self.header, fields)
+        }
+        return self.count, values, None
+
+
+class ImportSpec:
+    """
+    What a bulk import writes: ``prepare`` turns a parsed record into column
+    values (raising ValidationError), ``check`` optionally rejects prepared
+    rows with a reason, e.g. unknown foreign keys, in one query per chunk.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        table: Table,
+        columns: Sequence[str],
+        prepare: Callable[[dict], dict],
+        check: Optional[Callable[[Session, List[dict]], Dict[int, str]]] = None,
+    ):
+        self.name = name
+        self.table = table
+        self.columns = list(columns)
+        self.prepare = prepare
+        self.check = check
+
+
+class ImportReport:
+    """Counts and per-row errors (the first ``max_errors`` of them)."""
+
+    def __init__(self, kind: str, fmt: str, max_errors: int):
+        self.kind = kind
+        self.fmt = fmt
+        self.max_errors = max_errors
+        self.total = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def error(self, row: int, messages: List[str]):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "errors": messages})
+
+    def summary(self) -> dict:
+        """Counts only (for the audit log)."""
+        return {
+            "kind": self.kind,
+            "format": self.fmt,
+            "total": self.total,
+            "imported": self.imported,
+            "failed": self.failed,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            **self.summary(),
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def _validation_messages(e: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in e.errors()
+    ]
+
+
+def _copy_value(value) -> str:
+    # COPY ... (FORMAT csv): unquoted empty is NULL, quoted empty is ''
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def write_rows(db: Session, table: Table, columns: List[str], rows: List[dict]):
+    """
+    Insert rows in the session's transaction: ``COPY`` on Postgres
+    (psycopg2), an executemany INSERT otherwise.
+    """
+    connection = db.connection()
+    if connection.dialect.name == "postgresql":
+        cursor = connection.connection.cursor()
+        if hasattr(cursor, "copy_expert"):
+            buffer = io.StringIO()
+            for row in rows:
+                buffer.write(",".join(_copy_value(row[c]) for c in columns) + "\n")
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+            return
+    db.execute(insert(table), rows)
+
+
+def import_chunk(
+    db: Session, spec: ImportSpec, records: List[Record], report: ImportReport
+):
+    """Validate and write one chunk of records, committing it on its own."""
+    rows, numbers = [], []
+    for number, record, parse_error in records:
+        report.total += 1
+        if parse_error is not None:
+            report.error(number, [parse_error])
+            continue
+        try:
+            rows.append(spec.prepare(record))
+            numbers.append(number)
+        except ValidationError as e:
+            report.error(number, _validation_messages(e))
+
+    if rows and spec.check is not None:
+        rejected = spec.check(db, rows)
+        for index in sorted(rejected):
+            report.error(numbers[index], [rejected[index]])
+        rows = [row for i, row in enumerate(rows) if i not in rejected]
+        numbers = [n for i, n in enumerate(numbers) if i not in rejected]
+    if not rows:
+        return
+
+    try:
+        write_rows(db, spec.table, spec.columns, rows)
+        db.commit()
+        report.imported += len(rows)
+    except Exception as e:
+        # Earlier chunks stay imported; these rows are reported as failed
+        db.rollback()
+        logger.warning("Import chunk failed", kind=spec.name, error=str(e))
+        for number in numbers:
+            report.error(number, [f"write failed: {type(e).__name__}"])
+
+
+async def import_stream(
+    db: Session,
+    body: AsyncIterator[bytes],
+    fmt: str,
+    spec: ImportSpec,
+    chunk_size: int = BULK_IMPORT_CHUNK_SIZE,
+    max_errors: int = BULK_IMPORT_MAX_ERRORS,
+) -> ImportReport:
+    """
+    Import an upload as it streams in.
+
+    Args:
+        db: Database session
+        body: The request body (e.g. ``request.stream()``)
+        fmt: CSV or NDJSON (see detect_format)
+        spec: What to validate and write
+        chunk_size: Rows validated and committed together
+        max_errors: Row errors kept for the report (all are counted)
+
+    Returns:
+        The import report
+
+    Raises:
+        HTTPException: 400 if the body isn't UTF-8
+    """
+    parser = RecordParser(fmt)
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    report = ImportReport(spec.name, fmt, max_errors)
+    pending: List[Record] = []
+
+    async def flush(final: bool = False):
+        nonlocal pending
+        while len(pending) >= chunk_size or (final and pending):
+            chunk, pending = pending[:chunk_size], pending[chunk_size:]
+            await run_in_threadpool(import_chunk, db, spec, chunk, report)
+
+    try:
+        async for data in body:
+            pending.extend(parser.feed(decoder.decode(data)))
+            await flush()
+        pending.extend(parser.feed(decoder.decode(b"", final=True)))
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Upload must be UTF-8"
+        )
+    pending.extend(parser.close())
+    await flush(final=True)
+
+    logger.info("Bulk import finished", **report.summary())
+    return report
+
+
+def _prepare_patient(record: dict) -> dict:
+    return PatientCreate(**record).model_dump()
+
+
+PATIENT_IMPORT = ImportSpec(
+    name="patients",
+    table=Patient.__table__,
+    columns=["name", "age", "blood_pressure", "cholesterol", "diagnosis"],
+    prepare=_prepare_patient,
+)
+
+
+def _check_patients_exist(db: Session, rows: List[dict]) -> Dict[int, str]:
+    ids = {row["patient_id"] for row in rows}
+    found = set(db.execute(select(Patient.id).where(Patient.id.in_(ids))).scalars())
+    return {
+        index: "patient_id: Patient not found"
+        for index, row in enumerate(rows)
+        if row["patient_id"] not in found
+    }
+
+
+def symptom_import_spec(reported_by: Optional[uuid.UUID]) -> ImportSpec:
+    """Symptom import, recorded as reported by the uploading user."""
+
+    def prepare(record: dict) -> dict:
+        structured = record.get("structured")
+        if isinstance(structured, str):
+            # A JSON cell in CSV uploads
+            try:
+                record = {**record, "structured": json.loads(structured)}
+            except ValueError:
+                pass  # reported by validation
+        symptom = SymptomCreate(**record)
+        return {
+            "patient_id": symptom.patient_id,
+            "reported_by": reported_by,
+            "text": symptom.text,
+            "structured": symptom.structured or {},
+            "severity": symptom.severity,
+        }
+
+    return ImportSpec(
+        name="symptoms",
+        table=Symptom.__table__,
+        columns=["patient_id", "reported_by", "text", "structured", "severity"],
+        prepare=prepare,
+        check=_check_patients_exist,
+    )
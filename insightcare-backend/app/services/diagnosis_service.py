@@ -1,145 +1,170 @@
 # app/services/diagnosis_service.py
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import column, func, literal, select, table, tuple_
 from sqlalchemy.orm import Session
 import uuid
-from datetime import datetime
-from app.models.diagnosis import Diagnosis
-from app.schemas.diagnosis_schema import DiagnosisRequest, PredictionOut
+from datetime import datetime, timezone
+from app.models.diagnosis import GUID, Diagnosis
+from app.schemas.diagnosis_schema import DiagnosisRequest
+from app.services.events import publish_after_commit, user_channel
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# Rule-based matching: (trigger symptoms, prediction). A Phase 2
+# placeholder before real AI integration.
+DIAGNOSIS_RULES: List[Tuple[Tuple[str, ...], Dict]] = [
+    # Cold/Flu symptoms
+    (
+        ("fever", "cough", "headache", "sore throat", "runny nose"),
+        {
+            "disease": "Common Cold",
+            "confidence": 0.85,
+            "severity": "mild",
+            "description": "Viral infection affecting the upper respiratory tract",
+            "recommendations": [
+                "Get plenty of rest",
+                "Drink fluids to stay hydrated",
+                "Use over-the-counter cold medications",
+                "Gargle with salt water for sore throat",
+            ],
+        },
+    ),
+    # Flu symptoms
+    (
+        ("high fever", "body aches", "fatigue", "chills"),
+        {
+            "disease": "Influenza (Flu)",
+            "confidence": 0.78,
+            "severity": "moderate",
+            "description": "Contagious respiratory illness caused by influenza viruses",
+            "recommendations": [
+                "Rest and sleep as much as possible",
+                "Drink plenty of fluids",
+                "Consider antiviral medications if within 48 hours",
+                "Isolate from others to prevent spread",
+            ],
+        },
+    ),
+    # Allergies
+    (
+        ("sneezing", "itchy eyes", "watery eyes", "congestion"),
+        {
+            "disease": "Seasonal Allergies",
+            "confidence": 0.72,
+            "severity": "mild",
+            "description": "Allergic reaction to airborne substances like pollen",
+            "recommendations": [
+                "Use antihistamine medications",
+                "Avoid known allergens",
+                "Keep windows closed during high pollen days",
+                "Consider allergy testing",
+            ],
+        },
+    ),
+    # Migraine
+    (
+        ("severe headache", "nausea", "sensitivity to light", "dizziness"),
+        {
+            "disease": "Migraine",
+            "confidence": 0.80,
+            "severity": "moderate",
+            "description": "Intense headache often accompanied by nausea and light sensitivity",
+            "recommendations": [
+                "Rest in a quiet, dark room",
+                "Apply cold compress to head",
+                "Take migraine-specific medication",
+                "Identify and avoid triggers",
+            ],
+        },
+    ),
+    # Gastroenteritis
+    (
+        ("nausea", "vomiting", "diarrhea", "stomach pain", "cramping"),
+        {
+            "disease": "Gastroenteritis (Stomach Flu)",
+            "confidence": 0.76,
+            "severity": "moderate",
+            "description": "Inflammation of the digestive tract causing stomach upset",
+            "recommendations": [
+                "Stay hydrated with clear fluids",
+                "Follow BRAT diet (bananas, rice, applesauce, toast)",
+                "Avoid dairy and fatty foods",
+                "Rest and allow recovery time",
+            ],
+        },
+    ),
+]
+
+# When no rule matches
+UNKNOWN_PREDICTION = {
+    "disease": "Unspecified Condition",
+    "confidence": 0.45,
+    "severity": "unknown",
+    "description": "Symptoms do not match common patterns in our database",
+    "recommendations": [
+        "Consult a healthcare professional",
+        "Monitor symptoms closely",
+        "Keep a symptom diary",
+        "Seek immediate care if symptoms worsen",
+    ],
+}
+
+TOP_K = 5
+
+
+def _top_predictions(predictions: List[Dict]) -> List[Dict]:
+    # Sort by confidence and return top 5
+    return sorted(predictions, key=lambda x: x["confidence"], reverse=True)[:TOP_K]
 
 
-def mock_ai_diagnosis(symptoms: List[str]) -> List[Dict]:
+def iter_ai_diagnosis(symptoms: List[str]) -> Iterator[List[Dict]]:
     """
-    Mock AI diagnosis function using rule-based matching.
-    This is a Phase 2 placeholder before real AI integration.
+    Top predictions after each matching rule; the last one yielded is final.
+
+    Lets callers stream partial results while the rest are computed.
 
     Args:
         symptoms: List of symptom strings (lowercased)
-
-    Returns:
-        List of prediction dictionaries
     """
     predictions = []
+    for triggers, prediction in DIAGNOSIS_RULES:
+        if any(s in symptoms for s in triggers):
+            predictions.append(
+                {**prediction, "recommendations": list(prediction["recommendations"])}
+            )
+            yield _top_predictions(predictions)
 
-    # Rule 1: Cold/Flu symptoms
-    if any(
-        s in symptoms
-        for s in ["fever", "cough", "headache", "sore throat", "runny nose"]
-    ):
-        predictions.append(
-            {
-                "disease": "Common Cold",
-                "confidence": 0.85,
-                "severity": "mild",
-                "description": "Viral infection affecting the upper respiratory tract",
-                "recommendations": [
-                    "Get plenty of rest",
-                    "Drink fluids to stay hydrated",
-                    "Use over-the-counter cold medications",
-                    "Gargle with salt water for sore throat",
-                ],
-            }
-        )
-
-    # Rule 2: Flu symptoms
-    if any(s in symptoms for s in ["high fever", "body aches", "fatigue", "chills"]):
-        predictions.append(
-            {
-                "disease": "Influenza (Flu)",
-                "confidence": 0.78,
-                "severity": "moderate",
-                "description": "Contagious respiratory illness caused by influenza viruses",
-                "recommendations": [
-                    "Rest and sleep as much as possible",
-                    "Drink plenty of fluids",
-                    "Consider antiviral medications if within 48 hours",
-                    "Isolate from others to prevent spread",
-                ],
-            }
-        )
-
-    # Rule 3: Allergies
-    if any(
-        s in symptoms for s in ["sneezing", "itchy eyes", "watery eyes", "congestion"]
-    ):
-        predictions.append(
+    if not predictions:
+        yield [
             {
-                "disease": "Seasonal Allergies",
-                "confidence": 0.72,
-                "severity": "mild",
-                "description": "Allergic reaction to airborne substances like pollen",
-                "recommendations": [
-                    "Use antihistamine medications",
-                    "Avoid known allergens",
-                    "Keep windows closed during high pollen days",
-                    "Consider allergy testing",
-                ],
+                **UNKNOWN_PREDICTION,
+                "recommendations": list(UNKNOWN_PREDICTION["recommendations"]),
             }
-        )
+        ]
 
-    # Rule 4: Migraine
-    if any(
-        s in symptoms
-        for s in ["severe headache", "nausea", "sensitivity to light", "dizziness"]
-    ):
-        predictions.append(
-            {
-                "disease": "Migraine",
-                "confidence": 0.80,
-                "severity": "moderate",
-                "description": "Intense headache often accompanied by nausea and light sensitivity",
-                "recommendations": [
-                    "Rest in a quiet, dark room",
-                    "Apply cold compress to head",
-                    "Take migraine-specific medication",
-                    "Identify and avoid triggers",
-                ],
-            }
-        )
 
-    # Rule 5: Gastroenteritis
-    if any(
-        s in symptoms
-        for s in ["nausea", "vomiting", "diarrhea", "stomach pain", "cramping"]
-    ):
-        predictions.append(
-            {
-                "disease": "Gastroenteritis (Stomach Flu)",
-                "confidence": 0.76,
-                "severity": "moderate",
-                "description": "Inflammation of the digestive tract causing stomach upset",
-                "recommendations": [
-                    "Stay hydrated with clear fluids",
-                    "Follow BRAT diet (bananas, rice, applesauce, toast)",
-                    "Avoid dairy and fatty foods",
-                    "Rest and allow recovery time",
-                ],
-            }
-        )
+def mock_ai_diagnosis(symptoms: List[str]) -> List[Dict]:
+    """
+    Mock AI diagnosis function using rule-based matching.
+    This is a Phase 2 placeholder before real AI integration.
 
-    # Default: Unknown condition
-    if not predictions:
-        predictions.append(
-            {
-                "disease": "Unspecified Condition",
-                "confidence": 0.45,
-                "severity": "unknown",
-                "description": "Symptoms do not match common patterns in our database",
-                "recommendations": [
-                    "Consult a healthcare professional",
-                    "Monitor symptoms closely",
-                    "Keep a symptom diary",
-                    "Seek immediate care if symptoms worsen",
-                ],
-            }
-        )
+    Args:
+        symptoms: List of symptom strings (lowercased)
 
-    # Sort by confidence and return top 5
-    predictions.sort(key=lambda x: x["confidence"], reverse=True)
-    return predictions[:5]
+    Returns:
+        List of prediction dictionaries
+    """
+    predictions: List[Dict] = []
+    for predictions in iter_ai_diagnosis(symptoms):
+        pass
+    return predictions
 
 
 def create_diagnosis(
-    db: Session, user_id: uuid.UUID, request_data: DiagnosisRequest
+    db: Session,
+    user_id: uuid.UUID,
+    request_data: DiagnosisRequest,
+    commit: bool = True,
+    predictions: Optional[List[Dict]] = None,
 ) -> Diagnosis:
     """
     Create a new diagnosis record with AI predictions.
@@ -148,12 +173,20 @@ def create_diagnosis(
         db: Database session
         user_id: UUID of the authenticated user
         request_data: Diagnosis request with symptoms
+        commit: Commit now; otherwise only flush, leaving the commit to the
+            caller (e.g. the job queue, together with the job's status)
+        predictions: Already computed predictions (e.g. while streaming
+            progress); generated with mock AI if omitted
 
     Returns:
         Created Diagnosis instance
     """
     # Generate predictions using mock AI
-    predictions_data = mock_ai_diagnosis(request_data.symptoms)
+    predictions_data = (
+        predictions
+        if predictions is not None
+        else mock_ai_diagnosis(request_data.symptoms)
+    )
 
     # Create diagnosis record
     diagnosis = Diagnosis(
@@ -162,17 +195,67 @@ def create_diagnosis(
         severity=request_data.severity,
         duration=request_data.duration,
         predictions=predictions_data,
+        # Set here rather than by the database, for the history event below
+        created_at=datetime.now(timezone.utc),
     )
 
     db.add(diagnosis)
-    db.commit()
-    db.refresh(diagnosis)
+    db.flush()
+    # Open dashboards add the entry once it is committed
+    publish_after_commit(db, user_channel(user_id), "history", history_entry(diagnosis))
+    if commit:
+        db.commit()
+        db.refresh(diagnosis)
+    else:
+        db.flush()
 
     return diagnosis
 
 
+def history_entry(diagnosis: Diagnosis) -> dict:
+    """One history list item: the diagnosis with only its top prediction."""
+    top_pred = (
+        diagnosis.predictions[0]
+        if diagnosis.predictions
+        else {"disease": "Unknown", "confidence": 0.0}
+    )
+    return {
+        "diagnosis_id": diagnosis.id,
+        "timestamp": diagnosis.created_at,
+        "symptoms": diagnosis.symptoms,
+        "top_prediction": {
+            "disease": top_pred["disease"],
+            "confidence": top_pred["confidence"],
+        },
+    }
+
+
+def get_history_version(
+    db: Session, user_id: uuid.UUID
+) -> tuple[int, Optional[datetime]]:
+    """
+    Count and newest timestamp of a user's diagnoses, in one aggregate query.
+
+    Any new or deleted diagnosis changes the pair, so it identifies a
+    version of the history without loading it.
+
+    Returns:
+        Tuple of (total count, newest created_at or None)
+    """
+    total, newest = (
+        db.query(func.count(Diagnosis.id), func.max(Diagnosis.created_at))
+        .filter(Diagnosis.user_id == user_id)
+        .one()
+    )
+    return total, newest
+
+
 def get_user_diagnosis_history(
-    db: Session, user_id: uuid.UUID, page: int = 1, limit: int = 10
+    db: Session,
+    user_id: uuid.UUID,
+    page: int = 1,
+    limit: int = 10,
+    total: Optional[int] = None,
 ) -> tuple[List[Diagnosis], int]:
     """
     Get paginated diagnosis history for a user.
@@ -182,6 +265,7 @@ def get_user_diagnosis_history(
         user_id: UUID of the user
         page: Page number (1-indexed)
         limit: Items per page
+        total: Count from get_history_version(), to skip counting again
 
     Returns:
         Tuple of (diagnosis list, total count)
@@ -194,7 +278,8 @@ def get_user_diagnosis_history(
 
     # Query diagnoses
     query = db.query(Diagnosis).filter(Diagnosis.user_id == user_id)
-    total = query.count()
+    if total is None:
+        total = query.count()
 
     diagnoses = (
         query.order_by(Diagnosis.created_at.desc()).offset(offset).limit(limit).all()
@@ -203,6 +288,31 @@ def get_user_diagnosis_history(
     return diagnoses, total
 
 
+def get_diagnosis_created_at(
+    db: Session, diagnosis_id: uuid.UUID, user_id: uuid.UUID
+) -> datetime:
+    """
+    Creation time of a user's diagnosis, without loading the row body.
+
+    Raises:
+        HTTPException: 404 if not found or not owned by user
+    """
+    from fastapi import HTTPException, status
+
+    created_at = (
+        db.query(Diagnosis.created_at)
+        .filter(Diagnosis.id == diagnosis_id, Diagnosis.user_id == user_id)
+        .scalar()
+    )
+
+    if created_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Diagnosis not found"
+        )
+
+    return created_at
+
+
 def get_diagnosis_by_id(
     db: Session, diagnosis_id: uuid.UUID, user_id: uuid.UUID
 ) -> Diagnosis:
@@ -234,3 +344,106 @@ def get_diagnosis_by_id(
         )
 
     return diagnosis
+
+
+# Symptoms one cohort query may ask for
+MAX_COHORT_SYMPTOMS = 20
+
+# One row per diagnosis symptom, kept by triggers on SQLite, which has no
+# array type (see app/models/search_ddl.py)
+diagnosis_symptoms = table(
+    "diagnosis_symptoms", column("symptom"), column("diagnosis_id", GUID())
+)
+
+
+def symptoms_filter(dialect: str, symptoms: List[str], match: str = "all"):
+    """
+    Condition on Diagnosis: its symptoms include all (or any) of ``symptoms``.
+
+    Postgres compares arrays (``@>`` / ``&&``) with the GIN index on
+    ``symptoms``; SQLite looks the symptoms up in ``diagnosis_symptoms``.
+    """
+    if dialect == "postgresql":
+        if match == "all":
+            return Diagnosis.symptoms.contains(symptoms)
+        return Diagnosis.symptoms.overlap(symptoms)
+
+    matching = select(diagnosis_symptoms.c.diagnosis_id).where(
+        diagnosis_symptoms.c.symptom.in_(symptoms)
+    )
+    if match == "all":
+        matching = matching.group_by(diagnosis_symptoms.c.diagnosis_id).having(
+            func.count() == len(symptoms)
+        )
+    return Diagnosis.id.in_(matching)
+
+
+def find_diagnoses_by_symptoms(
+    db: Session,
+    symptoms: List[str],
+    match: str = "all",
+    user_id: Optional[uuid.UUID] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], Optional[int], Optional[str]]:
+    """
+    Diagnoses that include all (or any) of the given symptoms, newest first.
+
+    Args:
+        db: Database session
+        symptoms: Symptoms to look for (matched like DiagnosisRequest stores
+            them: trimmed, lowercase)
+        match: "all" (contains) or "any" (overlaps)
+        user_id: Only this user's diagnoses (None: everyone's)
+        limit: Page size
+        cursor: ``next_cursor`` of the previous page
+
+    Returns:
+        Tuple of (history entries, total matching on the first page and None
+        after it, cursor for the next page or None)
+
+    Raises:
+        HTTPException: 400 if there are no symptoms or too many, or the
+            cursor is malformed
+    """
+    from fastapi import HTTPException, status
+
+    wanted = sorted({s.strip().lower() for s in symptoms if s.strip()})
+    if not 0 < len(wanted) <= MAX_COHORT_SYMPTOMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Give between 1 and {MAX_COHORT_SYMPTOMS} symptoms",
+        )
+    conditions = [symptoms_filter(db.get_bind().dialect.name, wanted, match)]
+    if user_id is not None:
+        conditions.append(Diagnosis.user_id == user_id)
+
+    total = None
+    if cursor is None:
+        total = db.scalar(select(func.count(Diagnosis.id)).where(*conditions))
+    else:
+        created_at, last_id = decode_cursor(cursor, 2)
+        try:
+            created_at = datetime.fromisoformat(created_at)
+            last_id = uuid.UUID(last_id)
+        except (TypeError, ValueError, AttributeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        conditions.append(
+            tuple_(Diagnosis.created_at, Diagnosis.id)
+            < tuple_(created_at, literal(last_id, GUID()))
+        )
+
+    diagnoses = db.scalars(
+        select(Diagnosis)
+        .where(*conditions)
+        .order_by(Diagnosis.created_at.desc(), Diagnosis.id.desc())
+        .limit(limit + 1)
+    ).all()
+    next_cursor = None
+    if len(diagnoses) > limit:
+        diagnoses = diagnoses[:limit]
+        last = diagnoses[-1]
+        next_cursor = encode_cursor(last.created_at.isoformat(), str(last.id))
+    return [history_entry(d) for d in diagnoses], total, next_cursor
@@ -0,0 +1,297 @@
+# app/services/events.py
+"""
+Publish/subscribe for live updates (Server-Sent Events).
+
+Subscribers are SSE responses on this process's event loop; publishers are
+request handlers and job handlers, often on threadpool threads. On Postgres
+every event is also sent with ``NOTIFY`` and each process ``LISTEN``s, so a
+diagnosis saved by a job worker reaches a dashboard connected to any API
+worker.
+"""
+
+import asyncio
+import threading
+import uuid
+from collections import defaultdict
+from typing import Dict, Optional, Set
+import orjson
+import structlog
+from sqlalchemy import event as sa_event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import (
+    EVENTS_BRIDGE_ENABLED,
+    EVENTS_QUEUE_SIZE,
+    EVENTS_RECONNECT_SECONDS,
+)
+from app.utils.serialization import dumps
+
+logger = structlog.get_logger()
+
+# Postgres channel shared by all processes
+PG_CHANNEL = "insightcare_events"
+# NOTIFY payloads must stay under 8000 bytes; larger events stay local
+PG_NOTIFY_MAX_BYTES = 7900
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stop nginx from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+# Keeps idle connections (and proxies) from timing out
+KEEP_ALIVE = b": keep-alive\n\n"
+
+
+def format_event(event: str, data) -> bytes:
+    """One Server-Sent Events message."""
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def user_channel(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def job_channel(job_id) -> str:
+    return f"job:{job_id}"
+
+
+class Event:
+    """A published event; ``data`` is serialized once for every subscriber."""
+
+    __slots__ = ("channel", "event", "data")
+
+    def __init__(self, channel: str, event: str, data: bytes):
+        self.channel = channel
+        self.event = event
+        self.data = data
+
+    def encode(self) -> bytes:
+        return b"event: " + self.event.encode() + b"\ndata: " + self.data + b"\n\n"
+
+    def json(self):
+        return orjson.loads(self.data)
+
+
+class Subscription:
+    """
+    Events for some channels, buffered for one consumer.
+
+    Create with ``EventBus.subscribe`` on the consumer's event loop; use as a
+    context manager so it is removed from the bus when the stream ends.
+    """
+
+    def __init__(self, bus: "EventBus", channels: tuple, maxsize: int):
+        self.bus = bus
+        self.channels = channels
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def _put(self, event: Event):
+        # Runs on the subscriber's loop. Drop the oldest rather than block the
+        # publisher: a client that can't keep up gets the latest state.
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Next event, or None after ``timeout`` seconds without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.bus._unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventBus:
+    """
+    In-process fan-out, bridged across processes with LISTEN/NOTIFY.
+
+    ``publish`` is safe from any thread. Delivery is at-most-once: events
+    published while a subscriber isn't connected (or while the bridge is
+    reconnecting) are not replayed, so streams re-read current state when
+    they start and periodically after.
+    """
+
+    def __init__(self, queue_size: int = EVENTS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        # Identifies this process's NOTIFYs, already delivered locally
+        self.origin = uuid.uuid4().hex
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+
+    def configure(self, engine: Engine, bridge: bool = EVENTS_BRIDGE_ENABLED):
+        """Relay events through ``engine``'s database, if it is Postgres."""
+        self._engine = (
+            engine if bridge and engine.dialect.name == "postgresql" else None
+        )
+
+    @property
+    def bridged(self) -> bool:
+        """Whether events from other processes reach this one."""
+        return self._engine is not None
+
+    def subscribe(self, *channels: str) -> Subscription:
+        subscription = Subscription(self, channels, self.queue_size)
+        with self._lock:
+            for channel in channels:
+                self._subscribers[channel].add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+    def publish(self, channel: str, event: str, data) -> Event:
+        """Send ``data`` (JSON-serializable) to the channel's subscribers."""
+        published = Event(channel, event, dumps(data))
+        self.deliver(published)
+        if self._engine is not None:
+            self._notify(published)
+        return published
+
+    def deliver(self, event: Event):
+        """Hand an event to this process's subscribers."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, event)
+            except RuntimeError:
+                # Its loop has closed; the stream is gone
+                subscription.close()
+
+    def _notify(self, event: Event):
+        # The data is already JSON; splice it in rather than re-encode it
+        payload = (
+            b'{"o":'
+            + dumps(self.origin)
+            + b',"c":'
+            + dumps(event.channel)
+            + b',"e":'
+            + dumps(event.event)
+            + b',"d":'
+            + event.data
+            + b"}"
+        )
+        if len(payload) > PG_NOTIFY_MAX_BYTES:
+            logger.warning(
+                "Event too large to relay",
+                channel=event.channel,
+                event=event.event,
+                size=len(payload),
+            )
+            return
+        try:
+            with self._engine.connect() as conn:
+                conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": PG_CHANNEL, "payload": payload.decode()},
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warning("Event relay failed", channel=event.channel, error=str(e))
+
+    def _receive(self, payload: str):
+        message = orjson.loads(payload)
+        if message["o"] == self.origin:
+            return
+        self.deliver(Event(message["c"], message["e"], dumps(message["d"])))
+
+    def _listen_connection(self):
+        # A dedicated connection, outside the pool: it stays in LISTEN
+        pooled = self._engine.raw_connection()
+        pooled.detach()
+        conn = pooled.dbapi_connection
+        if not hasattr(conn, "poll"):
+            conn.close()
+            raise NotImplementedError(
+                f"LISTEN needs the psycopg2 driver, not {self._engine.dialect.driver}"
+            )
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {PG_CHANNEL}")
+        return conn
+
+    async def listen(self):
+        """Deliver other processes' events until cancelled (Postgres only)."""
+        if self._engine is None:
+            return
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                conn = await run_in_threadpool(self._listen_connection)
+            except NotImplementedError as e:
+                logger.warning("Event bridge disabled", reason=str(e))
+                return
+            except Exception as e:
+                logger.warning("Event bridge connect failed", error=str(e))
+                await asyncio.sleep(EVENTS_RECONNECT_SECONDS)
+                continue
+
+            readable = asyncio.Event()
+            fileno = conn.fileno()
+            loop.add_reader(fileno, readable.set)
+            logger.info("Event bridge listening", channel=PG_CHANNEL)
+            try:
+                while True:
+                    await readable.wait()
+                    readable.clear()
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        try:
+                            self._receive(notify.payload)
+                        except Exception as e:
+                            logger.warning("Bad event payload", error=str(e))
+            except Exception as e:
+                logger.warning("Event bridge connection lost", error=str(e))
+            finally:
+                loop.remove_reader(fileno)
+                conn.close()
+            await asyncio.sleep(EVENTS_RECONNECT_SECONDS)
+
+
+event_bus = EventBus()
+
+
+def publish_after_commit(db: Session, channel: str, event: str, data):
+    """
+    Publish once ``db``'s transaction commits; dropped if it rolls back.
+
+    For events about rows being written, so subscribers never hear about
+    (and go fetch) a row that isn't there yet.
+    """
+    db.info.setdefault("pending_events", []).append((channel, event, data))
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session):
+    for channel, event, data in session.info.pop("pending_events", ()):
+        event_bus.publish(channel, event, data)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session):
+    session.info.pop("pending_events", None)
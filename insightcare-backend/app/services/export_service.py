@@ -0,0 +1,285 @@
+# app/services/export_service.py
+"""
+Columnar export of diagnoses for offline analysis.
+
+Diagnoses are read in (created_at, id) order through a server-side cursor,
+``chunk_size`` at a time, flattened into two datasets and written as
+Parquet (or Arrow IPC) files partitioned by month, hive style::
+
+    <out>/diagnoses/month=2026-10/part-<first id>.parquet
+    <out>/predictions/month=2026-10/part-<first id>.parquet
+    <out>/_state.json
+
+``diagnoses`` has one row per diagnosis, with the top prediction in its
+own columns; ``predictions`` one row per prediction, so queries filter
+and group on plain columns instead of parsing JSON. ``_state.json`` holds
+the high-water mark: each run continues after the last diagnosis
+exported. A chunk's files are named after its first diagnosis, so a run
+interrupted before saving the state rewrites the same files when resumed.
+
+pyarrow is optional; it is imported only when files are written.
+"""
+
+import json
+import os
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+import structlog
+from sqlalchemy import literal, select, tuple_
+from sqlalchemy.orm import Session
+from app.config import (
+    ANALYTICS_REFRESH_LAG_SECONDS,
+    EXPORT_CHUNK_SIZE,
+    EXPORT_COMPRESSION,
+)
+from app.models.diagnosis import GUID, Diagnosis
+
+logger = structlog.get_logger()
+
+PARQUET = "parquet"
+ARROW = "arrow"
+EXTENSIONS = {PARQUET: "parquet", ARROW: "arrow"}
+STATE_FILE = "_state.json"
+
+EXPORT_COLUMNS = (
+    Diagnosis.id,
+    Diagnosis.user_id,
+    Diagnosis.created_at,
+    Diagnosis.severity,
+    Diagnosis.duration,
+    Diagnosis.symptoms,
+    Diagnosis.predictions,
+)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise RuntimeError("Columnar export needs pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _schemas(pa) -> dict:
+    timestamp = pa.timestamp("us", tz="UTC")
+    return {
+        "diagnoses": pa.schema(
+            [
+                ("diagnosis_id", pa.string()),
+                ("user_id", pa.string()),
+                ("created_at", timestamp),
+                ("severity", pa.string()),
+                ("duration", pa.string()),
+                ("symptoms", pa.list_(pa.string())),
+                ("symptom_count", pa.int32()),
+                ("top_disease", pa.string()),
+                ("top_confidence", pa.float64()),
+                ("top_severity", pa.string()),
+                ("prediction_count", pa.int32()),
+            ]
+        ),
+        "predictions": pa.schema(
+            [
+                ("diagnosis_id", pa.string()),
+                ("created_at", timestamp),
+                ("rank", pa.int32()),
+                ("disease", pa.string()),
+                ("confidence", pa.float64()),
+                ("severity", pa.string()),
+            ]
+        ),
+    }
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite returns naive timestamps, already UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def flatten_chunk(rows) -> Dict[str, Dict[str, Dict[str, list]]]:
+    """
+    Columns of each dataset for a chunk of diagnosis rows, per month.
+
+    Returns:
+        {month: {"diagnoses": {column: values}, "predictions": {...}}}
+    """
+    months = defaultdict(
+        lambda: {"diagnoses": defaultdict(list), "predictions": defaultdict(list)}
+    )
+    for row in rows:
+        created_at = _utc(row.created_at)
+        diagnosis_id = str(row.id)
+        predictions = row.predictions or []
+        top = predictions[0] if predictions else {}
+        month = months[created_at.strftime("%Y-%m")]
+
+        columns = month["diagnoses"]
+        columns["diagnosis_id"].append(diagnosis_id)
+        columns["user_id"].append(str(row.user_id))
+        columns["created_at"].append(created_at)
+        columns["severity"].append(row.severity)
+        columns["duration"].append(row.duration)
+        columns["symptoms"].append(list(row.symptoms or []))
+        columns["symptom_count"].append(len(row.symptoms or []))
+        columns["top_disease"].append(top.get("disease"))
+        columns["top_confidence"].append(top.get("confidence"))
+        columns["top_severity"].append(top.get("severity"))
+        columns["prediction_count"].append(len(predictions))
+
+        columns = month["predictions"]
+        for rank, prediction in enumerate(predictions, start=1):
+            columns["diagnosis_id"].append(diagnosis_id)
+            columns["created_at"].append(created_at)
+            columns["rank"].append(rank)
+            columns["disease"].append(prediction.get("disease"))
+            columns["confidence"].append(prediction.get("confidence"))
+            columns["severity"].append(prediction.get("severity"))
+    return months
+
+
+def load_state(out_dir: Path) -> dict:
+    """The export's high-water mark (empty before the first run)."""
+    path = out_dir / STATE_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def _replace(path: Path, write):
+    # Readers never see half-written files
+    tmp = path.with_name(f".{path.name}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _save_state(out_dir: Path, state: dict):
+    _replace(out_dir / STATE_FILE, lambda tmp: tmp.write_text(json.dumps(state)))
+
+
+def iter_export_chunks(
+    db: Session,
+    after: Optional[dict] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    lag_seconds: int = ANALYTICS_REFRESH_LAG_SECONDS,
+) -> Iterator[list]:
+    """
+    Diagnoses after a high-water mark, oldest first, in chunks.
+
+    Rows are fetched ``chunk_size`` at a time from a server-side cursor
+    (``yield_per``), so memory use doesn't grow with the table. Diagnoses
+    younger than ``lag_seconds`` are left for the next run, as they may
+    still be committing.
+
+    Args:
+        db: Database session
+        after: State from load_state (``created_at``, ``diagnosis_id``)
+        chunk_size: Rows per chunk
+        lag_seconds: Leave diagnoses this recent for later
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=lag_seconds)
+    query = select(*EXPORT_COLUMNS).where(Diagnosis.created_at < cutoff)
+    if after and after.get("created_at"):
+        last = (
+            datetime.fromisoformat(after["created_at"]),
+            literal(uuid.UUID(after["diagnosis_id"]), GUID()),
+        )
+        query = query.where(tuple_(Diagnosis.created_at, Diagnosis.id) > tuple_(*last))
+    result = db.execute(
+        query.order_by(Diagnosis.created_at, Diagnosis.id).execution_options(
+            yield_per=chunk_size
+        )
+    )
+    for chunk in result.partitions():
+        yield chunk
+
+
+def _write_table(table, path: Path, fmt: str, compression: str):
+    if fmt == PARQUET:
+        import pyarrow.parquet as pq
+
+        codec = None if compression == "none" else compression
+        _replace(path, lambda tmp: pq.write_table(table, str(tmp), compression=codec))
+    else:
+        import pyarrow.feather as feather
+
+        codec = "uncompressed" if compression == "none" else compression
+        _replace(
+            path, lambda tmp: feather.write_feather(table, str(tmp), compression=codec)
+        )
+
+
+def export_diagnoses(
+    db: Session,
+    out_dir: Path,
+    fmt: str = PARQUET,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    lag_seconds: int = ANALYTICS_REFRESH_LAG_SECONDS,
+    compression: str = EXPORT_COMPRESSION,
+) -> dict:
+    """
+    Export the diagnoses created since the last run into ``out_dir``.
+
+    Run one export per directory at a time.
+
+    Args:
+        db: Database session (a replica will do: it only reads)
+        out_dir: Export directory; holds the datasets and the state
+        fmt: PARQUET or ARROW (IPC file)
+        chunk_size: Diagnoses per chunk (and at most per file)
+        lag_seconds: Leave diagnoses this recent for the next run
+        compression: Codec for the files (e.g. zstd, snappy, none)
+
+    Returns:
+        Dict with the rows and files written and the new high-water mark
+
+    Raises:
+        RuntimeError: if pyarrow isn't installed
+    """
+    pa = _pyarrow()
+    schemas = _schemas(pa)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    state = load_state(out_dir)
+    if state.get("format", fmt) != fmt:
+        raise ValueError(f"{out_dir} holds a {state['format']} export")
+
+    rows_written, files = 0, []
+    for chunk in iter_export_chunks(db, state, chunk_size, lag_seconds):
+        name = f"part-{chunk[0].id}.{EXTENSIONS[fmt]}"
+        for month, datasets in sorted(flatten_chunk(chunk).items()):
+            for dataset, columns in datasets.items():
+                if not columns:
+                    continue  # no predictions this month
+                directory = out_dir / dataset / f"month={month}"
+                directory.mkdir(parents=True, exist_ok=True)
+                table = pa.Table.from_pydict(dict(columns), schema=schemas[dataset])
+                _write_table(table, directory / name, fmt, compression)
+                files.append(str((directory / name).relative_to(out_dir)))
+
+        last = chunk[-1]
+        state = {
+            "format": fmt,
+            "created_at": _utc(last.created_at).isoformat(),
+            "diagnosis_id": str(last.id),
+            "rows": state.get("rows", 0) + len(chunk),
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+        }
+        _save_state(out_dir, state)
+        rows_written += len(chunk)
+
+    logger.info(
+        "Diagnoses exported", out_dir=str(out_dir), rows=rows_written, files=len(files)
+    )
+    return {
+        "rows": rows_written,
+        "files": files,
+        "high_water_mark": {
+            "created_at": state.get("created_at"),
+            "diagnosis_id": state.get("diagnosis_id"),
+        },
+    }
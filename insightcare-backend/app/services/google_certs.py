@@ -0,0 +1,143 @@
+# app/services/google_certs.py
+import asyncio
+import re
+import time
+from typing import Dict, Optional, Tuple
+import structlog
+from starlette.concurrency import run_in_threadpool
+from app.config import GOOGLE_CERTS_URL
+
+logger = structlog.get_logger()
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def parse_max_age(cache_control: Optional[str], default: int) -> int:
+    """Seconds a response may be cached for, from its Cache-Control header."""
+    if cache_control:
+        if "no-store" in cache_control or "no-cache" in cache_control:
+            return 0
+        match = _MAX_AGE_RE.search(cache_control)
+        if match:
+            return int(match.group(1))
+    return default
+
+
+class GoogleCertCache:
+    """
+    Google's ID-token signing certificates, cached for their Cache-Control
+    max-age and fetched over one pooled HTTP session.
+
+    - Expired (or never fetched): one request fetches, concurrent logins wait
+      for it instead of each going to Google.
+    - Within ``refresh_margin`` of expiry: served from cache while a
+      background task refreshes.
+    - Unknown key id (Google rotated keys early): one forced refresh, at most
+      every ``min_forced_refresh`` seconds.
+    """
+
+    def __init__(
+        self,
+        certs_url: str = GOOGLE_CERTS_URL,
+        refresh_margin: int = 60,
+        default_max_age: int = 300,
+        min_forced_refresh: int = 30,
+        timeout: float = 5.0,
+    ):
+        self.certs_url = certs_url
+        self.refresh_margin = refresh_margin
+        self.default_max_age = default_max_age
+        self.min_forced_refresh = min_forced_refresh
+        self.timeout = timeout
+        self._certs: Optional[Dict[str, str]] = None
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._session = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _fetch(self) -> Tuple[Dict[str, str], int]:
+        # Imported on first use so workers don't load requests at startup
+        import requests
+
+        if self._session is None:
+            self._session = requests.Session()
+        response = self._session.get(self.certs_url, timeout=self.timeout)
+        response.raise_for_status()
+        max_age = parse_max_age(
+            response.headers.get("Cache-Control"), self.default_max_age
+        )
+        return response.json(), max_age
+
+    async def _refresh(self):
+        certs, max_age = await run_in_threadpool(self._fetch)
+        now = time.monotonic()
+        self._certs = certs
+        self._fetched_at = now
+        self._expires_at = now + max_age
+        logger.info("Google certificates refreshed", keys=len(certs), max_age=max_age)
+
+    async def _background_refresh(self):
+        try:
+            async with self._lock:
+                await self._refresh()
+        except Exception as e:
+            # Keep serving the cached certs until they actually expire
+            logger.warning("Google certificate refresh failed", error=str(e))
+
+    async def get_certs(self, force: bool = False) -> Dict[str, str]:
+        """Current certificates, keyed by key id."""
+        now = time.monotonic()
+
+        if force and now - self._fetched_at < self.min_forced_refresh:
+            force = False
+
+        if force or self._certs is None or now >= self._expires_at:
+            async with self._lock:
+                if force or self._certs is None or time.monotonic() >= self._expires_at:
+                    await self._refresh()
+        elif now >= self._expires_at - self.refresh_margin and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+
+        return self._certs
+
+    async def verify(self, token: str, audience: str) -> dict:
+        """
+        Verify a Google ID token against the cached certificates.
+
+        Signature checking runs in the threadpool, off the event loop.
+
+        Raises:
+            ValueError: If the token is invalid (same as google-auth)
+        """
+        from google.auth import jwt
+
+        certs = await self.get_certs()
+        key_id = jwt.decode_header(token).get("kid")
+        if key_id and key_id not in certs:
+            certs = await self.get_certs(force=True)
+
+        idinfo = await run_in_threadpool(
+            jwt.decode, token, certs=certs, audience=audience
+        )
+
+        if idinfo.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {idinfo.get('iss')}")
+
+        return idinfo
+
+    def close(self):
+        """Release pooled connections."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+# Shared by all Google sign-ins in this worker
+google_certs = GoogleCertCache()
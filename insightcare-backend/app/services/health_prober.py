@@ -0,0 +1,267 @@
+# app/services/health_prober.py
+import asyncio
+import math
+import socket
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+import structlog
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+from starlette.concurrency import run_in_threadpool
+from app.database import SessionLocal, engine, replica_router
+from app.config import (
+    HEALTH_PROBE_INTERVAL_SECONDS,
+    HEALTH_PROBE_TIMEOUT_SECONDS,
+    HEALTH_SMTP_INTERVAL_SECONDS,
+    HEALTH_STALE_AFTER_SECONDS,
+)
+
+logger = structlog.get_logger()
+
+# A check returns details for the snapshot, or raises when the dependency is down
+Check = Callable[[], Optional[dict]]
+
+
+class _RegisteredCheck:
+    def __init__(self, check: Check, critical: bool, interval: Optional[float]):
+        self.check = check
+        self.critical = critical
+        self.interval = interval
+        self.next_run = 0.0
+        self.result: Optional[dict] = None
+        # The run still in the threadpool, and when it started
+        self.pending: Optional[asyncio.Future] = None
+        self.started = 0.0
+
+
+class HealthProber:
+    """
+    Dependency checks run on a timer; readiness reads the last snapshot.
+
+    Each check runs in the threadpool with a timeout, at most every
+    ``interval`` seconds (its own, or the prober's). A timed-out run can't be
+    stopped, so it isn't restarted either: later probes wait on that same
+    run until it returns, and a hung dependency holds at most one thread per
+    check. Critical checks decide
+    readiness; the others are reported only. A snapshot older than
+    ``stale_after`` counts as not ready, so a wedged prober fails the probe
+    instead of serving stale good news.
+    """
+
+    def __init__(
+        self,
+        interval: float = HEALTH_PROBE_INTERVAL_SECONDS,
+        timeout: float = HEALTH_PROBE_TIMEOUT_SECONDS,
+        stale_after: float = HEALTH_STALE_AFTER_SECONDS,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self._checks: Dict[str, _RegisteredCheck] = {}
+        self._checked_at: Optional[float] = None
+        self._checked_at_wall: Optional[str] = None
+
+    def register(
+        self,
+        name: str,
+        check: Check,
+        critical: bool = True,
+        interval: Optional[float] = None,
+    ):
+        """Add (or replace) a named dependency check."""
+        self._checks[name] = _RegisteredCheck(check, critical, interval)
+
+    async def _run_check(self, name: str, entry: _RegisteredCheck) -> dict:
+        if entry.pending is None:
+            entry.pending = asyncio.ensure_future(run_in_threadpool(entry.check))
+            entry.started = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(
+                asyncio.shield(entry.pending), timeout=self.timeout
+            )
+            result = {"status": "ok", **(details or {})}
+        except asyncio.TimeoutError:
+            running = time.perf_counter() - entry.started
+            result = {
+                "status": "down",
+                "error": f"timed out after {self.timeout}s (running {running:.1f}s)",
+            }
+        except Exception as e:
+            result = {"status": "down", "error": str(e)}
+        if entry.pending.done():
+            entry.pending = None
+        result["latency_ms"] = round((time.perf_counter() - entry.started) * 1000, 2)
+        if result["status"] != "ok" and (
+            entry.result is None or entry.result["status"] == "ok"
+        ):
+            logger.warning("Health check failing", check=name, **result)
+        return result
+
+    async def probe_once(self):
+        """Run every check that is due and update the snapshot."""
+        now = time.monotonic()
+        due = {
+            name: entry
+            for name, entry in self._checks.items()
+            if entry.result is None or now >= entry.next_run
+        }
+        results = await asyncio.gather(
+            *(self._run_check(name, entry) for name, entry in due.items())
+        )
+        for (name, entry), result in zip(due.items(), results):
+            entry.result = result
+            entry.next_run = now + (entry.interval or self.interval)
+        self._checked_at = time.monotonic()
+        self._checked_at_wall = datetime.now(timezone.utc).isoformat()
+
+    async def run(self):
+        """Probe every ``interval`` seconds until cancelled."""
+        while True:
+            try:
+                await self.probe_once()
+            except Exception as e:
+                logger.error("Health probe failed", error=str(e))
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> dict:
+        """
+        The last probe results; no I/O.
+
+        Returns:
+            Dict with ``ready``, snapshot age and per-check results
+        """
+        if self._checked_at is None:
+            return {"ready": False, "reason": "starting", "checks": {}}
+
+        age = time.monotonic() - self._checked_at
+        checks = {
+            name: {**entry.result, "critical": entry.critical}
+            for name, entry in self._checks.items()
+            if entry.result is not None
+        }
+        failing = [
+            name
+            for name, check in checks.items()
+            if check["critical"] and check["status"] != "ok"
+        ]
+        snapshot = {
+            "ready": not failing and age <= self.stale_after,
+            "checked_at": self._checked_at_wall,
+            "age_seconds": round(age, 3),
+            "checks": checks,
+        }
+        if failing:
+            snapshot["reason"] = "failing: " + ", ".join(failing)
+        elif age > self.stale_after:
+            snapshot["reason"] = "stale"
+        return snapshot
+
+    def check_status(self, name: str) -> str:
+        """Last status of one check ("unknown" before it has run)."""
+        entry = self._checks.get(name)
+        if entry is None or entry.result is None:
+            return "unknown"
+        return entry.result["status"]
+
+
+def database_check(
+    engine: Engine, timeout: float = HEALTH_PROBE_TIMEOUT_SECONDS
+) -> Check:
+    """
+    ``SELECT 1`` on a fresh connection to ``engine``'s database.
+
+    The check connects outside the pool, so it never waits for a pooled
+    connection; on Postgres the connect and the statement are bounded by
+    ``timeout`` and a hung server fails the check instead of blocking it.
+    """
+    connect_args = {}
+    if engine.dialect.name == "postgresql":
+        connect_args = {
+            "connect_timeout": max(1, math.ceil(timeout)),
+            "options": f"-c statement_timeout={int(timeout * 1000)}",
+        }
+    probe = create_engine(engine.url, poolclass=NullPool, connect_args=connect_args)
+
+    def check():
+        with probe.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    return check
+
+
+def pool_check(engine: Engine) -> Check:
+    """Connection pool usage; reported as degraded when exhausted."""
+
+    def check():
+        pool = engine.pool
+        details = {"pool": type(pool).__name__}
+        if hasattr(pool, "checkedout"):
+            limit = pool.size() + max(pool._max_overflow, 0)
+            details.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+                limit=limit,
+            )
+            if pool._max_overflow >= 0 and pool.checkedout() >= limit:
+                details["status"] = "degraded"
+        return details
+
+    return check
+
+
+def smtp_check(host: str, port: int, timeout: float) -> Check:
+    """TCP connect to the SMTP server (no handshake or login)."""
+
+    def check():
+        with socket.create_connection((host, port), timeout=timeout):
+            pass
+
+    return check
+
+
+def queue_check(session_factory, max_wait: float = 60) -> Check:
+    """Job queue depth; degraded when the oldest due job waited too long."""
+
+    def check():
+        from app.services.job_queue import queue_stats
+
+        db = session_factory()
+        try:
+            stats = queue_stats(db)
+        finally:
+            db.close()
+        if stats["oldest_queued_seconds"] > max_wait:
+            stats["status"] = "degraded"
+        return stats
+
+    return check
+
+
+def build_prober(engine: Engine) -> HealthProber:
+    """
+    The app's prober: database (critical); pool, job queue, read replicas
+    and SMTP (reported only).
+    """
+    from app.utils.email import SMTP_HOST, SMTP_PASSWORD, SMTP_PORT, SMTP_USER
+
+    prober = HealthProber()
+    prober.register("database", database_check(engine))
+    prober.register("pool", pool_check(engine), critical=False)
+    prober.register("queue", queue_check(SessionLocal), critical=False)
+    # Reads fall back to the primary when a replica is down
+    for index, replica in enumerate(replica_router.replicas):
+        prober.register(f"replica_{index}", database_check(replica), critical=False)
+    if SMTP_USER and SMTP_PASSWORD:
+        prober.register(
+            "smtp",
+            smtp_check(SMTP_HOST, SMTP_PORT, prober.timeout),
+            critical=False,
+            interval=HEALTH_SMTP_INTERVAL_SECONDS,
+        )
+    return prober
+
+
+health_prober = build_prober(engine)
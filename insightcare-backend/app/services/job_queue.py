@@ -0,0 +1,508 @@
+# app/services/job_queue.py
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import structlog
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from starlette.concurrency import run_in_threadpool
+from app.config import (
+    JOB_HEARTBEAT_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_INTERVAL_SECONDS,
+    JOB_RETRY_BACKOFF_SECONDS,
+    JOB_TIMEOUT_SECONDS,
+    JOB_WORKER_CONCURRENCY,
+)
+from app.models.job import Job
+from app.services.events import event_bus, job_channel, publish_after_commit
+
+logger = structlog.get_logger()
+
+# Runs one job inside the worker's session and returns its (JSON) result.
+# Leave committing to the queue: the result and the job's status are
+# committed together, so a crash can't record work without finishing the job.
+JobHandler = Callable[[Session, Job], Optional[dict]]
+
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+# Workers running in this process, woken as soon as a job is enqueued here
+_local_workers: Set["JobWorker"] = set()
+
+# How often a worker looks for jobs orphaned by a dead worker
+STALE_SWEEP_INTERVAL_SECONDS = 60
+
+# A run's claim on its job: the worker and the attempt number it claimed
+Claim = Tuple[str, int]
+
+
+def job_handler(kind: str):
+    """Register the decorated function as the handler for ``kind`` jobs."""
+
+    def register(handler: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = handler
+        return handler
+
+    return register
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: dict,
+    user_id: Optional[uuid.UUID] = None,
+    max_attempts: int = JOB_MAX_ATTEMPTS,
+) -> Job:
+    """
+    Queue a job and commit.
+
+    Args:
+        db: Database session
+        kind: Registered handler name
+        payload: JSON arguments for the handler
+        user_id: Owner; only they can see the job's status
+        max_attempts: Runs before the job is marked failed
+
+    Returns:
+        The queued Job
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"No handler registered for job kind {kind!r}")
+
+    job = Job(
+        kind=kind,
+        status="queued",
+        payload=payload,
+        user_id=user_id,
+        attempts=0,
+        max_attempts=max_attempts,
+        run_at=_now(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    for worker in list(_local_workers):
+        worker.wake()
+    return job
+
+
+def claim_jobs(db: Session, worker_id: str, limit: int = 1) -> List[Job]:
+    """
+    Claim up to ``limit`` due jobs for ``worker_id`` in one statement.
+
+    ``FOR UPDATE SKIP LOCKED`` makes concurrent workers pass over rows
+    another worker is claiming instead of waiting on them; the outer
+    ``status = 'queued'`` guard keeps claims exclusive on SQLite, which has
+    no row locks.
+    """
+    now = _now()
+    due = (
+        select(Job.id)
+        .where(Job.status == "queued", Job.run_at <= now)
+        .order_by(Job.run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    jobs = (
+        db.execute(
+            update(Job)
+            .where(Job.id.in_(due), Job.status == "queued")
+            .values(
+                status="running",
+                locked_by=worker_id,
+                started_at=now,
+                heartbeat_at=now,
+                attempts=Job.attempts + 1,
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        .scalars()
+        .all()
+    )
+    # Hand the claimed rows back as loaded, detached objects
+    for job in jobs:
+        db.expunge(job)
+    db.commit()
+    for job in jobs:
+        event_bus.publish(job_channel(job.id), "status", serialize_job(job))
+    return jobs
+
+
+def _publish_status(db: Session, job: Job):
+    # Status streams (GET /api/jobs/{id}/events) hear of it once committed
+    publish_after_commit(db, job_channel(job.id), "status", serialize_job(job))
+
+
+def _record_outcome(db: Session, job: Job, claim: Claim, **values) -> bool:
+    """
+    Write a run's outcome, and commit the handler's work with it, if the run
+    still owns the job.
+
+    The update only matches a job still running under the same claim. Once
+    the sweep has requeued it, or another worker has claimed it, the outcome
+    and the handler's uncommitted writes are discarded.
+    """
+    locked_by, attempt = claim
+    owned = db.execute(
+        update(Job)
+        .where(
+            Job.id == job.id,
+            Job.status == "running",
+            Job.locked_by == locked_by,
+            Job.attempts == attempt,
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not owned:
+        db.rollback()
+        return False
+    for key, value in values.items():
+        set_committed_value(job, key, value)
+    _publish_status(db, job)
+    db.commit()
+    return True
+
+
+def complete_job(db: Session, job: Job, result: Optional[dict], claim: Claim) -> bool:
+    """Mark the job succeeded; False if the run no longer owns it."""
+    return _record_outcome(
+        db,
+        job,
+        claim,
+        status="succeeded",
+        result=result or {},
+        error=None,
+        finished_at=_now(),
+    )
+
+
+def fail_job(db: Session, job: Job, error: str, claim: Claim) -> bool:
+    """
+    Requeue with exponential backoff, or mark failed when out of attempts.
+
+    Returns:
+        False if the run no longer owns the job (nothing is recorded)
+    """
+    attempt = claim[1]
+    if attempt < job.max_attempts:
+        delay = JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+        values = {"status": "queued", "run_at": _now() + timedelta(seconds=delay)}
+    else:
+        values = {"status": "failed", "finished_at": _now()}
+    return _record_outcome(db, job, claim, error=error, locked_by=None, **values)
+
+
+def heartbeat_jobs(db: Session, worker_id: str, job_ids: List[uuid.UUID]) -> int:
+    """
+    Extend the lease on ``worker_id``'s running jobs.
+
+    Returns:
+        Number of the jobs it still owns
+    """
+    result = db.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.status == "running", Job.locked_by == worker_id)
+        .values(heartbeat_at=_now())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def requeue_stale_jobs(db: Session, timeout: int = JOB_TIMEOUT_SECONDS) -> int:
+    """
+    Recover running jobs whose worker stopped heartbeating (it died).
+
+    Jobs with attempts left go back to the queue; the others are marked
+    failed, so a job that keeps killing its worker (out of memory, a crash)
+    isn't retried forever.
+
+    Returns:
+        Number of jobs requeued or failed
+    """
+    now = _now()
+    stale = (
+        Job.status == "running",
+        Job.heartbeat_at < now - timedelta(seconds=timeout),
+    )
+    failed = db.execute(
+        update(Job)
+        .where(*stale, Job.attempts >= Job.max_attempts)
+        .values(
+            status="failed",
+            locked_by=None,
+            finished_at=now,
+            error=f"Worker lost: no heartbeat for {timeout}s",
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    requeued = db.execute(
+        update(Job)
+        .where(*stale)
+        .values(status="queued", locked_by=None, run_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    if failed:
+        logger.warning("Stale jobs out of attempts marked failed", count=failed)
+    return failed + requeued
+
+
+def _log_lost(job: Job, claim: Claim):
+    logger.warning(
+        "Job no longer owned by this run, outcome discarded",
+        job_id=str(job.id),
+        kind=job.kind,
+        attempt=claim[1],
+        status=job.status,
+        locked_by=job.locked_by,
+    )
+
+
+def execute_job(session_factory: Callable[[], Session], job_id: uuid.UUID) -> Job:
+    """
+    Run a claimed job's handler in a fresh session and record the outcome,
+    unless the job was taken from this run meanwhile (see _record_outcome).
+
+    Returns:
+        The job, in its final (or requeued) state
+    """
+    db = session_factory()
+    try:
+        job = db.get(Job, job_id)
+        claim = (job.locked_by, job.attempts)
+        handler = JOB_HANDLERS.get(job.kind)
+        start = time.perf_counter()
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {job.kind!r}")
+            result = handler(db, job)
+        except Exception as e:
+            db.rollback()
+            job = db.get(Job, job_id)
+            if not fail_job(db, job, f"{type(e).__name__}: {e}", claim):
+                _log_lost(job, claim)
+                return job
+            logger.warning(
+                "Job failed",
+                job_id=str(job_id),
+                kind=job.kind,
+                attempt=job.attempts,
+                status=job.status,
+                error=job.error,
+            )
+            return job
+        if not complete_job(db, job, result, claim):
+            _log_lost(job, claim)
+            return job
+        logger.info(
+            "Job succeeded",
+            job_id=str(job_id),
+            kind=job.kind,
+            duration=f"{time.perf_counter() - start:.3f}s",
+        )
+        return job
+    finally:
+        db.close()
+
+
+def run_next_job(
+    session_factory: Callable[[], Session], worker_id: str = "inline"
+) -> Optional[Job]:
+    """Claim and run a single due job, if any (tests, scripts)."""
+    db = session_factory()
+    try:
+        claimed = claim_jobs(db, worker_id, limit=1)
+    finally:
+        db.close()
+    if not claimed:
+        return None
+    return execute_job(session_factory, claimed[0].id)
+
+
+def get_user_job(db: Session, job_id: uuid.UUID, user_id: uuid.UUID) -> Job:
+    """
+    Get a job owned by the user.
+
+    Raises:
+        HTTPException: 404 if not found or not owned by user
+    """
+    job = db.execute(
+        select(Job).where(Job.id == job_id, Job.user_id == user_id)
+    ).scalar_one_or_none()
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    return job
+
+
+def serialize_job(job: Job) -> dict:
+    """Status document returned to clients (polling and SSE)."""
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "result": job.result,
+        "error": job.error if job.status == "failed" else None,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def queue_stats(db: Session) -> dict:
+    """Queue depth and the age of the oldest due job."""
+    queued, oldest = db.execute(
+        select(func.count(Job.id), func.min(Job.run_at)).where(
+            Job.status == "queued", Job.run_at <= _now()
+        )
+    ).one()
+    running = db.execute(
+        select(func.count(Job.id)).where(Job.status == "running")
+    ).scalar_one()
+    if oldest is not None and oldest.tzinfo is None:
+        # SQLite returns naive datetimes
+        oldest = oldest.replace(tzinfo=timezone.utc)
+    return {
+        "queued": queued,
+        "running": running,
+        "oldest_queued_seconds": (
+            round((_now() - oldest).total_seconds(), 1) if oldest else 0.0
+        ),
+    }
+
+
+class JobWorker:
+    """
+    Claims and runs jobs, ``concurrency`` at a time, each in a thread.
+
+    Idle workers poll every ``poll_interval`` seconds; jobs enqueued in the
+    same process wake them immediately. Running jobs' heartbeats are
+    refreshed every ``heartbeat_interval`` seconds, however long they run.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        concurrency: int = JOB_WORKER_CONCURRENCY,
+        poll_interval: float = JOB_POLL_INTERVAL_SECONDS,
+        worker_id: Optional[str] = None,
+        heartbeat_interval: float = JOB_HEARTBEAT_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._running: Set[asyncio.Task] = set()
+        self._running_ids: Set[uuid.UUID] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+
+    def wake(self):
+        """Look for jobs now (safe from any thread)."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _claim(self, limit: int) -> List[uuid.UUID]:
+        db = self.session_factory()
+        try:
+            return [job.id for job in claim_jobs(db, self.worker_id, limit)]
+        finally:
+            db.close()
+
+    def _sweep(self) -> int:
+        db = self.session_factory()
+        try:
+            return requeue_stale_jobs(db)
+        finally:
+            db.close()
+
+    def _heartbeat(self) -> int:
+        db = self.session_factory()
+        try:
+            return heartbeat_jobs(db, self.worker_id, list(self._running_ids))
+        finally:
+            db.close()
+
+    async def _execute(self, job_id: uuid.UUID):
+        try:
+            await run_in_threadpool(execute_job, self.session_factory, job_id)
+        except Exception as e:
+            logger.error("Job execution crashed", job_id=str(job_id), error=str(e))
+        finally:
+            self._running_ids.discard(job_id)
+            self.wake()  # a slot is free
+
+    async def run(self):
+        """Work the queue until cancelled or drained."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        _local_workers.add(self)
+        logger.info(
+            "Job worker started", worker_id=self.worker_id, concurrency=self.concurrency
+        )
+        next_sweep = next_heartbeat = 0.0
+        try:
+            while not self._stopping:
+                self._wakeup.clear()
+                try:
+                    if self._running_ids and time.monotonic() >= next_heartbeat:
+                        await run_in_threadpool(self._heartbeat)
+                        next_heartbeat = time.monotonic() + self.heartbeat_interval
+                    if time.monotonic() >= next_sweep:
+                        recovered = await run_in_threadpool(self._sweep)
+                        if recovered:
+                            logger.warning("Stale jobs recovered", count=recovered)
+                        next_sweep = time.monotonic() + STALE_SWEEP_INTERVAL_SECONDS
+
+                    free = self.concurrency - len(self._running)
+                    if free > 0:
+                        for job_id in await run_in_threadpool(self._claim, free):
+                            self._running_ids.add(job_id)
+                            task = asyncio.create_task(self._execute(job_id))
+                            self._running.add(task)
+                            task.add_done_callback(self._running.discard)
+                except Exception as e:
+                    logger.error("Job worker poll failed", error=str(e))
+                wait = self.poll_interval
+                if self._running_ids:
+                    wait = min(wait, self.heartbeat_interval)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            _local_workers.discard(self)
+
+    async def drain(self, timeout: float) -> int:
+        """
+        Stop claiming and wait for running jobs (shutdown).
+
+        Returns:
+            Jobs still running at the deadline; they are requeued by another
+            worker after JOB_TIMEOUT_SECONDS
+        """
+        self._stopping = True
+        self.wake()
+        if self._running:
+            await asyncio.wait(set(self._running), timeout=timeout)
+        return len(self._running)
@@ -0,0 +1,134 @@
+# app/services/lifecycle.py
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional
+import structlog
+from sqlalchemy.engine import Engine
+from app.config import SHUTDOWN_DRAIN_SECONDS
+
+logger = structlog.get_logger()
+
+# Drains a background queue within the given seconds; returns items dropped
+QueueDrainer = Callable[[float], Awaitable[int]]
+
+# Past its budget a drainer still gets this long to report what it dropped
+QUEUE_REPORT_SLACK = 1.0
+
+
+class ShutdownCoordinator:
+    """
+    Worker shutdown in three steps.
+
+    1. ``begin_drain``: readiness fails, requests are still served.
+    2. ``close``: new requests get 503 + ``Connection: close``; in-flight
+       ones finish.
+    3. ``shutdown`` (lifespan exit): wait for in-flight requests, drain the
+       registered background queues, cancel background tasks and dispose the
+       engine pool, then report what was dropped.
+
+    Everything after ``close`` shares one deadline of ``drain_timeout``
+    seconds, including the time the server spent waiting for connections.
+    """
+
+    def __init__(self, drain_timeout: float = SHUTDOWN_DRAIN_SECONDS):
+        self.drain_timeout = drain_timeout
+        self._queues: Dict[str, QueueDrainer] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.reset()
+
+    def reset(self):
+        """Back to serving (each lifespan startup)."""
+        self.draining = False
+        self.closing = False
+        self.closed_at: Optional[float] = None
+        self.in_flight = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self._tasks = {}
+
+    def begin_drain(self):
+        if not self.draining:
+            self.draining = True
+            logger.info("Draining: readiness now failing", in_flight=self.in_flight)
+
+    def close(self):
+        self.begin_drain()
+        if not self.closing:
+            self.closing = True
+            self.closed_at = time.monotonic()
+
+    def register_queue(self, name: str, drain: QueueDrainer):
+        """Drain ``name`` at shutdown (e.g. flush buffered audit entries)."""
+        self._queues[name] = drain
+
+    def add_task(self, name: str, task: asyncio.Task):
+        """A background task to cancel once requests and queues are drained."""
+        self._tasks[name] = task
+
+    async def wait_for_requests(self, timeout: float) -> int:
+        """
+        Wait until no request is in flight.
+
+        Returns:
+            Requests still running at the deadline
+        """
+        deadline = time.monotonic() + timeout
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return self.in_flight
+
+    async def _drain_queues(self, deadline: float) -> Dict[str, object]:
+        dropped: Dict[str, object] = {}
+        for name, drain in self._queues.items():
+            remaining = max(deadline - time.monotonic(), 0.0)
+            try:
+                dropped[name] = await asyncio.wait_for(
+                    drain(remaining), remaining + QUEUE_REPORT_SLACK
+                )
+            except asyncio.TimeoutError:
+                dropped[name] = "timed out"
+            except Exception as e:
+                dropped[name] = f"failed: {e}"
+        return dropped
+
+    async def _cancel_tasks(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def shutdown(self, engine: Optional[Engine] = None) -> dict:
+        """
+        Drain and release everything; safe to call once per lifespan.
+
+        Returns:
+            Report of what was drained and dropped (also logged)
+        """
+        start = time.monotonic()
+        self.close()
+        deadline = self.closed_at + self.drain_timeout
+
+        unfinished = await self.wait_for_requests(max(deadline - start, 0.0))
+        queues = await self._drain_queues(deadline)
+        await self._cancel_tasks()
+        if engine is not None:
+            engine.dispose()
+
+        report = {
+            "requests_unfinished": unfinished,
+            "requests_cancelled": self.cancelled,
+            "requests_rejected": self.rejected,
+            "queues_dropped": queues,
+            "elapsed": f"{time.monotonic() - start:.3f}s",
+        }
+        lost = (
+            unfinished or self.cancelled or any(value != 0 for value in queues.values())
+        )
+        if lost:
+            logger.warning("Shutdown dropped work", **report)
+        else:
+            logger.info("Shutdown complete", **report)
+        return report
+
+
+shutdown_coordinator = ShutdownCoordinator()
@@ -1,12 +1,12 @@
 # app/services/oauth_service.py
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from google.oauth2 import id_token
-from google.auth.transport import requests
 import os
 from app.models.user import User
 from app.utils.security import create_access_token
 from app.schemas.user_schema import UserOut
+from app.utils.login_throttle import login_throttle
+from app.services.google_certs import google_certs
 import uuid
 
 
@@ -25,10 +25,8 @@ async def verify_google_token(token: str, db: Session):
                 detail="Google OAuth not configured on server",
             )
 
-        # Verify the token with Google
-        idinfo = id_token.verify_oauth2_token(
-            token, requests.Request(), GOOGLE_CLIENT_ID
-        )
+        # Verify the token against Google's cached signing certificates
+        idinfo = await google_certs.verify(token, GOOGLE_CLIENT_ID)
 
         # Extract user information from Google token
         google_id = idinfo.get("sub")
@@ -63,6 +61,7 @@ async def verify_google_token(token: str, db: Session):
             db.add(user)
             db.commit()
             db.refresh(user)
+            await login_throttle.add_email(user.email)
             is_new_user = True
         else:
             # Update OAuth info if not set
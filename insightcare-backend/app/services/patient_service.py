@@ -0,0 +1,112 @@
+# app/services/patient_service.py
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.patient import Patient
+from app.schemas.patient_schema import PatientCreate
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# PatientResponse fields; listings never load anything else
+PATIENT_COLUMNS = (
+    Patient.id,
+    Patient.name,
+    Patient.age,
+    Patient.blood_pressure,
+    Patient.cholesterol,
+    Patient.diagnosis,
+)
+
+
+def list_patient_page(
+    db: Session,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    diagnosis: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    One page of patients, newest first, with keyset pagination.
+
+    Args:
+        db: Database session
+        limit: Page size
+        cursor: ``next_cursor`` of the previous page
+        min_age: Minimum age (inclusive)
+        max_age: Maximum age (inclusive)
+        diagnosis: Exact diagnosis
+        created_after: Created at or after
+        created_before: Created before
+
+    Returns:
+        Tuple of (patient dicts, cursor for the next page or None)
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    query = select(*PATIENT_COLUMNS)
+    if min_age is not None:
+        query = query.where(Patient.age >= min_age)
+    if max_age is not None:
+        query = query.where(Patient.age <= max_age)
+    if diagnosis is not None:
+        query = query.where(Patient.diagnosis == diagnosis)
+    if created_after is not None:
+        query = query.where(Patient.created_at >= created_after)
+    if created_before is not None:
+        query = query.where(Patient.created_at < created_before)
+    if cursor is not None:
+        (last_id,) = decode_cursor(cursor, 1)
+        # bool is an int too; anything else would be compared as text
+        if not isinstance(last_id, int) or isinstance(last_id, bool):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        query = query.where(Patient.id < last_id)
+
+    # Ids increase with creation, so this is newest first. One extra row
+    # tells whether there is a next page without counting.
+    rows = db.execute(query.order_by(Patient.id.desc()).limit(limit + 1)).mappings()
+    patients = [dict(row) for row in rows]
+    next_cursor = None
+    if len(patients) > limit:
+        patients = patients[:limit]
+        next_cursor = encode_cursor(patients[-1]["id"])
+    return patients, next_cursor
+
+
+def create_patient(db: Session, patient_data: PatientCreate) -> Patient:
+    """
+    Create a patient record.
+
+    Args:
+        db: Database session
+        patient_data: Validated patient fields
+
+    Returns:
+        The new Patient
+    """
+    patient = Patient(**patient_data.model_dump())
+    db.add(patient)
+    db.commit()
+    db.refresh(patient)
+    return patient
+
+
+def get_patient(db: Session, patient_id: int) -> Patient:
+    """
+    Get a patient by id.
+
+    Raises:
+        HTTPException: 404 if not found
+    """
+    patient = db.get(Patient, patient_id)
+    if patient is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
+        )
+    return patient
@@ -0,0 +1,209 @@
+# app/services/search_service.py
+"""
+Full-text search over symptom notes and diagnosis symptoms.
+
+Postgres matches against the generated ``search_vector`` columns (GIN) and,
+for notes, also by trigram word similarity, so misspellings still match;
+SQLite uses the FTS5 tables. See app/models/search_ddl.py.
+"""
+
+import html
+import re
+import uuid
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+from app.models.diagnosis import GUID, Diagnosis
+from app.services.diagnosis_service import history_entry
+
+# Search words beyond this are ignored
+MAX_TERMS = 8
+
+# Highlight markers: control characters can't occur in stored text, so the
+# snippet can be HTML-escaped first and marked up after
+_START, _STOP = "\x02", "\x03"
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def search_terms(query: str) -> List[str]:
+    """
+    The words of a search query (every one must match, as a prefix).
+
+    Raises:
+        HTTPException: 400 if the query has no words
+    """
+    terms = _WORD_RE.findall(query.lower())[:MAX_TERMS]
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must contain a word",
+        )
+    return terms
+
+
+def _tsquery(terms: List[str]) -> str:
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def _fts5_query(terms: List[str]) -> str:
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _highlight(snippet: Optional[str]) -> str:
+    """Safe HTML: the snippet escaped, with matches in <mark>."""
+    escaped = html.escape(snippet or "")
+    return escaped.replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+def search_symptom_notes(
+    db: Session,
+    query: str,
+    page: int = 1,
+    limit: int = 20,
+    patient_id: Optional[int] = None,
+) -> Tuple[List[dict], bool]:
+    """
+    Symptom notes matching ``query``, best first, with highlighted snippets.
+
+    Args:
+        db: Database session
+        query: Search words
+        page: Page number (1-indexed)
+        limit: Items per page
+        patient_id: Only this patient's notes
+
+    Returns:
+        Tuple of (results, whether there are more)
+
+    Raises:
+        HTTPException: 400 if the query has no words
+    """
+    terms = search_terms(query)
+    params = {
+        "patient_id": patient_id,
+        "limit": limit + 1,
+        "offset": (page - 1) * limit,
+        "start": _START,
+        "stop": _STOP,
+    }
+    if db.get_bind().dialect.name == "postgresql":
+        statement = text("""
+            SELECT id, patient_id, severity, created_at,
+                   greatest(ts_rank_cd(search_vector, q), word_similarity(:words, text))
+                       AS rank,
+                   ts_headline('english', text, q,
+                       'StartSel=' || :start || ', StopSel=' || :stop
+                       || ', MaxFragments=2, MaxWords=20, MinWords=5') AS snippet
+            FROM symptoms, to_tsquery('english', :tsquery) AS q
+            WHERE (search_vector @@ q OR :words <% text)
+              AND (CAST(:patient_id AS integer) IS NULL OR patient_id = :patient_id)
+            ORDER BY rank DESC, id DESC
+            LIMIT :limit OFFSET :offset
+            """)
+        params.update(tsquery=_tsquery(terms), words=" ".join(terms))
+    else:
+        # bm25() is lower for better matches
+        statement = text("""
+            SELECT s.id, s.patient_id, s.severity, s.created_at,
+                   -bm25(symptoms_fts) AS rank,
+                   snippet(symptoms_fts, 0, :start, :stop, '…', 16) AS snippet
+            FROM symptoms_fts JOIN symptoms s ON s.id = symptoms_fts.rowid
+            WHERE symptoms_fts MATCH :match
+              AND (:patient_id IS NULL OR s.patient_id = :patient_id)
+            ORDER BY bm25(symptoms_fts), s.id DESC
+            LIMIT :limit OFFSET :offset
+            """)
+        params.update(match=_fts5_query(terms))
+
+    rows = db.execute(statement, params).mappings().all()
+    results = [
+        {
+            **row,
+            "rank": round(float(row["rank"]), 4),
+            "snippet": _highlight(row["snippet"]),
+        }
+        for row in rows[:limit]
+    ]
+    return results, len(rows) > limit
+
+
+def search_diagnoses(
+    db: Session,
+    query: str,
+    user_id: Optional[uuid.UUID] = None,
+    page: int = 1,
+    limit: int = 20,
+) -> Tuple[List[dict], bool]:
+    """
+    Diagnoses whose symptoms match ``query``, best first.
+
+    Each result lists the symptoms that matched instead of a snippet.
+
+    Args:
+        db: Database session
+        query: Search words
+        user_id: Only this user's diagnoses (None: everyone's)
+        page: Page number (1-indexed)
+        limit: Items per page
+
+    Returns:
+        Tuple of (results, whether there are more)
+
+    Raises:
+        HTTPException: 400 if the query has no words
+    """
+    terms = search_terms(query)
+    params = {
+        "user_id": user_id,
+        "limit": limit + 1,
+        "offset": (page - 1) * limit,
+    }
+    if db.get_bind().dialect.name == "postgresql":
+        statement = text("""
+            SELECT id, ts_rank_cd(search_vector, q) AS rank
+            FROM diagnoses, to_tsquery('english', :tsquery) AS q
+            WHERE search_vector @@ q
+              AND (CAST(:user_id AS uuid) IS NULL OR user_id = :user_id)
+            ORDER BY rank DESC, created_at DESC
+            LIMIT :limit OFFSET :offset
+            """)
+        params.update(tsquery=_tsquery(terms))
+    else:
+        statement = text("""
+            SELECT d.id, -bm25(diagnoses_fts) AS rank
+            FROM diagnoses_fts JOIN diagnoses d ON d.rowid = diagnoses_fts.rowid
+            WHERE diagnoses_fts MATCH :match
+              AND (:user_id IS NULL OR d.user_id = :user_id)
+            ORDER BY bm25(diagnoses_fts), d.created_at DESC
+            LIMIT :limit OFFSET :offset
+            """)
+        params.update(match=_fts5_query(terms))
+
+    statement = statement.bindparams(bindparam("user_id", type_=GUID()))
+    ranked = db.execute(statement, params).all()
+    has_more = len(ranked) > limit
+    # Ranked ids first, then one query for this page's rows
+    ranks = {uuid.UUID(str(row.id)): float(row.rank) for row in ranked[:limit]}
+    order = {diagnosis_id: i for i, diagnosis_id in enumerate(ranks)}
+    diagnoses = db.query(Diagnosis).filter(Diagnosis.id.in_(ranks)).all()
+    diagnoses.sort(key=lambda diagnosis: order[diagnosis.id])
+
+    results = [
+        {
+            **history_entry(diagnosis),
+            "matched_symptoms": [
+                symptom
+                for symptom in diagnosis.symptoms
+                if any(
+                    word.startswith(term)
+                    for word in _WORD_RE.findall(symptom.lower())
+                    for term in terms
+                )
+            ],
+            "rank": round(ranks[diagnosis.id], 4),
+        }
+        for diagnosis in diagnoses
+    ]
+    return results, has_more
@@ -0,0 +1,209 @@
+# app/services/symptom_service.py
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import case, func, select, tuple_
+from sqlalchemy.orm import Session
+from app.models.symptom import Symptom
+from app.schemas.symptom_schema import SymptomCreate
+from app.services.patient_service import get_patient
+from app.utils.pagination import decode_cursor, encode_cursor
+
+BUCKET_DAYS = {"day": 1, "week": 7}
+# Widest timeline window, in buckets: bounds the work of one request however
+# long the patient's history is
+MAX_BUCKETS = 366
+
+SEVERITY_RANK = {"mild": 1, "moderate": 2, "severe": 3}
+SEVERITY_BY_RANK = {rank: name for name, rank in SEVERITY_RANK.items()}
+
+# Timeline entries leave out the (possibly large) structured JSON
+ENTRY_COLUMNS = (
+    Symptom.id,
+    Symptom.reported_by,
+    Symptom.text,
+    Symptom.severity,
+    Symptom.created_at,
+)
+
+
+def create_symptom(
+    db: Session, symptom_data: SymptomCreate, reported_by: Optional[uuid.UUID]
+) -> Symptom:
+    """
+    Record a symptom for a patient.
+
+    Args:
+        db: Database session
+        symptom_data: Validated symptom fields
+        reported_by: ID of the reporting user
+
+    Returns:
+        The new Symptom
+
+    Raises:
+        HTTPException: 404 if the patient doesn't exist
+    """
+    get_patient(db, symptom_data.patient_id)
+    symptom = Symptom(
+        patient_id=symptom_data.patient_id,
+        reported_by=reported_by,
+        text=symptom_data.text,
+        structured=symptom_data.structured or {},
+        severity=symptom_data.severity,
+    )
+    db.add(symptom)
+    db.commit()
+    db.refresh(symptom)
+    return symptom
+
+
+def _bucket_start(dialect: str, bucket: str):
+    if dialect == "postgresql":
+        return func.date_trunc(bucket, Symptom.created_at)
+    # SQLite stores timestamps as text; weeks start on Monday, like date_trunc
+    if bucket == "day":
+        return func.date(Symptom.created_at)
+    return func.date(Symptom.created_at, "weekday 0", "-6 days")
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Query strings may carry either; naive times are taken as UTC
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def get_symptom_timeline(
+    db: Session,
+    patient_id: int,
+    bucket: str = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> dict:
+    """
+    A patient's symptoms counted per day or week, with the worst severity.
+
+    One aggregate query over the (patient_id, created_at) index, bounded by
+    the window rather than by the length of the history. Empty buckets are
+    left out.
+
+    Args:
+        db: Database session
+        patient_id: Patient ID
+        bucket: "day" or "week"
+        start: Window start (default: MAX_BUCKETS buckets before ``end``)
+        end: Window end, exclusive (default: now)
+
+    Naive bounds are taken as UTC.
+
+    Returns:
+        Dict with the window and its buckets, oldest first
+
+    Raises:
+        HTTPException: 400 if the window is empty or too wide
+    """
+    span = timedelta(days=BUCKET_DAYS[bucket] * MAX_BUCKETS)
+    end = _as_utc(end) or datetime.now(timezone.utc)
+    start = _as_utc(start) or end - span
+    if start >= end or end - start > span:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Window must be positive and at most {MAX_BUCKETS} {bucket}s",
+        )
+
+    bucket_start = _bucket_start(db.get_bind().dialect.name, bucket).label("start")
+    severity_rank = case(
+        *((Symptom.severity == name, rank) for name, rank in SEVERITY_RANK.items()),
+        else_=0,
+    )
+    rows = db.execute(
+        select(bucket_start, func.count(), func.max(severity_rank))
+        .where(
+            Symptom.patient_id == patient_id,
+            Symptom.created_at >= start,
+            Symptom.created_at < end,
+        )
+        .group_by(bucket_start)
+        .order_by(bucket_start)
+    ).all()
+
+    return {
+        "bucket": bucket,
+        "start": start,
+        "end": end,
+        "buckets": [
+            {
+                "start": _as_date(value),
+                "count": count,
+                "max_severity": SEVERITY_BY_RANK.get(rank),
+            }
+            for value, count, rank in rows
+        ],
+    }
+
+
+def list_symptom_entries(
+    db: Session,
+    patient_id: int,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    One page of a patient's symptoms, newest first, with keyset pagination.
+
+    Args:
+        db: Database session
+        patient_id: Patient ID
+        limit: Page size
+        cursor: ``next_cursor`` of the previous page
+        start: Reported at or after
+        end: Reported before
+
+    Returns:
+        Tuple of (symptom dicts, cursor for the next page or None)
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    query = select(*ENTRY_COLUMNS).where(Symptom.patient_id == patient_id)
+    if start is not None:
+        query = query.where(Symptom.created_at >= start)
+    if end is not None:
+        query = query.where(Symptom.created_at < end)
+    if cursor is not None:
+        created_at, last_id = decode_cursor(cursor, 2)
+        try:
+            created_at = datetime.fromisoformat(created_at)
+            # bool is an int too; anything else would be compared as text
+            if not isinstance(last_id, int) or isinstance(last_id, bool):
+                raise ValueError(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        query = query.where(
+            tuple_(Symptom.created_at, Symptom.id) < tuple_(created_at, last_id)
+        )
+
+    rows = db.execute(
+        query.order_by(Symptom.created_at.desc(), Symptom.id.desc()).limit(limit + 1)
+    ).mappings()
+    entries = [dict(row) for row in rows]
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        last = entries[-1]
+        next_cursor = encode_cursor(last["created_at"].isoformat(), last["id"])
+    return entries, next_cursor
@@ -0,0 +1,125 @@
+# app/services/token_service.py
+import asyncio
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import structlog
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import TOKEN_SWEEP_INTERVAL_SECONDS, TOKEN_SWEEP_BATCH_SIZE
+from app.database import SessionLocal
+from app.models.user_token import UserToken
+
+logger = structlog.get_logger()
+
+PASSWORD_RESET = "password_reset"
+EMAIL_VERIFICATION = "email_verification"
+
+
+def hash_token(token: str) -> str:
+    """SHA-256 hex digest of a raw token, as stored in user_tokens."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def issue_token(
+    db: Session, user_id: uuid.UUID, purpose: str, expires_in: timedelta
+) -> str:
+    """
+    Create a single-use token for a user.
+
+    Any outstanding token for the same purpose is revoked. The row is added
+    to the session; the caller commits.
+
+    Args:
+        db: Database session
+        user_id: UUID of the user
+        purpose: PASSWORD_RESET or EMAIL_VERIFICATION
+        expires_in: Token lifetime
+
+    Returns:
+        The raw token to send to the user (never stored)
+    """
+    # Sessions don't autoflush; make earlier tokens in this unit of work visible
+    db.flush()
+    db.execute(
+        delete(UserToken).where(
+            UserToken.user_id == user_id, UserToken.purpose == purpose
+        )
+    )
+
+    token = secrets.token_urlsafe(32)
+    db.add(
+        UserToken(
+            user_id=user_id,
+            token_hash=hash_token(token),
+            purpose=purpose,
+            expires_at=datetime.now(timezone.utc) + expires_in,
+        )
+    )
+    return token
+
+
+def lookup_token(db: Session, token: str, purpose: str) -> Optional[UserToken]:
+    """
+    Find a token by its hash with a single indexed point lookup.
+
+    Expired tokens are returned so callers can report them; delete the row
+    once it has been used.
+    """
+    return db.execute(
+        select(UserToken).where(
+            UserToken.token_hash == hash_token(token), UserToken.purpose == purpose
+        )
+    ).scalar_one_or_none()
+
+
+def purge_expired_tokens(db: Session, batch_size: int = TOKEN_SWEEP_BATCH_SIZE) -> int:
+    """
+    Delete expired tokens in batches, committing after each one.
+
+    Short batches keep row locks and WAL bursts small on a large table.
+
+    Returns:
+        Number of rows deleted
+    """
+    now = datetime.now(timezone.utc)
+    deleted = 0
+    while True:
+        expired_ids = (
+            select(UserToken.id)
+            .where(UserToken.expires_at < now)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = db.execute(
+            delete(UserToken)
+            .where(UserToken.id.in_(expired_ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+def _sweep_once() -> int:
+    db = SessionLocal()
+    try:
+        return purge_expired_tokens(db)
+    finally:
+        db.close()
+
+
+async def run_token_sweeper(interval: float = TOKEN_SWEEP_INTERVAL_SECONDS):
+    """Periodically purge expired tokens until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            deleted = await run_in_threadpool(_sweep_once)
+            if deleted:
+                logger.info("Expired user tokens purged", deleted=deleted)
+        except Exception as e:
+            logger.error("Token sweep failed", error=str(e))
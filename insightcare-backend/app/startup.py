@@ -0,0 +1,122 @@
+# app/startup.py
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+import structlog
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+logger = structlog.get_logger()
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+ALEMBIC_INI = BACKEND_ROOT / "alembic.ini"
+
+
+class StartupTimer:
+    """
+    Collects wall-clock durations for the phases of worker startup.
+
+    Phases are either recorded sequentially with ``mark`` (time since the
+    previous mark) or wrapped explicitly with the ``phase`` context manager.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._last = self._origin
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, name: str):
+        """Record the time elapsed since the previous mark under ``name``."""
+        now = time.perf_counter()
+        self.phases[name] = now - self._last
+        self._last = now
+
+    @contextmanager
+    def phase(self, name: str):
+        """Record the duration of the wrapped block under ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    def breakdown(self) -> Dict[str, str]:
+        """Phase durations formatted like the request logs (seconds)."""
+        return {name: f"{seconds:.3f}s" for name, seconds in self.phases.items()}
+
+    def report(self):
+        """Log the startup-time breakdown."""
+        logger.info(
+            "Startup complete",
+            total=f"{sum(self.phases.values()):.3f}s",
+            **self.breakdown(),
+        )
+
+
+# Started when app.main first imports this module, so "imports" covers app loading
+startup_timer = StartupTimer()
+
+
+def get_alembic_head() -> Optional[str]:
+    """
+    Get the head revision from the Alembic migration scripts.
+
+    Alembic is imported lazily; only the script directory is read, no database
+    connection is made.
+    """
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(BACKEND_ROOT / "alembic"))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+def check_schema_revision(engine: Engine) -> dict:
+    """
+    Compare the database's Alembic revision against the migration head.
+
+    This is the only database work done on startup: a single connection and
+    one small query instead of reflecting every table. It never raises, so a
+    database blip while a worker boots is reported instead of crashing it.
+
+    Args:
+        engine: SQLAlchemy engine to check
+
+    Returns:
+        Dict with "status" (current, out_of_date, uninitialized or
+        unavailable), "head" and "current" revisions
+    """
+    head = get_alembic_head()
+
+    try:
+        with engine.connect() as conn:
+            current = None
+            if inspect(conn).has_table("alembic_version"):
+                current = conn.execute(
+                    text("SELECT version_num FROM alembic_version")
+                ).scalar()
+    except SQLAlchemyError as e:
+        logger.warning(
+            "Schema check skipped, database unavailable", error=str(e), head=head
+        )
+        return {"status": "unavailable", "head": head, "current": None}
+
+    if current is None:
+        schema_status = "uninitialized"
+    elif current == head:
+        schema_status = "current"
+    else:
+        schema_status = "out_of_date"
+
+    if schema_status != "current":
+        logger.warning(
+            "Database schema is not at migration head, run 'alembic upgrade head'",
+            status=schema_status,
+            head=head,
+            current=current,
+        )
+
+    return {"status": schema_status, "head": head, "current": current}
@@ -1,39 +1,74 @@
 # app/tasks.py
-import os
-from celery import Celery
-from app.config import CELERY_BROKER_URL, CELERY_RESULT_BACKEND
-from app.database import SessionLocal
-from app.models.diagnosis_result import DiagnosisResult
+"""
+Background job handlers, run by `python -m app.worker` (see
+app/services/job_queue.py). Handlers don't commit: the queue commits their
+writes together with the job's status.
+"""
+
+from sqlalchemy.orm import Session
+from app.config import EXPORT_DIR
+from app.models.job import Job
 from app.quantum_module.quantum_ai import run_quantum_simulation
+from app.schemas.diagnosis_schema import DiagnosisRequest
+from app.services.diagnosis_service import create_diagnosis, iter_ai_diagnosis
+from app.services.events import event_bus, job_channel
+from app.services.export_service import PARQUET, export_diagnoses
+from app.services.job_queue import job_handler
+
+DIAGNOSIS_JOB = "diagnosis"
+DIAGNOSIS_RESULT_JOB = "diagnosis_result"
+EXPORT_JOB = "diagnosis_export"
+
+
+@job_handler(DIAGNOSIS_JOB)
+def run_diagnosis_job(db: Session, job: Job) -> dict:
+    """
+    Analyze symptoms for ``job.user_id``; the payload is a DiagnosisRequest.
+
+    Progress goes to the job's status stream as it happens: the normalized
+    symptoms, then the top predictions so far.
+    """
+    request_data = DiagnosisRequest(**job.payload)
+    # Read-your-writes: the user's history reads skip replicas for a while
+    db.info["user_key"] = str(job.user_id)
+    channel = job_channel(job.id)
+    event_bus.publish(
+        channel, "progress", {"stage": "normalized", "symptoms": request_data.symptoms}
+    )
+    predictions = []
+    for predictions in iter_ai_diagnosis(request_data.symptoms):
+        event_bus.publish(
+            channel, "progress", {"stage": "partial", "predictions": predictions}
+        )
+    diagnosis = create_diagnosis(
+        db, job.user_id, request_data, commit=False, predictions=predictions
+    )
+    return {"diagnosis_id": str(diagnosis.id)}
+
+
+def run_diagnosis_result(db: Session, diag) -> dict:
+    """Run the simulation for a DiagnosisResult row and store its output."""
+    diag.status = "running"
+    result = run_quantum_simulation(diag.input_payload or {})
+    diag.output_payload = result
+    diag.status = "completed"
+    return result
+
+
+@job_handler(DIAGNOSIS_RESULT_JOB)
+def run_diagnosis_task(db: Session, job: Job) -> dict:
+    """Job form of run_diagnosis_result, for app/routes/diagnosis_routes."""
+    # Imported here: the patient tables only exist alongside the legacy routes
+    from app.models.diagnosis_result import DiagnosisResult
+
+    diag = db.get(DiagnosisResult, job.payload["diagnosis_result_id"])
+    if diag is None:
+        raise LookupError("Diagnosis not found")
+    return run_diagnosis_result(db, diag)
+
 
-celery = Celery("app.tasks", broker=CELERY_BROKER_URL, backend=CELERY_RESULT_BACKEND)
-
-
-@celery.task(bind=True)
-def run_diagnosis_task(self, diagnosis_id: int):
-    db = SessionLocal()
-    try:
-        diag = db.query(DiagnosisResult).get(diagnosis_id)
-        if not diag:
-            return {"error": "Diagnosis not found"}
-        diag.status = "running"
-        db.add(diag)
-        db.commit()
-        payload = diag.input_payload or {}
-        result = run_quantum_simulation(payload)
-        diag.output_payload = result
-        diag.status = "completed"
-        db.add(diag)
-        db.commit()
-        return {"status": "completed", "result": result}
-    except Exception as e:
-        try:
-            diag.status = "failed"
-            diag.output_payload = {"error": str(e)}
-            db.add(diag)
-            db.commit()
-        except Exception:
-            pass
-        return {"status": "failed", "error": str(e)}
-    finally:
-        db.close()
+@job_handler(EXPORT_JOB)
+def run_export_job(db: Session, job: Job) -> dict:
+    """Export new diagnoses to EXPORT_DIR; the payload may set ``format``."""
+    summary = export_diagnoses(db, EXPORT_DIR, job.payload.get("format", PARQUET))
+    return {"rows": summary["rows"], "high_water_mark": summary["high_water_mark"]}
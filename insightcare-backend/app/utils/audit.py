@@ -128,6 +128,21 @@ class AuditLogger:
             metadata={"reason": reason},
         )
 
+    @staticmethod
+    def log_credential_stuffing(
+        db: Session, request: Request, ip_address: str, failures: int
+    ):
+        """Log a client address locked out after repeated login failures."""
+        AuditLogger.log_from_request(
+            db=db,
+            request=request,
+            event_type="credential_stuffing_suspected",
+            event_category="security",
+            description=f"Login attempts from {ip_address} throttled after {failures} failures",
+            status="failure",
+            metadata={"ip_address": ip_address, "failures": failures},
+        )
+
     @staticmethod
     def log_registration(db: Session, request: Request, user_id: str, user_email: str):
         """Log new user registration."""
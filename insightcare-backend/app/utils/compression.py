@@ -0,0 +1,143 @@
+# app/utils/compression.py
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+from fastapi import Response
+from app.config import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_ENCODINGS,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_ZSTD_LEVEL,
+)
+
+# Levels for payloads compressed once and served many times
+STATIC_LEVELS = {"gzip": 9, "br": 11, "zstd": 19}
+
+
+def _module_for(encoding: str):
+    # brotli and zstandard are optional; imported the first time they're needed
+    if encoding == "br":
+        import brotli
+
+        return brotli
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard
+    return zlib
+
+
+@lru_cache(maxsize=None)
+def available_encodings(preference: str = COMPRESSION_ENCODINGS) -> Tuple[str, ...]:
+    """Configured encodings, in server preference order, whose library loads."""
+    encodings = []
+    for encoding in (e.strip() for e in preference.split(",")):
+        if encoding not in ("gzip", "br", "zstd"):
+            continue
+        try:
+            _module_for(encoding)
+        except ImportError:
+            continue
+        encodings.append(encoding)
+    return tuple(encodings)
+
+
+def default_levels() -> Dict[str, int]:
+    return {
+        "gzip": COMPRESSION_GZIP_LEVEL,
+        "br": COMPRESSION_BROTLI_QUALITY,
+        "zstd": COMPRESSION_ZSTD_LEVEL,
+    }
+
+
+def negotiate_encoding(
+    accept_encoding: Optional[str], available: Iterable[str]
+) -> Optional[str]:
+    """
+    Pick the server-preferred encoding the client accepts (q > 0).
+
+    Returns:
+        An entry of ``available``, or None for identity
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip()] = q
+    wildcard = accepted.get("*", 0.0)
+    for encoding in available:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+class StreamCompressor:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, encoding: str, level: int):
+        module = _module_for(encoding)
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+            self._finish = self._obj.flush
+            self.compress = self._obj.compress
+        elif encoding == "br":
+            self._obj = module.Compressor(quality=level)
+            self.compress = self._obj.process
+            self._finish = self._obj.finish
+        else:
+            self._obj = module.ZstdCompressor(level=level).compressobj()
+            self.compress = self._obj.compress
+            self._finish = self._obj.flush
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """One-shot compression."""
+    compressor = StreamCompressor(encoding, level)
+    return compressor.compress(data) + compressor.finish()
+
+
+class PrecompressedPayload:
+    """
+    A static response body compressed once, at maximum level, per encoding.
+
+    CompressionMiddleware leaves responses that already carry a
+    Content-Encoding alone, so serving these costs no compression at all.
+    """
+
+    def __init__(
+        self,
+        body: bytes,
+        media_type: str = "application/json",
+        encodings: Optional[Iterable[str]] = None,
+    ):
+        self.body = body
+        self.media_type = media_type
+        self.variants: Dict[str, bytes] = {}
+        for encoding in available_encodings() if encodings is None else encodings:
+            compressed = compress(body, encoding, STATIC_LEVELS[encoding])
+            # Tiny bodies can grow when compressed
+            if len(compressed) < len(body):
+                self.variants[encoding] = compressed
+
+    def response(self, accept_encoding: Optional[str]) -> Response:
+        """The smallest variant the client accepts."""
+        encoding = negotiate_encoding(accept_encoding, self.variants)
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding is None:
+            return Response(self.body, media_type=self.media_type, headers=headers)
+        headers["Content-Encoding"] = encoding
+        return Response(
+            self.variants[encoding], media_type=self.media_type, headers=headers
+        )
@@ -70,3 +70,37 @@ def get_current_user(
         )
 
     return user
+
+
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Dependency for admin-only endpoints.
+
+    Raises:
+        HTTPException: 403 if the user is not an admin
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
+        )
+    return current_user
+
+
+def require_roles(*roles: str):
+    """
+    Dependency for endpoints limited to some roles, e.g.
+    ``Depends(require_roles("doctor", "admin"))``.
+
+    Raises:
+        HTTPException: 403 if the user has none of ``roles``
+    """
+
+    def check_role(current_user: User = Depends(get_current_user)) -> User:
+        if current_user.role not in roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions",
+            )
+        return current_user
+
+    return check_role
@@ -1,10 +1,10 @@
 # app/utils/email.py
 import os
-from typing import List
+from typing import Dict, Iterable, Tuple
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import aiosmtplib
 from app.config import FRONTEND_URL
+from app.utils.email_templates import EmailTemplate, get_email_template
 import structlog
 
 logger = structlog.get_logger()
@@ -49,6 +49,9 @@ async def send_email(
             message.attach(MIMEText(text_content, "plain"))
         message.attach(MIMEText(html_content, "html"))
 
+        # Imported on first send so workers don't load the SMTP client at startup
+        import aiosmtplib
+
         # Send email
         await aiosmtplib.send(
             message,
@@ -67,6 +70,76 @@ async def send_email(
         return False
 
 
+async def send_template_emails(
+    template: EmailTemplate, recipients: Iterable[Tuple[str, Dict[str, str]]]
+) -> int:
+    """
+    Render and send messages over a single SMTP connection.
+
+    Bodies go out as 8bit with BODY=8BITMIME when the server advertises it,
+    base64-encoded otherwise.
+
+    Args:
+        template: Compiled email template
+        recipients: (email, slot values) pairs
+
+    Returns:
+        Number of messages accepted by the server
+    """
+    recipients = list(recipients)
+    if not recipients:
+        return 0
+    if not SMTP_USER or not SMTP_PASSWORD:
+        logger.warning("SMTP credentials not configured, skipping email")
+        return 0
+
+    # Imported on first send so workers don't load the SMTP client at startup
+    import aiosmtplib
+
+    sent = 0
+    try:
+        async with aiosmtplib.SMTP(
+            hostname=SMTP_HOST,
+            port=SMTP_PORT,
+            username=SMTP_USER,
+            password=SMTP_PASSWORD,
+            start_tls=True,
+        ) as smtp:
+            eight_bit = smtp.supports_extension("8bitmime")
+            mail_options = ["BODY=8BITMIME"] if eight_bit else []
+            messages = template.render_batch(recipients, eight_bit=eight_bit)
+            for to_email, message in messages:
+                try:
+                    await smtp.sendmail(
+                        SMTP_FROM_EMAIL, [to_email], message, mail_options=mail_options
+                    )
+                    sent += 1
+                    logger.info(
+                        "Email sent successfully", to=to_email, subject=template.subject
+                    )
+                except aiosmtplib.SMTPResponseException as e:
+                    # Rejected recipient; the connection is still usable
+                    logger.error("Failed to send email", error=str(e), to=to_email)
+    except Exception as e:
+        logger.error("Email send aborted", error=str(e), sent=sent)
+
+    if len(recipients) > 1:
+        logger.info("Email batch sent", sent=sent, total=len(recipients))
+    return sent
+
+
+def _template(name: str):
+    return get_email_template(name, SMTP_FROM_NAME, SMTP_FROM_EMAIL)
+
+
+def _reset_link(token: str) -> str:
+    return f"{FRONTEND_URL}/reset-password?token={token}"
+
+
+def _verification_link(token: str) -> str:
+    return f"{FRONTEND_URL}/verify-email?token={token}"
+
+
 async def send_password_reset_email(email: str, reset_token: str) -> bool:
     """
     Send password reset email with token link.
@@ -78,67 +151,8 @@ async def send_password_reset_email(email: str, reset_token: str) -> bool:
     Returns:
         True if sent successfully
     """
-    reset_link = f"{FRONTEND_URL}/reset-password?token={reset_token}"
-
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                      color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .button {{ display: inline-block; padding: 12px 30px; background: #667eea; 
-                      color: white; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🔐 Password Reset Request</h1>
-            </div>
-            <div class="content">
-                <p>Hello,</p>
-                <p>We received a request to reset your password for your InsightCare account.</p>
-                <p>Click the button below to reset your password:</p>
-                <center>
-                    <a href="{reset_link}" class="button">Reset Password</a>
-                </center>
-                <p>Or copy and paste this link into your browser:</p>
-                <p style="word-break: break-all; color: #667eea;">{reset_link}</p>
-                <p><strong>This link will expire in 1 hour.</strong></p>
-                <p>If you didn't request this, please ignore this email. Your password won't be changed.</p>
-                <div class="footer">
-                    <p>© 2025 InsightCare. All rights reserved.</p>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-
-    text_content = f"""
-    Password Reset Request
-    
-    We received a request to reset your password for your InsightCare account.
-    
-    Click this link to reset your password:
-    {reset_link}
-    
-    This link will expire in 1 hour.
-    
-    If you didn't request this, please ignore this email.
-    """
-
-    return await send_email(
-        to_email=email,
-        subject="Reset Your InsightCare Password",
-        html_content=html_content,
-        text_content=text_content,
-    )
+    recipients = [(email, {"link": _reset_link(reset_token)})]
+    return await send_template_emails(_template("password_reset"), recipients) == 1
 
 
 async def send_verification_email(email: str, verification_token: str) -> bool:
@@ -152,60 +166,26 @@ async def send_verification_email(email: str, verification_token: str) -> bool:
     Returns:
         True if sent successfully
     """
-    verification_link = f"{FRONTEND_URL}/verify-email?token={verification_token}"
-
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                      color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .button {{ display: inline-block; padding: 12px 30px; background: #667eea; 
-                      color: white; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>✅ Verify Your Email</h1>
-            </div>
-            <div class="content">
-                <p>Welcome to InsightCare!</p>
-                <p>Please verify your email address to activate your account.</p>
-                <center>
-                    <a href="{verification_link}" class="button">Verify Email</a>
-                </center>
-                <p>Or copy and paste this link into your browser:</p>
-                <p style="word-break: break-all; color: #667eea;">{verification_link}</p>
-                <p><strong>This link will expire in 24 hours.</strong></p>
-                <div class="footer">
-                    <p>© 2025 InsightCare. All rights reserved.</p>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    recipients = [(email, {"link": _verification_link(verification_token)})]
+    return await send_template_emails(_template("verification"), recipients) == 1
+
 
-    text_content = f"""
-    Welcome to InsightCare!
-    
-    Please verify your email address to activate your account.
-    
-    Click this link to verify:
-    {verification_link}
-    
-    This link will expire in 24 hours.
+async def send_verification_emails(recipients: Dict[str, str]) -> int:
     """
+    Send verification links to many users, e.g. a re-verification campaign.
 
-    return await send_email(
-        to_email=email,
-        subject="Verify Your InsightCare Account",
-        html_content=html_content,
-        text_content=text_content,
+    Messages are rendered in one batch and sent over one SMTP connection.
+
+    Args:
+        recipients: Mapping of email address to verification token
+
+    Returns:
+        Number of messages accepted by the server
+    """
+    return await send_template_emails(
+        _template("verification"),
+        (
+            (email, {"link": _verification_link(token)})
+            for email, token in recipients.items()
+        ),
     )
@@ -0,0 +1,205 @@
+# app/utils/email_templates.py
+import base64
+import html
+import re
+import secrets
+from email.utils import formataddr, formatdate, make_msgid
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+_SLOT_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+Escape = Callable[[str], str]
+
+
+def _no_escape(value: str) -> str:
+    return value
+
+
+def _header_escape(value: str) -> str:
+    # Header values must never start a new header line
+    return value.replace("\r", "").replace("\n", "")
+
+
+class CompiledTemplate:
+    """
+    A template split once into pre-encoded static fragments and named slots.
+
+    Rendering only escapes and encodes the slot values, then joins bytes; the
+    static markup is never re-built or re-encoded.
+    """
+
+    def __init__(self, fragments: List[bytes], slots: List[Tuple[str, Escape]]):
+        # len(fragments) == len(slots) + 1
+        self.fragments = fragments
+        self.slots = slots
+
+    @classmethod
+    def compile(cls, source: str, escape: Escape = _no_escape) -> "CompiledTemplate":
+        """Compile ``{{ name }}`` placeholders in ``source`` (CRLF line endings)."""
+        source = source.replace("\r\n", "\n").replace("\n", "\r\n")
+        fragments, slots, last = [], [], 0
+        for match in _SLOT_RE.finditer(source):
+            fragments.append(source[last : match.start()].encode("utf-8"))
+            slots.append((match.group(1), escape))
+            last = match.end()
+        fragments.append(source[last:].encode("utf-8"))
+        return cls(fragments, slots)
+
+    def __add__(self, other: "CompiledTemplate") -> "CompiledTemplate":
+        """Concatenate, merging the static fragments at the seam."""
+        fragments = (
+            self.fragments[:-1]
+            + [self.fragments[-1] + other.fragments[0]]
+            + other.fragments[1:]
+        )
+        return CompiledTemplate(fragments, self.slots + other.slots)
+
+    def render(self, values: Dict[str, str]) -> bytes:
+        """Fill the slots from ``values``."""
+        # Each distinct value is escaped and encoded once, even if repeated
+        encoded: Dict[Tuple[str, Escape], bytes] = {}
+        parts = [self.fragments[0]]
+        for (name, escape), fragment in zip(self.slots, self.fragments[1:]):
+            key = (name, escape)
+            if key not in encoded:
+                encoded[key] = escape(str(values[name])).encode("utf-8")
+            parts.append(encoded[key])
+            parts.append(fragment)
+        return b"".join(parts)
+
+    def render_many(self, rows: Iterable[Dict[str, str]]) -> List[bytes]:
+        """Render a batch of messages."""
+        return [self.render(values) for values in rows]
+
+
+def _base64_lines(data: bytes) -> str:
+    # 76-character lines, as MIME requires
+    return base64.encodebytes(data).decode("ascii").replace("\n", "\r\n")
+
+
+class EmailTemplate:
+    """
+    A complete multipart/alternative message compiled from a text and an
+    HTML template.
+
+    Headers, MIME boundaries and both bodies form one CompiledTemplate, so
+    rendering a message is a single join. Bodies are sent as 8bit UTF-8,
+    which keeps the static fragments byte-for-byte reusable. For servers
+    without 8BITMIME a second layout, compiled alongside, carries the bodies
+    base64-encoded; only that fallback encodes per message.
+    """
+
+    def __init__(self, name: str, subject: str, from_name: str, from_email: str):
+        boundary = f"=_insightcare_{secrets.token_hex(16)}"
+        headers = (
+            f"From: {formataddr((from_name, from_email))}\n"
+            "To: {{ to }}\n"
+            f"Subject: {subject}\n"
+            "Date: {{ date }}\n"
+            "Message-ID: {{ message_id }}\n"
+            "MIME-Version: 1.0\n"
+            f'Content-Type: multipart/alternative; boundary="{boundary}"\n'
+            "\n"
+        )
+        part = (
+            "--{boundary}\n"
+            'Content-Type: text/{subtype}; charset="utf-8"\n'
+            "Content-Transfer-Encoding: {encoding}\n"
+            "\n"
+        )
+        text_source = (TEMPLATE_DIR / f"{name}.txt").read_text(encoding="utf-8")
+        html_source = (TEMPLATE_DIR / f"{name}.html").read_text(encoding="utf-8")
+
+        def layout(encoding: str, text_body, html_body) -> CompiledTemplate:
+            return (
+                CompiledTemplate.compile(headers, _header_escape)
+                + CompiledTemplate.compile(
+                    part.format(boundary=boundary, subtype="plain", encoding=encoding)
+                )
+                + text_body
+                + CompiledTemplate.compile(
+                    "\n"
+                    + part.format(boundary=boundary, subtype="html", encoding=encoding)
+                )
+                + html_body
+                + CompiledTemplate.compile(f"\n--{boundary}--\n")
+            )
+
+        self.name = name
+        self.subject = subject
+        self.from_email = from_email
+        self._domain = from_email.rpartition("@")[2] or "insightcare.local"
+        self.text_body = CompiledTemplate.compile(text_source)
+        self.html_body = CompiledTemplate.compile(html_source, html.escape)
+        self.compiled = layout("8bit", self.text_body, self.html_body)
+        self.compiled_7bit = layout(
+            "base64",
+            CompiledTemplate.compile("{{ text_body }}"),
+            CompiledTemplate.compile("{{ html_body }}"),
+        )
+
+    def _envelope(self, to_email: str, date: str) -> Dict[str, str]:
+        return {
+            "to": to_email,
+            "date": date,
+            "message_id": make_msgid(domain=self._domain),
+        }
+
+    def _render(self, values: Dict[str, str], eight_bit: bool) -> bytes:
+        if eight_bit:
+            return self.compiled.render(values)
+        return self.compiled_7bit.render(
+            {
+                **values,
+                "text_body": _base64_lines(self.text_body.render(values)),
+                "html_body": _base64_lines(self.html_body.render(values)),
+            }
+        )
+
+    def render(
+        self, to_email: str, values: Dict[str, str], eight_bit: bool = True
+    ) -> bytes:
+        """
+        Raw RFC 5322 message for one recipient.
+
+        Args:
+            to_email: Recipient email address
+            values: Slot values for the bodies
+            eight_bit: Whether the server accepts 8bit bodies (8BITMIME);
+                otherwise they are base64-encoded
+
+        Returns:
+            The message bytes
+        """
+        return self._render(
+            {**values, **self._envelope(to_email, formatdate(usegmt=True))}, eight_bit
+        )
+
+    def render_batch(
+        self, recipients: Iterable[Tuple[str, Dict[str, str]]], eight_bit: bool = True
+    ) -> List[Tuple[str, bytes]]:
+        """Raw messages for many (email, values) pairs, sharing one Date."""
+        date = formatdate(usegmt=True)
+        return [
+            (
+                to_email,
+                self._render({**values, **self._envelope(to_email, date)}, eight_bit),
+            )
+            for to_email, values in recipients
+        ]
+
+
+TEMPLATE_SUBJECTS = {
+    "password_reset": "Reset Your InsightCare Password",
+    "verification": "Verify Your InsightCare Account",
+}
+
+
+@lru_cache(maxsize=None)
+def get_email_template(name: str, from_name: str, from_email: str) -> EmailTemplate:
+    """Load and compile an email template once per process."""
+    return EmailTemplate(name, TEMPLATE_SUBJECTS[name], from_name, from_email)
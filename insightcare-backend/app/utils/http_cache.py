@@ -0,0 +1,43 @@
+# app/utils/http_cache.py
+import hashlib
+from typing import Optional
+from fastapi import Response, status
+
+# Diagnoses never change once written
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# Lists can change; the browser revalidates with If-None-Match every time
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+# Bump when the JSON shape of cached responses changes
+ETAG_VERSION = "1"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag (quoted) derived from the given values."""
+    key = "|".join([ETAG_VERSION, *(str(part) for part in parts)])
+    return '"' + hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches ``etag``.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    ``W/`` prefix added by a proxy still matches.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Empty 304 carrying the validators a 200 would have."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
@@ -0,0 +1,369 @@
+# app/utils/login_throttle.py
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import structlog
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import (
+    RATE_LIMIT_STORAGE_URL,
+    LOGIN_WINDOW_SECONDS,
+    LOGIN_MAX_FAILURES_PER_EMAIL,
+    LOGIN_MAX_FAILURES_PER_IP,
+    LOGIN_BLOOM_CAPACITY,
+    LOGIN_BLOOM_ERROR_RATE,
+    LOGIN_BLOOM_REFRESH_SECONDS,
+)
+from app.models.user import User
+from app.utils.security import verify_password, DUMMY_PASSWORD_HASH
+
+logger = structlog.get_logger()
+
+
+def bloom_parameters(capacity: int, error_rate: float) -> Tuple[int, int]:
+    """Bit count and hash count for ``capacity`` items at ``error_rate``."""
+    bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+def bloom_positions(item: str, bits: int, hashes: int) -> List[int]:
+    """Bit positions for ``item`` (Kirsch-Mitzenmacher double hashing)."""
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+class MemoryThrottleStore:
+    """
+    Sliding-window counters and bloom filter bits held in this worker.
+
+    Counters use the two-window approximation: the previous fixed window is
+    weighted by how much of it still overlaps the sliding window, so each key
+    costs three numbers regardless of attempt volume.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, bits: int):
+        self._windows: Dict[str, Tuple[int, int, int]] = {}
+        self._bloom = bytearray(math.ceil(bits / 8))
+        self._bloom_loaded = False
+        self._lock = threading.Lock()
+        self._ops = 0
+
+    def _roll(self, key: str, index: int) -> Tuple[int, int]:
+        start, current, previous = self._windows.get(key, (index, 0, 0))
+        if start == index:
+            return current, previous
+        if start == index - 1:
+            return 0, current
+        return 0, 0
+
+    async def hit(self, keys: List[str], window: int) -> List[float]:
+        """Count one failure against each key; returns the new estimates."""
+        now = time.time()
+        index = int(now // window)
+        weight = 1 - (now % window) / window
+        estimates = []
+        with self._lock:
+            for key in keys:
+                current, previous = self._roll(key, index)
+                current += 1
+                self._windows[key] = (index, current, previous)
+                estimates.append(current + previous * weight)
+            self._ops += 1
+            if self._ops % self.PRUNE_EVERY == 0:
+                self._windows = {
+                    k: v for k, v in self._windows.items() if v[0] >= index - 1
+                }
+        return estimates
+
+    async def counts(self, keys: List[str], window: int) -> List[float]:
+        """Current sliding-window estimates for ``keys``."""
+        now = time.time()
+        index = int(now // window)
+        weight = 1 - (now % window) / window
+        with self._lock:
+            return [
+                current + previous * weight
+                for current, previous in (self._roll(key, index) for key in keys)
+            ]
+
+    async def clear(self, key: str, window: int):
+        with self._lock:
+            self._windows.pop(key, None)
+
+    async def bloom_add(self, positions: List[int]):
+        with self._lock:
+            for pos in positions:
+                self._bloom[pos >> 3] |= 1 << (pos & 7)
+
+    async def bloom_contains(self, positions: List[int]) -> bool:
+        return all(self._bloom[pos >> 3] & (1 << (pos & 7)) for pos in positions)
+
+    async def bloom_loaded(self) -> bool:
+        return self._bloom_loaded
+
+    async def set_bloom_loaded(self):
+        self._bloom_loaded = True
+
+    def reset(self):
+        """Forget all counters and bloom bits."""
+        with self._lock:
+            self._windows.clear()
+            self._bloom = bytearray(len(self._bloom))
+            self._bloom_loaded = False
+
+
+class RedisThrottleStore:
+    """
+    Sliding-window counters and bloom filter bits shared through Redis.
+
+    Every operation is a single pipelined round-trip.
+    """
+
+    def __init__(self, url: str, prefix: str = "login:"):
+        # Optional dependency, only needed when a shared backend is configured
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._prefix = prefix
+        self._bloom_key = prefix + "bloom"
+
+    def _window_keys(self, key: str, index: int) -> Tuple[str, str]:
+        return (
+            f"{self._prefix}{key}:{index}",
+            f"{self._prefix}{key}:{index - 1}",
+        )
+
+    async def hit(self, keys: List[str], window: int) -> List[float]:
+        now = time.time()
+        index = int(now // window)
+        weight = 1 - (now % window) / window
+        pipe = self._client.pipeline(transaction=False)
+        for key in keys:
+            current_key, previous_key = self._window_keys(key, index)
+            pipe.incr(current_key)
+            pipe.expire(current_key, window * 2)
+            pipe.get(previous_key)
+        results = await pipe.execute()
+        return [
+            int(results[i]) + int(results[i + 2] or 0) * weight
+            for i in range(0, len(results), 3)
+        ]
+
+    async def counts(self, keys: List[str], window: int) -> List[float]:
+        now = time.time()
+        index = int(now // window)
+        weight = 1 - (now % window) / window
+        names = [name for key in keys for name in self._window_keys(key, index)]
+        values = await self._client.mget(names)
+        return [
+            int(values[i] or 0) + int(values[i + 1] or 0) * weight
+            for i in range(0, len(values), 2)
+        ]
+
+    async def clear(self, key: str, window: int):
+        index = int(time.time() // window)
+        await self._client.delete(*self._window_keys(key, index))
+
+    async def bloom_add(self, positions: List[int]):
+        pipe = self._client.pipeline(transaction=False)
+        for pos in positions:
+            pipe.setbit(self._bloom_key, pos, 1)
+        await pipe.execute()
+
+    async def bloom_contains(self, positions: List[int]) -> bool:
+        pipe = self._client.pipeline(transaction=False)
+        for pos in positions:
+            pipe.getbit(self._bloom_key, pos)
+        return all(await pipe.execute())
+
+    async def bloom_loaded(self) -> bool:
+        return bool(await self._client.exists(self._bloom_key + ":loaded"))
+
+    async def set_bloom_loaded(self):
+        await self._client.set(self._bloom_key + ":loaded", 1)
+
+    def reset(self):
+        """Keys expire on their own in Redis."""
+
+
+class LoginThrottle:
+    """
+    Rejects abusive login attempts before any DB or bcrypt work.
+
+    - Failures are counted per email and per client IP in sliding windows;
+      over the limit, attempts are refused outright.
+    - A bloom filter of registered emails answers "no such account" without
+      a users lookup. Those misses wait as long as a real password check
+      would, so response times don't reveal which emails exist.
+    """
+
+    LOAD_BATCH_SIZE = 10000
+    # Refreshes re-read users created this long before the watermark:
+    # created_at is the transaction start time, so a registration can commit
+    # after a refresh with an earlier timestamp
+    REFRESH_OVERLAP = timedelta(minutes=5)
+
+    def __init__(
+        self,
+        store=None,
+        window: int = LOGIN_WINDOW_SECONDS,
+        max_per_email: int = LOGIN_MAX_FAILURES_PER_EMAIL,
+        max_per_ip: int = LOGIN_MAX_FAILURES_PER_IP,
+        bloom_capacity: int = LOGIN_BLOOM_CAPACITY,
+        bloom_error_rate: float = LOGIN_BLOOM_ERROR_RATE,
+        refresh_interval: float = LOGIN_BLOOM_REFRESH_SECONDS,
+    ):
+        self.bits, self.hashes = bloom_parameters(bloom_capacity, bloom_error_rate)
+        self.store = store or create_store(RATE_LIMIT_STORAGE_URL, self.bits)
+        self.window = window
+        self.max_per_email = max_per_email
+        self.max_per_ip = max_per_ip
+        self.refresh_interval = refresh_interval
+        self._watermark: Optional[datetime] = None
+        self._last_refresh = 0.0
+        self._expected_seconds: Optional[float] = None
+        self._loaded_here = False
+        self._load_lock = asyncio.Lock()
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return f"email:{email.lower()}"
+
+    @staticmethod
+    def _ip_key(ip: str) -> str:
+        return f"ip:{ip}"
+
+    async def check(self, email: str, ip: str) -> Optional[int]:
+        """Seconds to wait if this email or IP is over its limit, else None."""
+        email_count, ip_count = await self.store.counts(
+            [self._email_key(email), self._ip_key(ip)], self.window
+        )
+        if email_count >= self.max_per_email or ip_count >= self.max_per_ip:
+            return math.ceil(self.window - time.time() % self.window)
+        return None
+
+    async def record_failure(self, email: str, ip: str) -> bool:
+        """
+        Count a failed attempt.
+
+        Returns True when the IP reaches its limit, which is the signal for
+        credential stuffing (many accounts tried from one address). Further
+        attempts are refused by ``check``, so this fires once per lockout.
+        """
+        _, ip_count = await self.store.hit(
+            [self._email_key(email), self._ip_key(ip)], self.window
+        )
+        return ip_count >= self.max_per_ip
+
+    async def record_success(self, email: str):
+        """Reset the per-email counter after a successful login."""
+        await self.store.clear(self._email_key(email), self.window)
+
+    async def add_email(self, email: str):
+        """Add a newly registered email to the bloom filter."""
+        await self.store.bloom_add(bloom_positions(email, self.bits, self.hashes))
+
+    def _load_emails(self, db: Session, since: Optional[datetime]) -> List[str]:
+        query = select(User.email, User.created_at)
+        if since is not None:
+            query = query.where(User.created_at >= since)
+        emails = []
+        for email, created_at in db.execute(query.execution_options(yield_per=5000)):
+            emails.append(email)
+            if created_at and (self._watermark is None or created_at > self._watermark):
+                self._watermark = created_at
+        return emails
+
+    async def _add_from_db(self, db: Session, since: Optional[datetime]):
+        async with self._load_lock:
+            emails = await run_in_threadpool(self._load_emails, db, since)
+            for i in range(0, len(emails), self.LOAD_BATCH_SIZE):
+                positions = [
+                    pos
+                    for email in emails[i : i + self.LOAD_BATCH_SIZE]
+                    for pos in bloom_positions(email, self.bits, self.hashes)
+                ]
+                await self.store.bloom_add(positions)
+            self._last_refresh = time.monotonic()
+
+    async def might_exist(self, db: Session, email: str) -> bool:
+        """
+        Whether an account may exist for ``email``.
+
+        The filter is loaded from the users table on first use and receives
+        this worker's (or, when shared, every worker's) registrations through
+        ``add_email``, so misses are trusted without a users lookup. The
+        worker that loaded it tops it up on a miss, at most once per refresh
+        interval, with users created since its last load (minus
+        REFRESH_OVERLAP): accounts created outside the API, or through other
+        workers when the filter is per-worker, are found within one interval.
+        """
+        positions = bloom_positions(email, self.bits, self.hashes)
+
+        if not await self.store.bloom_loaded():
+            await self._add_from_db(db, None)
+            await self.store.set_bloom_loaded()
+            self._loaded_here = True
+        elif await self.store.bloom_contains(positions):
+            return True
+        elif (
+            self._loaded_here
+            and time.monotonic() - self._last_refresh >= self.refresh_interval
+        ):
+            since = self._watermark and self._watermark - self.REFRESH_OVERLAP
+            await self._add_from_db(db, since)
+        else:
+            return False
+
+        return await self.store.bloom_contains(positions)
+
+    def observe_verify(self, seconds: float):
+        """Feed the duration of a real failed verification into the average."""
+        if self._expected_seconds is None:
+            self._expected_seconds = seconds
+        else:
+            self._expected_seconds = 0.8 * self._expected_seconds + 0.2 * seconds
+
+    async def equalize(self):
+        """
+        Wait as long as a real failed login takes, without spending CPU.
+
+        Before any real failure has been observed, one dummy bcrypt check is
+        timed to seed the estimate.
+        """
+        if self._expected_seconds is None:
+            start = time.perf_counter()
+            await run_in_threadpool(verify_password, "", DUMMY_PASSWORD_HASH)
+            self.observe_verify(time.perf_counter() - start)
+            return
+        await asyncio.sleep(self._expected_seconds)
+
+    def reset(self):
+        """Forget all counters, bloom bits and timing estimates."""
+        self.store.reset()
+        self._watermark = None
+        self._last_refresh = 0.0
+        self._expected_seconds = None
+        self._loaded_here = False
+        self._load_lock = asyncio.Lock()
+
+
+def create_store(url: str, bits: int):
+    """Build a store from a storage URL (memory:// or redis://...)."""
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisThrottleStore(url)
+    return MemoryThrottleStore(bits)
+
+
+# Shared by all login requests in this worker
+login_throttle = LoginThrottle()
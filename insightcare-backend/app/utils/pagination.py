@@ -0,0 +1,35 @@
+# app/utils/pagination.py
+import base64
+from typing import Any, List
+import orjson
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Opaque keyset cursor: the sort key of the last row on a page.
+
+    The next page starts strictly after it, so pages stay stable while rows
+    are inserted and deep pages cost the same as the first (no OFFSET scan).
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(list(values))).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Sort key values from ``encode_cursor``.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        values = orjson.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return values
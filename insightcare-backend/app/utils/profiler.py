@@ -0,0 +1,186 @@
+# app/utils/profiler.py
+import hashlib
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+from app.config import (
+    PROFILING_INTERVAL_MS,
+    PROFILING_MAX_STORED,
+    PROFILING_SECRET,
+)
+
+Frame = Tuple[str, str, int]  # (function, file, first line)
+
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_BACKEND_ROOT):
+        return os.path.relpath(filename, _BACKEND_ROOT)
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return filename
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for every thread in this worker.
+
+    A daemon thread snapshots all thread stacks every ``interval`` seconds
+    with sys._current_frames(); profiled code itself is not instrumented, so
+    nothing runs (and nothing costs) unless a profiler has been started.
+    """
+
+    def __init__(self, interval: float = PROFILING_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack: List[Frame] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    (code.co_name, _short_path(code.co_filename), code.co_firstlineno)
+                )
+                frame = frame.f_back
+            stack.append((names.get(thread_id, f"thread-{thread_id}"), "", 0))
+            stack.reverse()
+            self.stacks[tuple(stack)] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+        return self
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format (flamegraph.pl, speedscope)."""
+        lines = []
+        for stack, count in self.stacks.most_common():
+            names = [
+                f"{name} ({path}:{line})" if path else name
+                for name, path, line in stack
+            ]
+            lines.append(f"{';'.join(names)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str) -> dict:
+        """Speedscope JSON, one sampled profile per thread."""
+        frames: List[dict] = []
+        frame_index: Dict[Frame, int] = {}
+        by_thread: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+
+        for stack, count in self.stacks.items():
+            indices = []
+            for frame in stack[1:]:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    function, path, line = frame
+                    frames.append({"name": function, "file": path, "line": line})
+                indices.append(frame_index[frame])
+            samples, weights = by_thread.setdefault(stack[0][0], ([], []))
+            samples.append(indices)
+            weights.append(count * self.interval)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "insightcare-profiler",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+                for thread, (samples, weights) in by_thread.items()
+            ],
+        }
+
+
+def sign_profile_token(expires_at: int, secret: str = PROFILING_SECRET) -> str:
+    """Value for the X-Profile header, valid until ``expires_at`` (epoch)."""
+    signature = hmac.new(
+        secret.encode(), f"profile:{expires_at}".encode(), hashlib.sha256
+    ).hexdigest()
+    return f"{expires_at}.{signature}"
+
+
+def verify_profile_token(value: str, secret: str = PROFILING_SECRET) -> bool:
+    """Check an X-Profile header signature and expiry."""
+    expires_at, _, signature = value.partition(".")
+    if not expires_at.isdigit() or int(expires_at) < time.time():
+        return False
+    expected = sign_profile_token(int(expires_at), secret).partition(".")[2]
+    return hmac.compare_digest(signature, expected)
+
+
+class ProfileStore:
+    """The most recent per-request profiles, keyed by X-Request-ID."""
+
+    def __init__(self, max_size: int = PROFILING_MAX_STORED):
+        self.max_size = max_size
+        self._profiles: "OrderedDict[str, SamplingProfiler]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, request_id: str, profiler: SamplingProfiler):
+        with self._lock:
+            self._profiles[request_id] = profiler
+            while len(self._profiles) > self.max_size:
+                self._profiles.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[SamplingProfiler]:
+        with self._lock:
+            return self._profiles.get(request_id)
+
+    def list(self) -> List[dict]:
+        with self._lock:
+            return [
+                {
+                    "request_id": request_id,
+                    "samples": profiler.samples,
+                    "duration": round(profiler.duration, 4),
+                }
+                for request_id, profiler in reversed(self._profiles.items())
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+
+# Per-request profiles captured by this worker
+profile_store = ProfileStore()
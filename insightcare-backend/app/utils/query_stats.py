@@ -0,0 +1,141 @@
+# app/utils/query_stats.py
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_QUOTED_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(
+    r"\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))*\s*\)"
+)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    A statement with its literals and IN-lists collapsed, so the same query
+    with different values counts as one shape.
+    """
+    shape = _QUOTED_RE.sub("?", statement)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _IN_LIST_RE.sub("(?)", shape)
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """SQL statements executed on behalf of one request (or test block)."""
+
+    __slots__ = ("count", "duration", "shapes")
+
+    def __init__(self, track_shapes: bool = False):
+        self.count = 0
+        self.duration = 0.0
+        # Only kept in debug mode: normalizing every statement isn't free
+        self.shapes: Optional[Counter] = Counter() if track_shapes else None
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        if self.shapes is not None:
+            self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes run at least ``threshold`` times (likely N+1)."""
+        if not self.shapes:
+            return []
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+# Stats of the request being served; None outside requests
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def begin_request(track_shapes: bool = False):
+    """
+    Start counting statements for the current request.
+
+    The context is inherited by the threadpool, so sync endpoints are
+    counted too.
+
+    Returns:
+        (stats, token); pass the token to end_request()
+    """
+    stats = QueryStats(track_shapes)
+    return stats, _current_stats.set(stats)
+
+
+def end_request(token):
+    _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_started")
+    if started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def install_query_hooks():
+    """Count statements on every engine (idempotent)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+class QueryCounter:
+    """
+    Count every statement run on ``engine`` inside a ``with`` block,
+    whichever thread or request runs it. Meant for tests:
+
+        with QueryCounter(engine) as queries:
+            client.get("/api/history", headers=headers)
+        assert queries.count <= 3
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.stats = QueryStats(track_shapes=True)
+        self.statements: List[str] = []
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        self.stats.record(statement, 0.0)
+
+    @property
+    def count(self) -> int:
+        return self.stats.count
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        return self.stats.repeated(threshold)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "after_cursor_execute", self._after)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "after_cursor_execute", self._after)
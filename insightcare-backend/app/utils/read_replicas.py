@@ -0,0 +1,165 @@
+# app/utils/read_replicas.py
+"""
+Read-only sessions routed to replica databases.
+
+Read endpoints depend on ``get_read_db`` (app/database.py) instead of
+``get_db``. Their sessions use a replica, round-robin, except:
+
+- for a user who wrote to the primary in the last READ_YOUR_WRITES_SECONDS,
+  so their own changes (a diagnosis just created) show up despite
+  replication lag;
+- when no replica can be reached: one that fails to connect is skipped
+  for REPLICA_RETRY_SECONDS.
+
+Those sessions read from the primary instead.
+"""
+
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+import structlog
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from app.utils.security import verify_token
+
+logger = structlog.get_logger()
+
+
+def request_user_key(request: Request) -> Optional[str]:
+    """The user id in the request's bearer token, without a database lookup."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = verify_token(token)
+    if payload is None:
+        return None
+    return payload.get("user_id") or payload.get("sub")
+
+
+class MemoryWriteMarks:
+    """
+    Users' recent writes, in process.
+
+    Only requests served by the same worker see them, so this is the
+    local/test stand-in for the shared Redis store.
+    """
+
+    def __init__(self):
+        self._until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, key: str, seconds: float):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._until) > 10000:
+                self._until = {k: t for k, t in self._until.items() if t > now}
+            self._until[key] = now + seconds
+
+    def is_marked(self, key: str) -> bool:
+        with self._lock:
+            return self._until.get(key, 0.0) > time.monotonic()
+
+    def reset(self):
+        """Forget all marks."""
+        with self._lock:
+            self._until.clear()
+
+
+class RedisWriteMarks:
+    """Recent writes shared by all workers: one expiring key per user."""
+
+    def __init__(self, url: str, prefix: str = "wrote:"):
+        # Optional dependency, only needed when a shared backend is configured
+        import redis
+
+        self._client = redis.from_url(url)
+        self._prefix = prefix
+
+    def mark(self, key: str, seconds: float):
+        self._client.set(self._prefix + key, 1, px=max(int(seconds * 1000), 1))
+
+    def is_marked(self, key: str) -> bool:
+        return bool(self._client.exists(self._prefix + key))
+
+    def reset(self):
+        """Marks expire on their own in Redis."""
+
+
+def create_write_marks(url: str):
+    """Build a store from a storage URL (memory:// or redis://...)."""
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisWriteMarks(url)
+    return MemoryWriteMarks()
+
+
+class ReadOnlySession(Session):
+    """A session that refuses to flush changes."""
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _refuse_writes(session, flush_context, instances):
+    raise RuntimeError("Read-only session: write with get_db")
+
+
+class ReplicaRouter:
+    """Picks the database a read-only session connects to."""
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: List[Engine],
+        marks,
+        sticky_seconds: float,
+        retry_seconds: float,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.marks = marks
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._turn = itertools.count()
+        # Replica index -> when to try it again
+        self._down_until: Dict[int, float] = {}
+
+    def note_write(self, key: Optional[str]):
+        """Send ``key``'s reads to the primary for the sticky window."""
+        if key and self.replicas and self.sticky_seconds > 0:
+            self.marks.mark(key, self.sticky_seconds)
+
+    def _candidates(self) -> List[int]:
+        now = time.monotonic()
+        start = next(self._turn)
+        order = [(start + i) % len(self.replicas) for i in range(len(self.replicas))]
+        return [i for i in order if self._down_until.get(i, 0.0) <= now]
+
+    def connect(self, key: Optional[str] = None) -> Connection:
+        """
+        A connection for a read-only session of the user ``key``.
+
+        Returns:
+            A replica connection, or a primary one if the user just wrote or
+            no replica is reachable
+        """
+        if not self.replicas or (key and self.marks.is_marked(key)):
+            return self.primary.connect()
+        for index in self._candidates():
+            try:
+                return self.replicas[index].connect()
+            except DBAPIError as e:
+                self._down_until[index] = time.monotonic() + self.retry_seconds
+                logger.warning(
+                    "Read replica unavailable, skipping it",
+                    replica=index,
+                    retry_in=self.retry_seconds,
+                    error=str(e.orig),
+                )
+        return self.primary.connect()
+
+    def dispose(self):
+        """Close the replicas' pooled connections."""
+        for replica in self.replicas:
+            replica.dispose()
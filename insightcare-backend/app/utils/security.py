@@ -11,6 +11,10 @@ except Exception:
     from jwt import PyJWTError as JWTError
 from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
+# bcrypt hash of a random, discarded password. Checking against it costs the
+# same as a real verification, so unknown accounts can't be told apart by timing.
+DUMMY_PASSWORD_HASH = "$2b$12$UacNHikhX5y8/AG3PmQU2eKQCX2UBYnRsagII/OmGMhs3IEdVU9O6"
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
@@ -0,0 +1,24 @@
+# app/utils/serialization.py
+import orjson
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def dumps(content) -> bytes:
+    """Serialize like ORJSONResponse (e.g. for event streams)."""
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """
+    orjson-rendered JSON, the app's default response class.
+
+    Endpoints on a hot path may return one of these directly with data they
+    built themselves (UUIDs and datetimes included): FastAPI then skips
+    re-validating it against ``response_model``, which only documents the
+    shape. UTC datetimes are written with a ``Z`` suffix, matching Pydantic.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,55 @@
+# app/worker.py
+"""
+Background job worker.
+
+    python -m app.worker [--concurrency 4]
+
+Claims jobs from the database queue (any number of these can run side by
+side) so long-running work stays off the API's HTTP workers. SIGTERM stops
+claiming and waits up to SHUTDOWN_DRAIN_SECONDS for running jobs; jobs cut
+off are picked up again after JOB_TIMEOUT_SECONDS.
+"""
+
+import argparse
+import asyncio
+import signal
+import structlog
+from app.config import JOB_WORKER_CONCURRENCY, SHUTDOWN_DRAIN_SECONDS
+from app.database import SessionLocal, engine
+from app.services.events import event_bus
+from app.services.job_queue import JobWorker
+import app.tasks  # noqa: F401  (registers the job handlers)
+
+logger = structlog.get_logger()
+
+
+async def serve(concurrency: int):
+    # Job progress and new diagnoses reach SSE clients on the API workers
+    event_bus.configure(engine)
+    worker = JobWorker(SessionLocal, concurrency=concurrency)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    task = asyncio.create_task(worker.run())
+    await stop.wait()
+    unfinished = await worker.drain(SHUTDOWN_DRAIN_SECONDS)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    engine.dispose()
+    if unfinished:
+        logger.warning("Job worker stopped with jobs running", unfinished=unfinished)
+    else:
+        logger.info("Job worker stopped")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.worker")
+    parser.add_argument("--concurrency", type=int, default=JOB_WORKER_CONCURRENCY)
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
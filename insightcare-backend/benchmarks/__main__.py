@@ -0,0 +1,100 @@
+# benchmarks/__main__.py
+"""
+Run the benchmark suite.
+
+    python -m benchmarks                       # micro + macro, compare to baseline
+    python -m benchmarks --only micro
+    python -m benchmarks --rps 40 --users 20 --duration 30
+    python -m benchmarks --save-baseline       # record a new baseline
+
+Exits with status 1 when a benchmark regresses past --tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--only", choices=["micro", "macro"])
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("BENCH_DATABASE_URL", "sqlite:///./benchmark.db"),
+        help="Database for the macro scenario (default: local SQLite file)",
+    )
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--rps", type=float, default=20.0)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    # Must be set before the app is imported; .env never overrides these
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("SCHEMA_CHECK_ON_STARTUP", "false")
+
+    import structlog
+    import app.main  # noqa: F401 (configures logging)
+    from benchmarks.harness import compare, format_table, load_baseline, save_baseline
+
+    # Keep log formatting in the measurement, but not on the terminal
+    structlog.configure(
+        logger_factory=structlog.PrintLoggerFactory(open(os.devnull, "w"))
+    )
+
+    results = {}
+    if args.only in (None, "micro"):
+        from benchmarks.micro import run_micro
+
+        results.update(run_micro(rounds=args.rounds))
+    if args.only in (None, "macro"):
+        from benchmarks.load import run_macro
+
+        results.update(
+            asyncio.run(
+                run_macro(rps=args.rps, users=args.users, duration=args.duration)
+            )
+        )
+
+    print(format_table(results))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline) or {}
+        baseline.update(results)
+        save_baseline(args.baseline, baseline)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nRegressions (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions against {args.baseline.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+# benchmarks/harness.py
+"""Timing, load generation and baseline comparison for the benchmark suite."""
+
+import asyncio
+import inspect
+import json
+import math
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted samples (q in 0-100)."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples: List[float], elapsed: float, errors: int = 0) -> Dict:
+    """
+    Latency percentiles (milliseconds) and throughput for one benchmark.
+
+    Args:
+        samples: Per-operation latencies in seconds
+        elapsed: Wall-clock seconds the operations took in total
+        errors: Operations that failed
+    """
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 4),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 4),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 4),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 4) if ordered else 0.0,
+        "throughput": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def microbench(
+    fn: Callable, rounds: int = 200, batch: int = 10, warmup: int = 20
+) -> Dict:
+    """
+    Time a zero-argument callable (sync or async).
+
+    Each round times ``batch`` back-to-back calls so very fast functions are
+    not dominated by timer resolution; the per-call time is the round's
+    average.
+    """
+    if inspect.iscoroutinefunction(fn):
+        return asyncio.run(_microbench_async(fn, rounds, batch, warmup))
+
+    for _ in range(warmup):
+        fn()
+    samples = []
+    started = time.perf_counter()
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for _ in range(batch):
+            fn()
+        samples.append((time.perf_counter() - t0) / batch)
+    return summarize(samples, (time.perf_counter() - started) / batch)
+
+
+async def _microbench_async(fn, rounds, batch, warmup):
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    started = time.perf_counter()
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for _ in range(batch):
+            await fn()
+        samples.append((time.perf_counter() - t0) / batch)
+    return summarize(samples, (time.perf_counter() - started) / batch)
+
+
+class Pacer:
+    """
+    Hands out request send slots at a fixed rate.
+
+    Latency is measured from the scheduled slot, not from when the request
+    actually went out, so a stalled server shows up as queueing delay in
+    the percentiles instead of silently lowering the offered load.
+    """
+
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps
+        self._next = None
+
+    async def slot(self) -> float:
+        now = time.perf_counter()
+        if self._next is None:
+            self._next = now
+        scheduled = self._next
+        self._next += self.interval
+        if scheduled > now:
+            await asyncio.sleep(scheduled - now)
+        return scheduled
+
+
+class LoadRecorder:
+    """Per-operation latencies collected during a load run."""
+
+    def __init__(self, pacer: Pacer):
+        self.pacer = pacer
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    @asynccontextmanager
+    async def request(self, name: str):
+        """Wait for a send slot, then time the enclosed request."""
+        scheduled = await self.pacer.slot()
+        try:
+            yield
+        except Exception:
+            self.errors[name] += 1
+            raise
+        finally:
+            self.samples[name].append(time.perf_counter() - scheduled)
+
+    def fail(self, name: str):
+        self.errors[name] += 1
+
+
+async def run_load(
+    session: Callable[[LoadRecorder, int], Awaitable[None]],
+    rps: float,
+    users: int,
+    duration: float,
+) -> Dict:
+    """
+    Run ``users`` concurrent virtual users against a shared request rate.
+
+    Each user runs ``session(recorder, user_index)`` repeatedly until
+    ``duration`` seconds have passed.
+
+    Returns:
+        Summary per operation plus an ``all`` entry for the whole run
+    """
+    recorder = LoadRecorder(Pacer(rps))
+    deadline = time.perf_counter() + duration
+
+    async def user(index: int):
+        while time.perf_counter() < deadline:
+            try:
+                await session(recorder, index)
+            except Exception:
+                # Already counted by the recorder; keep the user going
+                pass
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(users)))
+    elapsed = time.perf_counter() - started
+
+    results = {
+        name: summarize(samples, elapsed, recorder.errors[name])
+        for name, samples in recorder.samples.items()
+    }
+    everything = [s for samples in recorder.samples.values() for s in samples]
+    results["all"] = summarize(everything, elapsed, sum(recorder.errors.values()))
+    return results
+
+
+def load_baseline(path: Path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_baseline(path: Path, results: Dict):
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Regressions of ``results`` against ``baseline``.
+
+    A benchmark regresses when its p95 or p99 latency grows, or its
+    throughput drops, by more than ``tolerance`` (0.2 = 20%). Benchmarks
+    missing from either side are ignored.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if previous[metric] and current[metric] > previous[metric] * (
+                1 + tolerance
+            ):
+                regressions.append(
+                    f"{name}: {metric} {previous[metric]:.3f} -> {current[metric]:.3f}"
+                )
+        if previous["throughput"] and current["throughput"] < previous["throughput"] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f"{name}: throughput {previous['throughput']:.1f} -> "
+                f"{current['throughput']:.1f}/s"
+            )
+        if current.get("errors") and not previous.get("errors"):
+            regressions.append(f"{name}: {current['errors']} errors")
+    return regressions
+
+
+def format_table(results: Dict) -> str:
+    """Human-readable results table."""
+    header = (
+        f"{'benchmark':<32} {'count':>7} {'p50 ms':>10} {'p95 ms':>10} "
+        f"{'p99 ms':>10} {'ops/s':>10} {'errors':>6}"
+    )
+    lines = [header, "-" * len(header)]
+    for name in sorted(results):
+        r = results[name]
+        lines.append(
+            f"{name:<32} {r['count']:>7} {r['p50_ms']:>10.3f} {r['p95_ms']:>10.3f} "
+            f"{r['p99_ms']:>10.3f} {r['throughput']:>10.1f} {r['errors']:>6}"
+        )
+    return "\n".join(lines)
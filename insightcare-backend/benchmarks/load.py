@@ -0,0 +1,108 @@
+# benchmarks/load.py
+"""Macro scenario: patients logging in, diagnosing and reading history."""
+
+import random
+import uuid
+import httpx
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app.models.user import User
+from app.utils.login_throttle import login_throttle
+from app.utils.security import get_password_hash
+from benchmarks.harness import LoadRecorder, run_load
+
+PASSWORD = "BenchPass123"
+
+SYMPTOM_POOL = [
+    "fever",
+    "cough",
+    "headache",
+    "fatigue",
+    "sore throat",
+    "runny nose",
+    "nausea",
+    "chest pain",
+    "shortness of breath",
+    "dizziness",
+]
+
+
+def seed_users(count: int) -> list:
+    """
+    Create ``count`` verified users sharing one password hash.
+
+    Emails are unique per run, so the same database can be reused.
+    """
+    Base.metadata.create_all(bind=engine)
+    password_hash = get_password_hash(PASSWORD)
+    run_id = uuid.uuid4().hex[:8]
+    emails = [f"bench-{run_id}-{i}@example.com" for i in range(count)]
+
+    db = SessionLocal()
+    try:
+        db.add_all(
+            User(
+                name=f"Bench User {i}",
+                email=email,
+                password_hash=password_hash,
+                is_active=True,
+                is_verified=True,
+            )
+            for i, email in enumerate(emails)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    # The bloom filter of known emails reloads on the next login
+    login_throttle.reset()
+    return emails
+
+
+async def run_macro(
+    rps: float, users: int, duration: float, iterations: int = 5
+) -> dict:
+    """
+    Each virtual user logs in, then alternates diagnose and history requests
+    ``iterations`` times before logging in again.
+
+    Returns:
+        Summaries keyed ``macro.<operation>``
+    """
+    emails = seed_users(users)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def session(recorder: LoadRecorder, index: int):
+            async with recorder.request("login"):
+                response = await client.post(
+                    "/api/auth/login",
+                    json={"email": emails[index], "password": PASSWORD},
+                )
+            if response.status_code != 200:
+                recorder.fail("login")
+                return
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            for _ in range(iterations):
+                async with recorder.request("diagnose"):
+                    response = await client.post(
+                        "/api/diagnose",
+                        json={"symptoms": random.sample(SYMPTOM_POOL, 3)},
+                        headers=headers,
+                    )
+                if response.status_code != 200:
+                    recorder.fail("diagnose")
+
+                async with recorder.request("history"):
+                    response = await client.get(
+                        "/api/history", params={"limit": 10}, headers=headers
+                    )
+                if response.status_code != 200:
+                    recorder.fail("history")
+
+        results = await run_load(session, rps=rps, users=users, duration=duration)
+
+    return {f"macro.{name}": summary for name, summary in results.items()}
@@ -0,0 +1,112 @@
+# benchmarks/micro.py
+"""Microbenchmarks for the per-request hot paths."""
+
+import uuid
+from datetime import datetime, timezone
+import httpx
+from app.main import app
+from app.api.diagnosis import serialize_history
+from app.models.diagnosis import Diagnosis
+from app.schemas.diagnosis_schema import (
+    DiagnosisHistoryItem,
+    DiagnosisHistoryResponse,
+    DiagnosisOut,
+    DiagnosisRequest,
+)
+from app.utils.serialization import ORJSONResponse
+from app.services.diagnosis_service import mock_ai_diagnosis
+from app.utils.security import create_access_token, verify_token
+from benchmarks.harness import microbench
+
+SYMPTOMS = ["fever", "cough", "headache", "fatigue"]
+
+DIAGNOSIS_PAYLOAD = {
+    "symptoms": ["Fever ", "Cough", "Headache", "Fatigue"],
+    "severity": "Moderate",
+    "duration": "3 days",
+}
+
+
+def _diagnosis_out() -> dict:
+    return {
+        "diagnosis_id": uuid.uuid4(),
+        "timestamp": datetime.now(timezone.utc),
+        "symptoms_analyzed": SYMPTOMS,
+        "predictions": mock_ai_diagnosis(SYMPTOMS),
+    }
+
+
+def _history_page(size: int = 50) -> list:
+    return [
+        Diagnosis(
+            id=uuid.uuid4(),
+            created_at=datetime.now(timezone.utc),
+            symptoms=SYMPTOMS,
+            predictions=mock_ai_diagnosis(SYMPTOMS),
+        )
+        for _ in range(size)
+    ]
+
+
+def _history_validated(diagnoses: list) -> bytes:
+    """History the way it was served before the fast path: models built,
+    re-validated against response_model, then encoded."""
+    results = [
+        DiagnosisHistoryItem(
+            diagnosis_id=d.id,
+            timestamp=d.created_at,
+            symptoms=d.symptoms,
+            top_prediction={
+                "disease": d.predictions[0]["disease"],
+                "confidence": d.predictions[0]["confidence"],
+            },
+        )
+        for d in diagnoses
+    ]
+    response = DiagnosisHistoryResponse(
+        total=len(results), page=1, limit=50, results=results
+    )
+    content = DiagnosisHistoryResponse.model_validate(response.model_dump()).model_dump(
+        mode="json"
+    )
+    return ORJSONResponse(content).body
+
+
+def _history_fast(diagnoses: list) -> bytes:
+    return ORJSONResponse(serialize_history(diagnoses, len(diagnoses), 1, 50)).body
+
+
+def run_micro(rounds: int = 200) -> dict:
+    """
+    Run every microbenchmark.
+
+    Returns:
+        Summaries keyed ``micro.<name>``
+    """
+    token = create_access_token({"sub": str(uuid.uuid4())})
+    response_data = _diagnosis_out()
+    response_model = DiagnosisOut(**response_data)
+    history_page = _history_page()
+
+    # The full middleware stack around a trivial route
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    )
+
+    async def middleware_stack():
+        await client.get("/")
+
+    benchmarks = {
+        "mock_ai_diagnosis": lambda: mock_ai_diagnosis(SYMPTOMS),
+        "verify_token": lambda: verify_token(token),
+        "schema.diagnosis_request": lambda: DiagnosisRequest(**DIAGNOSIS_PAYLOAD),
+        "schema.diagnosis_out_validate": lambda: DiagnosisOut(**response_data),
+        "schema.diagnosis_out_json": response_model.model_dump_json,
+        "history_50.validated": lambda: _history_validated(history_page),
+        "history_50.fast_path": lambda: _history_fast(history_page),
+        "middleware_stack": middleware_stack,
+    }
+    return {
+        f"micro.{name}": microbench(fn, rounds=rounds)
+        for name, fn in benchmarks.items()
+    }
@@ -4,7 +4,11 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.database import Base, get_db
+import app.database as database
+from app.database import Base, SessionLocal, get_db, get_read_db
+from app.middleware.rate_limit import rate_limit_backend
+from app.utils.login_throttle import login_throttle
+from app.services.lifecycle import shutdown_coordinator
 from app.models.user import User
 from app.utils.security import get_password_hash
 import uuid
@@ -40,9 +44,16 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # Streamed responses open their own sessions
+    SessionLocal.configure(bind=engine)
+    rate_limit_backend.reset()
+    login_throttle.reset()
+    shutdown_coordinator.reset()
     test_client = TestClient(app)
     yield test_client
     app.dependency_overrides.clear()
+    SessionLocal.configure(bind=database.engine)
 
 
 @pytest.fixture
@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import status
+from app.models.analytics import SymptomPairCount
+from app.models.diagnosis import Diagnosis
+from app.schemas.diagnosis_schema import DiagnosisRequest
+from app.services.analytics_service import (
+    get_analytics_status,
+    get_disease_trends,
+    get_symptom_cooccurrence,
+    get_symptom_frequency,
+    rebuild_analytics,
+    refresh_analytics,
+)
+from app.services.diagnosis_service import create_diagnosis, mock_ai_diagnosis
+
+
+@pytest.fixture
+def admin_headers(db_session, test_user, auth_headers):
+    test_user.role = "admin"
+    db_session.commit()
+    return auth_headers
+
+
+def _diagnose(db_session, user_id, *symptom_lists):
+    for symptoms in symptom_lists:
+        create_diagnosis(db_session, user_id, DiagnosisRequest(symptoms=symptoms))
+
+
+def _today():
+    return datetime.now(timezone.utc).date()
+
+
+class TestAnalyticsRefresh:
+    """Test cases for refreshing the analytics aggregates."""
+
+    def test_counts(self, db_session, test_user):
+        """Test disease, symptom and pair counts."""
+        _diagnose(
+            db_session,
+            test_user.id,
+            ["fever", "cough"],
+            ["cough", "fever", "headache"],
+            ["nausea", "vomiting"],
+        )
+        assert refresh_analytics(db_session, lag_seconds=0) == 3
+
+        trends = get_disease_trends(db_session, _today(), _today())
+        other = mock_ai_diagnosis(["nausea", "vomiting"])[0]["disease"]
+        assert [(d["disease"], d["total"]) for d in trends["diseases"]] == [
+            ("Common Cold", 2),
+            (other, 1),
+        ]
+        assert trends["diseases"][0]["daily"] == [{"day": _today(), "count": 2}]
+        assert trends["diagnoses_counted"] == 3
+
+        symptoms = get_symptom_frequency(db_session, _today(), _today(), limit=2)
+        assert symptoms["symptoms"] == [
+            {"symptom": "cough", "count": 2},
+            {"symptom": "fever", "count": 2},
+        ]
+
+        pairs = get_symptom_cooccurrence(db_session, "Fever")["pairs"]
+        assert pairs == [
+            {"symptoms": ["cough", "fever"], "count": 2},
+            {"symptoms": ["fever", "headache"], "count": 1},
+        ]
+
+    def test_incremental(self, db_session, test_user):
+        """Test each refresh only counts diagnoses after the watermark."""
+        _diagnose(db_session, test_user.id, ["fever", "cough"])
+        assert refresh_analytics(db_session, lag_seconds=0) == 1
+        assert refresh_analytics(db_session, lag_seconds=0) == 0
+
+        _diagnose(db_session, test_user.id, ["fever", "cough"], ["rash", "fever"])
+        assert refresh_analytics(db_session, batch_size=1, lag_seconds=0) == 2
+
+        pair = db_session.get(SymptomPairCount, ("cough", "fever"))
+        assert pair.count == 2
+        assert get_analytics_status(db_session)["diagnoses_counted"] == 3
+
+    def test_recent_diagnoses_wait(self, db_session, test_user):
+        """Test diagnoses inside the lag are left for a later refresh."""
+        _diagnose(db_session, test_user.id, ["fever", "cough"])
+        assert refresh_analytics(db_session, lag_seconds=60) == 0
+        assert get_analytics_status(db_session)["as_of"] is None
+        assert refresh_analytics(db_session, lag_seconds=0) == 1
+
+    def test_rebuild(self, db_session, test_user):
+        """Test a rebuild drops deleted diagnoses from the counts."""
+        _diagnose(db_session, test_user.id, ["fever", "cough"], ["rash", "itching"])
+        refresh_analytics(db_session, lag_seconds=0)
+        rash = next(
+            d for d in db_session.query(Diagnosis).all() if "rash" in d.symptoms
+        )
+        db_session.delete(rash)
+        db_session.commit()
+
+        assert rebuild_analytics(db_session, lag_seconds=0) == 1
+        assert db_session.get(SymptomPairCount, ("itching", "rash")) is None
+
+
+class TestAnalyticsAPI:
+    """Test cases for the admin analytics endpoints."""
+
+    def test_admin_only(self, client, auth_headers):
+        """Test other users are refused."""
+        response = client.get("/api/admin/analytics/diseases", headers=auth_headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_refresh_and_read(self, client, db_session, test_user, admin_headers):
+        """Test the endpoints serve the refreshed aggregates."""
+        created = datetime.now(timezone.utc) - timedelta(minutes=5)
+        db_session.add(
+            Diagnosis(
+                user_id=test_user.id,
+                symptoms=["fever", "cough"],
+                predictions=[{"disease": "Common Cold", "confidence": 0.85}],
+                created_at=created,
+            )
+        )
+        db_session.commit()
+
+        response = client.post("/api/admin/analytics/refresh", headers=admin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["processed"] == 1
+
+        diseases = client.get(
+            "/api/admin/analytics/diseases", headers=admin_headers
+        ).json()
+        assert diseases["diseases"][0]["disease"] == "Common Cold"
+        assert diseases["as_of"] is not None
+
+        symptoms = client.get(
+            "/api/admin/analytics/symptoms", headers=admin_headers
+        ).json()
+        assert {s["symptom"] for s in symptoms["symptoms"]} == {"fever", "cough"}
+
+        pairs = client.get(
+            "/api/admin/analytics/cooccurrence", headers=admin_headers
+        ).json()
+        assert pairs["pairs"] == [{"symptoms": ["cough", "fever"], "count": 1}]
+
+    def test_window_validated(self, client, admin_headers):
+        """Test reversed and oversized date ranges are refused."""
+        for params in (
+            {"start": "2026-02-01", "end": "2026-01-01"},
+            {"start": "2024-01-01", "end": "2026-01-01"},
+        ):
+            response = client.get(
+                "/api/admin/analytics/symptoms", params=params, headers=admin_headers
+            )
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,40 @@
+from benchmarks.harness import compare, microbench, percentile, summarize
+
+
+class TestBenchmarkHarness:
+    """Test cases for the benchmark statistics and baseline comparison."""
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles."""
+        samples = [i / 1000 for i in range(1, 101)]
+        assert percentile(samples, 50) == 0.05
+        assert percentile(samples, 99) == 0.099
+        assert percentile([], 95) == 0.0
+
+        summary = summarize(samples, elapsed=2.0)
+        assert summary["p95_ms"] == 95.0
+        assert summary["throughput"] == 50.0
+
+    def test_microbench_sync_and_async(self):
+        """Test both kinds of callables are timed."""
+
+        async def noop():
+            pass
+
+        assert microbench(lambda: None, rounds=5, warmup=0)["count"] == 5
+        assert microbench(noop, rounds=5, warmup=0)["count"] == 5
+
+    def test_compare_flags_regressions(self):
+        """Test latency and throughput regressions beyond the tolerance."""
+        baseline = {
+            "a": {"p95_ms": 10.0, "p99_ms": 20.0, "throughput": 100.0},
+            "b": {"p95_ms": 10.0, "p99_ms": 20.0, "throughput": 100.0},
+        }
+        results = {
+            "a": {"p95_ms": 11.0, "p99_ms": 21.0, "throughput": 95.0, "errors": 0},
+            "b": {"p95_ms": 15.0, "p99_ms": 20.0, "throughput": 50.0, "errors": 0},
+            "new": {"p95_ms": 1.0, "p99_ms": 1.0, "throughput": 1.0, "errors": 0},
+        }
+        regressions = compare(results, baseline, tolerance=0.2)
+        assert len(regressions) == 2
+        assert all(line.startswith("b:") for line in regressions)
@@ -0,0 +1,189 @@
+import json
+import pytest
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from app.models.audit_log import AuditLog
+from app.models.patient import Patient
+from app.models.symptom import Symptom
+from app.services.bulk_import import (
+    CSV,
+    NDJSON,
+    PATIENT_IMPORT,
+    RecordParser,
+    detect_format,
+    import_stream,
+)
+
+PATIENTS_CSV = (
+    "name,age,blood_pressure,cholesterol,diagnosis\r\n"
+    "Ana Lima,34,120.5,190,asthma\r\n"
+    '"Ben ""B"" Ortiz",not a number,,,\r\n'
+    '"Chloé\nDupont",51,,,"type 2, diabetes"\r\n'
+    "Dev,,,\r\n"
+    "Eve,29,,,\r\n"
+).encode()
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+class TestRecordParser:
+    """Test cases for the incremental CSV/NDJSON parser."""
+
+    def test_csv_records_across_pieces(self):
+        """Test records split anywhere, quoted newlines and short rows."""
+        parser = RecordParser(CSV)
+        text = PATIENTS_CSV.decode()
+        records = []
+        for start in range(0, len(text), 3):
+            records.extend(parser.feed(text[start : start + 3]))
+        records.extend(parser.close())
+
+        assert [number for number, _, _ in records] == [1, 2, 3, 4, 5]
+        assert records[1][1]["name"] == 'Ben "B" Ortiz'
+        assert records[2][1]["name"] == "Chloé\nDupont"
+        assert records[2][1]["diagnosis"] == "type 2, diabetes"
+        assert records[3][2] == "expected 5 fields, got 4"
+        assert records[4][1]["blood_pressure"] is None
+
+    def test_ndjson(self):
+        """Test NDJSON lines, blank lines and bad lines."""
+        parser = RecordParser(NDJSON)
+        records = parser.feed('{"name": "Ana"}\n\n[1]\n{bad\n{"name": "Ben"}')
+        records += parser.close()
+        assert [(n, r, e is not None) for n, r, e in records] == [
+            (1, {"name": "Ana"}, False),
+            (2, None, True),
+            (3, None, True),
+            (4, {"name": "Ben"}, False),
+        ]
+
+    def test_detect_format(self):
+        """Test formats come from the Content-Type."""
+        assert detect_format("text/csv; charset=utf-8") == CSV
+        assert detect_format("application/x-ndjson") == NDJSON
+        with pytest.raises(HTTPException) as exc:
+            detect_format("application/json")
+        assert exc.value.status_code == 415
+
+
+class TestBulkImport:
+    """Test cases for streaming bulk imports."""
+
+    @pytest.mark.asyncio
+    async def test_import_reports_bad_rows(self, db_session):
+        """Test valid rows are written in chunks and bad rows reported."""
+        report = await import_stream(
+            db_session, _chunks(PATIENTS_CSV, 7), CSV, PATIENT_IMPORT, chunk_size=2
+        )
+        result = report.to_dict()
+        assert (result["total"], result["imported"], result["failed"]) == (5, 3, 2)
+        assert [error["row"] for error in result["errors"]] == [2, 4]
+        assert result["errors"][0]["errors"][0].startswith("age:")
+
+        names = db_session.execute(select(Patient.name).order_by(Patient.id))
+        assert names.scalars().all() == ["Ana Lima", "Chloé\nDupont", "Eve"]
+
+    @pytest.mark.asyncio
+    async def test_error_report_is_capped(self, db_session):
+        """Test every failure is counted but only the first few listed."""
+        body = b"".join(b'{"age": 40}\n' for _ in range(5))
+        report = await import_stream(
+            db_session, _chunks(body, 64), NDJSON, PATIENT_IMPORT, max_errors=2
+        )
+        result = report.to_dict()
+        assert result["failed"] == 5
+        assert len(result["errors"]) == 2
+        assert result["errors_truncated"] is True
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_utf8(self, db_session):
+        """Test undecodable uploads are refused."""
+        with pytest.raises(HTTPException) as exc:
+            await import_stream(
+                db_session, _chunks(b"name\n\xff\xfe\n", 4), CSV, PATIENT_IMPORT
+            )
+        assert exc.value.status_code == 400
+
+
+@pytest.fixture
+def doctor_headers(db_session, test_user, auth_headers):
+    test_user.role = "doctor"
+    db_session.commit()
+    return auth_headers
+
+
+class TestImportAPI:
+    """Test cases for the /api/patient/import and /api/symptoms/import endpoints."""
+
+    def test_import_patients_csv(self, client, db_session, doctor_headers):
+        """Test a CSV upload is imported, reported and audited."""
+        response = client.post(
+            "/api/patient/import",
+            content=PATIENTS_CSV,
+            headers={**doctor_headers, "Content-Type": "text/csv"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert (result["total"], result["imported"], result["failed"]) == (5, 3, 2)
+        assert db_session.query(Patient).count() == 3
+
+        audit = db_session.query(AuditLog).filter_by(event_type="bulk_import").one()
+        assert audit.description == "Imported 3 of 5 patients"
+
+    def test_import_symptoms_ndjson(
+        self, client, db_session, test_user, doctor_headers
+    ):
+        """Test an NDJSON upload rejects unknown patients and records the uploader."""
+        patient = Patient(name="Ana Lima")
+        db_session.add(patient)
+        db_session.commit()
+        body = "\n".join(
+            json.dumps(record)
+            for record in (
+                {"patient_id": patient.id, "text": "fever", "severity": "severe"},
+                {"patient_id": patient.id + 1, "text": "cough"},
+                {"patient_id": patient.id, "text": "headache"},
+            )
+        )
+        response = client.post(
+            "/api/symptoms/import",
+            content=body.encode(),
+            headers={**doctor_headers, "Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert (result["imported"], result["failed"]) == (2, 1)
+        assert [error["row"] for error in result["errors"]] == [2]
+
+        symptoms = db_session.query(Symptom).order_by(Symptom.id).all()
+        assert [s.text for s in symptoms] == ["fever", "headache"]
+        assert {s.reported_by for s in symptoms} == {test_user.id}
+        audit = db_session.query(AuditLog).filter_by(event_type="bulk_import").one()
+        assert audit.user_id == test_user.id
+
+    def test_imports_need_doctor(self, client, auth_headers):
+        """Test patients (the default role) can't import patients or symptoms."""
+        response = client.post(
+            "/api/patient/import",
+            content=PATIENTS_CSV,
+            headers={**auth_headers, "Content-Type": "text/csv"},
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        response = client.post(
+            "/api/symptoms/import",
+            content=b'{"patient_id": 1, "text": "fever"}\n',
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_unsupported_content_type(self, client, doctor_headers):
+        """Test uploads other than CSV or NDJSON are refused."""
+        response = client.post(
+            "/api/patient/import",
+            json=[{"name": "Ana"}],
+            headers=doctor_headers,
+        )
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
@@ -0,0 +1,108 @@
+from fastapi import status
+from app.models.diagnosis import Diagnosis
+from app.models.user import User
+from app.schemas.diagnosis_schema import DiagnosisRequest
+from app.services.diagnosis_service import create_diagnosis, find_diagnoses_by_symptoms
+
+
+def _diagnose(db_session, user_id, *symptom_lists):
+    return [
+        create_diagnosis(db_session, user_id, DiagnosisRequest(symptoms=symptoms)).id
+        for symptoms in symptom_lists
+    ]
+
+
+class TestSymptomCohort:
+    """Test cases for finding diagnoses by their symptoms."""
+
+    def test_all_and_any(self, db_session, test_user):
+        """Test containment needs every symptom, overlap any of them."""
+        both, fever, cough = _diagnose(
+            db_session,
+            test_user.id,
+            ["fever", "cough", "fatigue"],
+            ["fever", "rash"],
+            ["cough"],
+        )
+
+        items, total, _ = find_diagnoses_by_symptoms(
+            db_session, ["Fever ", "COUGH"], "all"
+        )
+        assert total == 1
+        assert [item["diagnosis_id"] for item in items] == [both]
+
+        items, total, _ = find_diagnoses_by_symptoms(
+            db_session, ["fever", "cough"], "any"
+        )
+        assert total == 3
+        assert {item["diagnosis_id"] for item in items} == {both, fever, cough}
+
+        assert find_diagnoses_by_symptoms(db_session, ["fever", "nausea"])[1] == 0
+
+    def test_deleted_diagnoses_leave(self, db_session, test_user):
+        """Test the symptom lookup follows deletes."""
+        (diagnosis_id,) = _diagnose(db_session, test_user.id, ["headache"])
+        db_session.query(Diagnosis).filter(Diagnosis.id == diagnosis_id).delete()
+        db_session.commit()
+        assert find_diagnoses_by_symptoms(db_session, ["headache"])[1] == 0
+
+    def test_pages(self, client, db_session, auth_headers, test_user):
+        """Test keyset pages cover every match once, newest first."""
+        ids = _diagnose(db_session, test_user.id, *(["fever", "cough"],) * 5)
+
+        seen, cursor, totals = [], None, []
+        while True:
+            params = {"symptom": ["fever", "cough"], "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get(
+                "/api/diagnosis/cohort", params=params, headers=auth_headers
+            )
+            assert response.status_code == status.HTTP_200_OK
+            body = response.json()
+            seen += [item["diagnosis_id"] for item in body["items"]]
+            totals.append(body["total"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == [str(i) for i in reversed(ids)]
+        assert totals == [5, None, None]
+
+    def test_scoped_to_user(self, client, db_session, auth_headers):
+        """Test patients only see their own diagnoses."""
+        other = User(name="Other", email="other@example.com", password_hash="x")
+        db_session.add(other)
+        db_session.commit()
+        _diagnose(db_session, other.id, ["rash"])
+
+        response = client.get(
+            "/api/diagnosis/cohort", params={"symptom": "rash"}, headers=auth_headers
+        )
+        assert response.json() == {"total": 0, "items": [], "next_cursor": None}
+
+    def test_validation(self, client, auth_headers):
+        """Test the symptom count, match mode and cursor are checked."""
+        response = client.get("/api/diagnosis/cohort", headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = client.get(
+            "/api/diagnosis/cohort",
+            params={"symptom": "rash", "match": "some"},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        response = client.get(
+            "/api/diagnosis/cohort",
+            params={"symptom": [f"s{n}" for n in range(21)]},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = client.get(
+            "/api/diagnosis/cohort",
+            params={"symptom": "rash", "cursor": "nonsense"},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
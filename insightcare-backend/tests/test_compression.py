@@ -0,0 +1,140 @@
+import gzip
+import pytest
+from fastapi import FastAPI, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from app.middleware.compression import CompressionMiddleware
+from app.utils.compression import (
+    PrecompressedPayload,
+    compress,
+    negotiate_encoding,
+)
+
+BIG_TEXT = "InsightCare " * 500
+
+
+def _mini_app(**options):
+    mini = FastAPI()
+
+    @mini.get("/big")
+    def big():
+        return PlainTextResponse(BIG_TEXT, headers={"ETag": '"abc"'})
+
+    @mini.get("/small")
+    def small():
+        return PlainTextResponse("tiny")
+
+    @mini.get("/binary")
+    def binary():
+        return PlainTextResponse(BIG_TEXT, media_type="application/octet-stream")
+
+    @mini.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (BIG_TEXT[i : i + 100] for i in range(0, len(BIG_TEXT), 100)),
+            media_type="text/plain",
+        )
+
+    mini.add_middleware(CompressionMiddleware, encodings=("gzip",), **options)
+    return TestClient(mini)
+
+
+def _raw_get(client, url, accept="gzip"):
+    """GET without httpx decoding the body."""
+    with client.stream("GET", url, headers={"Accept-Encoding": accept}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestNegotiation:
+    """Test cases for Accept-Encoding negotiation."""
+
+    def test_negotiate_encoding(self):
+        """Test server preference, q-values and wildcards."""
+        available = ("zstd", "br", "gzip")
+        assert negotiate_encoding("gzip, br", available) == "br"
+        assert negotiate_encoding("br;q=0, gzip", available) == "gzip"
+        assert negotiate_encoding("*", available) == "zstd"
+        assert negotiate_encoding("*;q=0, gzip", available) == "gzip"
+        assert negotiate_encoding("identity", available) is None
+        assert negotiate_encoding(None, available) is None
+
+
+class TestCompressionMiddleware:
+    """Test cases for response compression."""
+
+    def test_large_response_compressed(self):
+        """Test large allowlisted bodies are gzipped with a weak ETag."""
+        response, raw = _raw_get(_mini_app(), "/big")
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.headers["ETag"] == 'W/"abc"'
+        assert int(response.headers["Content-Length"]) == len(raw)
+        assert gzip.decompress(raw).decode() == BIG_TEXT
+
+    def test_skipped_responses(self):
+        """Test small, non-allowlisted and identity requests pass through."""
+        client = _mini_app()
+        response, raw = _raw_get(client, "/small")
+        assert "Content-Encoding" not in response.headers
+        assert raw == b"tiny"
+
+        response, _ = _raw_get(client, "/binary")
+        assert "Content-Encoding" not in response.headers
+
+        response, raw = _raw_get(client, "/big", accept="identity")
+        assert "Content-Encoding" not in response.headers
+        assert raw.decode() == BIG_TEXT
+
+    def test_streaming_response(self):
+        """Test streamed bodies are compressed incrementally."""
+        response, raw = _raw_get(_mini_app(), "/stream")
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response.headers
+        assert gzip.decompress(raw).decode() == BIG_TEXT
+
+    def test_diagnosis_compressed_and_revalidates(self, client, auth_headers):
+        """Test a compressed diagnosis still answers If-None-Match with 304."""
+        created = client.post(
+            "/api/diagnose",
+            json={"symptoms": ["fever", "cough", "headache", "nausea"]},
+            headers=auth_headers,
+        ).json()
+        url = f"/api/diagnosis/{created['diagnosis_id']}"
+
+        response = client.get(url, headers=auth_headers)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["ETag"].startswith("W/")
+        assert response.json() == created
+
+        response = client.get(
+            url, headers={**auth_headers, "If-None-Match": response.headers["ETag"]}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+class TestPrecompressedPayload:
+    """Test cases for static payloads compressed once."""
+
+    def test_variants(self):
+        """Test the client gets a precompressed variant it accepts."""
+        payload = PrecompressedPayload(BIG_TEXT.encode(), encodings=("gzip",))
+        response = payload.response("gzip, deflate")
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.body).decode() == BIG_TEXT
+        assert "Content-Encoding" not in payload.response(None).headers
+
+    def test_root_is_served(self, client):
+        """Test the root endpoint still answers."""
+        assert client.get("/").json()["message"] == "InsightCare Backend API"
+
+    @pytest.mark.parametrize(
+        "encoding,module", [("br", "brotli"), ("zstd", "zstandard")]
+    )
+    def test_optional_encodings(self, encoding, module):
+        """Test brotli/zstd round-trip when installed."""
+        library = pytest.importorskip(module)
+        data = compress(BIG_TEXT.encode(), encoding, 3)
+        if encoding == "br":
+            assert library.decompress(data).decode() == BIG_TEXT
+        else:
+            assert library.ZstdDecompressor().decompressobj().decompress(data)
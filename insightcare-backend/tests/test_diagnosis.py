@@ -138,3 +138,86 @@ class TestDiagnosisHistory:
         data2 = response.json()
         assert "results" in data2
         assert data2["page"] == 2
+
+
+class TestDiagnosisSerialization:
+    """Test cases for the unvalidated fast-path responses."""
+
+    def test_matches_response_models(self, client, auth_headers):
+        """Test fast-path JSON is what the response models would produce."""
+        from app.schemas.diagnosis_schema import (
+            DiagnosisHistoryResponse,
+            DiagnosisOut,
+        )
+
+        response = client.post(
+            "/api/diagnosis/analyze",
+            json={"symptoms": ["fever", "cough"]},
+            headers=auth_headers,
+        )
+        body = response.json()
+        assert DiagnosisOut.model_validate(body).model_dump(mode="json") == body
+
+        detail = client.get(
+            f"/api/diagnosis/{body['diagnosis_id']}", headers=auth_headers
+        ).json()
+        assert detail == body
+
+        history = client.get("/api/diagnosis/history", headers=auth_headers).json()
+        assert (
+            DiagnosisHistoryResponse.model_validate(history).model_dump(mode="json")
+            == history
+        )
+
+
+class TestDiagnosisConditionalGet:
+    """Test cases for ETag / If-None-Match on diagnosis reads."""
+
+    def test_detail_not_modified(self, client, auth_headers):
+        """Test a diagnosis revalidates to 304 and is cacheable."""
+        created = client.post(
+            "/api/diagnose", json={"symptoms": ["fever"]}, headers=auth_headers
+        ).json()
+        url = f"/api/diagnosis/{created['diagnosis_id']}"
+
+        response = client.get(url, headers=auth_headers)
+        etag = response.headers["ETag"]
+        assert "immutable" in response.headers["Cache-Control"]
+        assert "private" in response.headers["Cache-Control"]
+
+        response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+        response = client.get(url, headers={**auth_headers, "If-None-Match": '"stale"'})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_detail_not_modified_checks_owner(self, client, auth_headers):
+        """Test a 304 is never given for someone else's diagnosis."""
+        import uuid
+
+        response = client.get(
+            f"/api/diagnosis/{uuid.uuid4()}",
+            headers={**auth_headers, "If-None-Match": "*"},
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_history_changes_etag(self, client, auth_headers):
+        """Test history is 304 until a new diagnosis is added."""
+        client.post("/api/diagnose", json={"symptoms": ["fever"]}, headers=auth_headers)
+        etag = client.get("/api/history", headers=auth_headers).headers["ETag"]
+
+        conditional = {**auth_headers, "If-None-Match": f"W/{etag}"}
+        response = client.get("/api/history", headers=conditional)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        # Another page is another representation
+        response = client.get("/api/history?limit=5", headers=conditional)
+        assert response.status_code == status.HTTP_200_OK
+
+        client.post("/api/diagnose", json={"symptoms": ["cough"]}, headers=auth_headers)
+        response = client.get("/api/history", headers=conditional)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        assert response.json()["total"] == 2
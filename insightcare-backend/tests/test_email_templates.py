@@ -0,0 +1,162 @@
+import email
+from email import policy
+import aiosmtplib
+import pytest
+import app.utils.email as mailer
+from app.utils.email_templates import CompiledTemplate, get_email_template
+
+
+def _parse(raw):
+    return email.message_from_bytes(raw, policy=policy.default)
+
+
+class FakeSMTP:
+    """Records what would have been sent."""
+
+    sent = []
+    extensions = set()
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def supports_extension(self, name):
+        return name in self.extensions
+
+    async def sendmail(self, sender, recipients, message, mail_options=()):
+        self.sent.append((recipients, message, list(mail_options)))
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    FakeSMTP.sent = []
+    monkeypatch.setattr(aiosmtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(mailer, "SMTP_USER", "user")
+    monkeypatch.setattr(mailer, "SMTP_PASSWORD", "secret")
+    return FakeSMTP
+
+
+class TestCompiledTemplate:
+    """Test cases for precompiled template rendering."""
+
+    def test_static_fragments_are_bytes(self):
+        """Test compilation splits static text from slots."""
+        template = CompiledTemplate.compile("a {{ x }} b {{y}} c")
+        assert template.fragments == [b"a ", b" b ", b" c"]
+        assert [name for name, _ in template.slots] == ["x", "y"]
+        assert template.render({"x": 1, "y": "é"}) == "a 1 b é c".encode()
+
+    def test_concatenation_merges_seam(self):
+        """Test joined templates render like one template."""
+        joined = CompiledTemplate.compile("<{{ a }}") + CompiledTemplate.compile(
+            "|{{ b }}>"
+        )
+        assert len(joined.fragments) == 3
+        assert joined.render({"a": "1", "b": "2"}) == b"<1|2>"
+
+    def test_render_many(self):
+        """Test batch rendering."""
+        template = CompiledTemplate.compile("hi {{ name }}")
+        assert template.render_many([{"name": "a"}, {"name": "b"}]) == [
+            b"hi a",
+            b"hi b",
+        ]
+
+
+class TestEmailTemplate:
+    """Test cases for complete email messages."""
+
+    def test_password_reset_message(self):
+        """Test the rendered message is valid multipart MIME."""
+        template = get_email_template(
+            "password_reset", "InsightCare", "noreply@insightcare.test"
+        )
+        link = "http://localhost:3000/reset-password?token=abc&x=1"
+        raw = template.render("user@example.com", {"link": link})
+
+        message = _parse(raw)
+        assert message["To"] == "user@example.com"
+        assert message["Subject"] == "Reset Your InsightCare Password"
+        assert message["Message-ID"].endswith("@insightcare.test>")
+        text = message.get_body(("plain",)).get_content()
+        html = message.get_body(("html",)).get_content()
+        assert link in text
+        assert "token=abc&amp;x=1" in html
+        assert "Password Reset Request" in html
+
+    def test_header_injection_stripped(self):
+        """Test recipients cannot inject extra headers."""
+        template = get_email_template(
+            "verification", "InsightCare", "noreply@insightcare.test"
+        )
+        raw = template.render("a@example.com\r\nBcc: evil@example.com", {"link": "x"})
+        assert b"\r\nBcc:" not in raw
+
+    def test_render_batch(self):
+        """Test batch rendering gives each recipient its own message."""
+        template = get_email_template(
+            "verification", "InsightCare", "noreply@insightcare.test"
+        )
+        messages = template.render_batch(
+            [
+                ("a@example.com", {"link": "link-a"}),
+                ("b@example.com", {"link": "link-b"}),
+            ]
+        )
+        assert [to for to, _ in messages] == ["a@example.com", "b@example.com"]
+        first, second = (_parse(raw) for _, raw in messages)
+        assert "link-a" in first.get_body(("plain",)).get_content()
+        assert "link-b" in second.get_body(("plain",)).get_content()
+        assert first["Message-ID"] != second["Message-ID"]
+        assert template is get_email_template(
+            "verification", "InsightCare", "noreply@insightcare.test"
+        )
+
+    def test_seven_bit_fallback(self):
+        """Test the fallback layout is 7-bit clean with the same content."""
+        template = get_email_template(
+            "password_reset", "InsightCare", "noreply@insightcare.test"
+        )
+        values = {"link": "http://localhost:3000/reset-password?token=abc"}
+        eight = _parse(template.render("user@example.com", values))
+        seven_raw = template.render("user@example.com", values, eight_bit=False)
+        seven = _parse(seven_raw)
+
+        assert max(seven_raw) < 128
+        assert all(len(line) <= 998 for line in seven_raw.split(b"\r\n"))
+        for subtype in ("plain", "html"):
+            part = seven.get_body((subtype,))
+            assert part["Content-Transfer-Encoding"] == "base64"
+            assert part.get_content() == eight.get_body((subtype,)).get_content()
+        assert "\N{COPYRIGHT SIGN}" in seven.get_body(("html",)).get_content()
+
+
+class TestSending:
+    """Test cases for sending over SMTP."""
+
+    @pytest.mark.asyncio
+    async def test_eight_bit_when_supported(self, smtp):
+        """Test 8bit bodies are sent with BODY=8BITMIME."""
+        smtp.extensions = {"8bitmime"}
+        assert await mailer.send_password_reset_email("a@example.com", "tok")
+        [(recipients, message, options)] = smtp.sent
+        assert recipients == ["a@example.com"]
+        assert options == ["BODY=8BITMIME"]
+        assert b"Content-Transfer-Encoding: 8bit" in message
+
+    @pytest.mark.asyncio
+    async def test_base64_without_8bitmime(self, smtp):
+        """Test servers without 8BITMIME get 7-bit messages."""
+        smtp.extensions = set()
+        sent = await mailer.send_verification_emails(
+            {"a@example.com": "tok-a", "b@example.com": "tok-b"}
+        )
+        assert sent == 2
+        for _, message, options in smtp.sent:
+            assert options == []
+            assert max(message) < 128
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import threading
+import orjson
+import pytest
+from fastapi import status
+import app.api.diagnosis as diagnosis_api
+from app.schemas.diagnosis_schema import DiagnosisRequest
+from app.services.diagnosis_service import (
+    create_diagnosis,
+    iter_ai_diagnosis,
+    mock_ai_diagnosis,
+)
+from app.services.events import EventBus, event_bus, publish_after_commit
+from app.services.lifecycle import shutdown_coordinator
+from tests.conftest import TestingSessionLocal
+
+
+def _parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestEventBus:
+    """Test cases for the in-process event bus."""
+
+    @pytest.mark.asyncio
+    async def test_fan_out(self):
+        """Test every subscriber of a channel gets each event, and only theirs."""
+        bus = EventBus()
+        first, second = bus.subscribe("user:1"), bus.subscribe("user:1")
+        other = bus.subscribe("user:2")
+
+        bus.publish("user:1", "history", {"n": 1})
+        for subscription in (first, second):
+            event = await subscription.get(1)
+            assert (event.event, event.json()) == ("history", {"n": 1})
+        assert await other.get(0.01) is None
+
+        first.close()
+        assert bus.subscriber_count("user:1") == 1
+
+    @pytest.mark.asyncio
+    async def test_publish_from_thread(self):
+        """Test events published from worker threads reach the loop."""
+        bus = EventBus()
+        with bus.subscribe("job:1") as subscription:
+            await asyncio.to_thread(bus.publish, "job:1", "status", {"ok": True})
+            assert (await subscription.get(1)).json() == {"ok": True}
+        assert bus.subscriber_count("job:1") == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_drops_oldest(self):
+        """Test a full buffer keeps the newest events."""
+        bus = EventBus(queue_size=2)
+        with bus.subscribe("job:1") as subscription:
+            for n in range(4):
+                bus.publish("job:1", "progress", n)
+            await asyncio.sleep(0)
+            assert [(await subscription.get(1)).json() for _ in range(2)] == [2, 3]
+            assert subscription.dropped == 2
+
+    @pytest.mark.asyncio
+    async def test_bridge_payloads(self):
+        """Test relayed events are delivered unless this process sent them."""
+        bus = EventBus()
+        with bus.subscribe("user:1") as subscription:
+            own = {"o": bus.origin, "c": "user:1", "e": "history", "d": 1}
+            other = {"o": "elsewhere", "c": "user:1", "e": "history", "d": 2}
+            bus._receive(orjson.dumps(own).decode())
+            bus._receive(orjson.dumps(other).decode())
+            assert (await subscription.get(1)).json() == 2
+            assert await subscription.get(0.01) is None
+
+    @pytest.mark.asyncio
+    async def test_publish_after_commit(self, db_session):
+        """Test events wait for the commit and are dropped on rollback."""
+        with event_bus.subscribe("test:commit") as subscription:
+            db_session.connection()  # begin, as a write would
+            publish_after_commit(db_session, "test:commit", "saved", 1)
+            db_session.rollback()
+            db_session.connection()
+            publish_after_commit(db_session, "test:commit", "saved", 2)
+            assert await subscription.get(0.01) is None
+            db_session.commit()
+            assert (await subscription.get(1)).json() == 2
+            assert await subscription.get(0.01) is None
+
+
+class TestDiagnosisProgress:
+    """Test cases for streamed diagnoses and dashboard updates."""
+
+    def test_partial_predictions(self):
+        """Test partial results grow to exactly the final predictions."""
+        symptoms = ["fever", "fatigue", "nausea", "sneezing"]
+        partials = list(iter_ai_diagnosis(symptoms))
+        assert [len(p) for p in partials] == [1, 2, 3, 4, 5]
+        assert partials[-1] == mock_ai_diagnosis(symptoms)
+
+    def test_stream(self, client, auth_headers):
+        """Test the stream reports each stage and saves the diagnosis."""
+        response = client.post(
+            "/api/diagnosis/stream",
+            json={"symptoms": [" Fever", "NAUSEA"]},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        events = _parse_events(response.text)
+        assert [event for event, data in events] == [
+            "accepted",
+            "normalized",
+            "partial",
+            "partial",
+            "partial",
+            "final",
+        ]
+        assert events[1][1]["symptoms"] == ["fever", "nausea"]
+        final = events[-1][1]
+        assert final["predictions"] == events[-2][1]["predictions"]
+
+        saved = client.get(
+            f"/api/diagnosis/{final['diagnosis_id']}", headers=auth_headers
+        )
+        assert saved.json()["predictions"] == final["predictions"]
+
+    def test_stream_validates_first(self, client, auth_headers):
+        """Test invalid requests fail before any event is sent."""
+        response = client.post(
+            "/api/diagnosis/stream", json={"symptoms": []}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_dashboard_events(self, client, auth_headers, test_user, monkeypatch):
+        """Test an open dashboard hears of diagnoses saved elsewhere."""
+        monkeypatch.setattr(diagnosis_api, "EVENTS_HEARTBEAT_SECONDS", 0.02)
+
+        def save_elsewhere():
+            # e.g. a background job worker
+            db = TestingSessionLocal()
+            try:
+                create_diagnosis(
+                    db, test_user.id, DiagnosisRequest(symptoms=["cough", "fever"])
+                )
+            finally:
+                db.close()
+
+        saver = threading.Timer(0.2, save_elsewhere)
+        # The stream ends when the worker starts draining
+        drain = threading.Timer(0.5, shutdown_coordinator.begin_drain)
+        saver.start()
+        drain.start()
+        response = client.get("/api/diagnosis/events", headers=auth_headers)
+        saver.join()
+        drain.join()
+
+        events = _parse_events(response.text)
+        assert len(events) == 1
+        event, entry = events[0]
+        assert event == "history"
+        assert entry["symptoms"] == ["cough", "fever"]
+        assert entry["top_prediction"]["disease"] == "Common Cold"
+
+        history = client.get("/api/history", headers=auth_headers).json()
+        assert [item["diagnosis_id"] for item in history["results"]] == [
+            entry["diagnosis_id"]
+        ]
@@ -0,0 +1,172 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import pytest
+from fastapi import status
+from app.models.diagnosis import Diagnosis
+from app.models.job import Job
+from app.services.export_service import (
+    export_diagnoses,
+    flatten_chunk,
+    iter_export_chunks,
+    load_state,
+)
+
+
+@pytest.fixture
+def admin_headers(db_session, test_user, auth_headers):
+    test_user.role = "admin"
+    db_session.commit()
+    return auth_headers
+
+
+@pytest.fixture
+def history(db_session, test_user):
+    """Diagnoses over two months, oldest first."""
+    start = datetime(2026, 8, 30, 12, tzinfo=timezone.utc)
+    diagnoses = [
+        Diagnosis(
+            user_id=test_user.id,
+            symptoms=["fever", "cough"],
+            predictions=[
+                {"disease": "Common Cold", "confidence": 0.85, "severity": "mild"},
+                {"disease": "Influenza (Flu)", "confidence": 0.6, "severity": "mild"},
+            ],
+            created_at=start + timedelta(days=day),
+        )
+        for day in range(4)
+    ]
+    db_session.add_all(diagnoses)
+    db_session.commit()
+    return diagnoses
+
+
+def _row(created_at, predictions):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        created_at=created_at,
+        severity=None,
+        duration=None,
+        symptoms=["rash"],
+        predictions=predictions,
+    )
+
+
+class TestFlatten:
+    """Test cases for flattening diagnoses into columns."""
+
+    def test_months_and_predictions(self):
+        """Test rows split by month, with one prediction row per prediction."""
+        august = _row(
+            datetime(2026, 8, 31, 23, 59),
+            [{"disease": "Eczema", "confidence": 0.7}, {"disease": "Allergy"}],
+        )
+        september = _row(datetime(2026, 9, 1, tzinfo=timezone.utc), [])
+
+        months = flatten_chunk([august, september])
+        assert sorted(months) == ["2026-08", "2026-09"]
+
+        diagnoses = months["2026-08"]["diagnoses"]
+        assert diagnoses["top_disease"] == ["Eczema"]
+        assert diagnoses["prediction_count"] == [2]
+        assert diagnoses["created_at"][0].tzinfo == timezone.utc
+
+        predictions = months["2026-08"]["predictions"]
+        assert predictions["rank"] == [1, 2]
+        assert predictions["disease"] == ["Eczema", "Allergy"]
+        assert predictions["confidence"] == [0.7, None]
+
+        assert months["2026-09"]["diagnoses"]["top_disease"] == [None]
+        assert not months["2026-09"]["predictions"]
+
+
+class TestExportChunks:
+    """Test cases for reading diagnoses after a high-water mark."""
+
+    def test_chunks_resume_after_mark(self, db_session, history):
+        """Test chunks come oldest first and resume after the mark."""
+        chunks = list(iter_export_chunks(db_session, chunk_size=3, lag_seconds=0))
+        assert [len(chunk) for chunk in chunks] == [3, 1]
+        assert [row.id for chunk in chunks for row in chunk] == [d.id for d in history]
+
+        mark = {
+            "created_at": history[1].created_at.isoformat(),
+            "diagnosis_id": str(history[1].id),
+        }
+        rows = [
+            row
+            for chunk in iter_export_chunks(db_session, mark, lag_seconds=0)
+            for row in chunk
+        ]
+        assert [row.id for row in rows] == [d.id for d in history[2:]]
+
+    def test_recent_diagnoses_wait(self, db_session, test_user):
+        """Test diagnoses inside the lag are left for the next run."""
+        db_session.add(
+            Diagnosis(
+                user_id=test_user.id,
+                symptoms=["fever"],
+                predictions=[],
+                created_at=datetime.now(timezone.utc),
+            )
+        )
+        db_session.commit()
+        assert list(iter_export_chunks(db_session, lag_seconds=60)) == []
+
+
+class TestColumnarExport:
+    """Test cases for writing the export files (needs pyarrow)."""
+
+    @pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+    def test_incremental_export(self, db_session, test_user, history, tmp_path, fmt):
+        """Test partitioned files are written and later runs add only new rows."""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.dataset as ds
+
+        summary = export_diagnoses(db_session, tmp_path, fmt, lag_seconds=0)
+        assert summary["rows"] == 4
+        assert (tmp_path / "diagnoses" / "month=2026-08").is_dir()
+        assert (tmp_path / "predictions" / "month=2026-09").is_dir()
+        assert load_state(tmp_path)["diagnosis_id"] == str(history[-1].id)
+
+        file_format = "parquet" if fmt == "parquet" else "ipc"
+        predictions = ds.dataset(
+            tmp_path / "predictions", format=file_format, partitioning="hive"
+        ).to_table()
+        assert predictions.num_rows == 8
+        assert set(predictions.column("disease").to_pylist()) == {
+            "Common Cold",
+            "Influenza (Flu)",
+        }
+
+        assert export_diagnoses(db_session, tmp_path, fmt, lag_seconds=0)["rows"] == 0
+        db_session.add(
+            Diagnosis(
+                user_id=test_user.id,
+                symptoms=["rash"],
+                predictions=[],
+                created_at=history[-1].created_at + timedelta(days=1),
+            )
+        )
+        db_session.commit()
+        summary = export_diagnoses(db_session, tmp_path, fmt, lag_seconds=0)
+        assert summary["rows"] == 1
+        diagnoses = ds.dataset(
+            tmp_path / "diagnoses", format=file_format, partitioning="hive"
+        ).to_table()
+        assert diagnoses.num_rows == 5
+        assert isinstance(diagnoses.schema, pa.Schema)
+
+
+class TestExportJob:
+    """Test cases for queueing exports."""
+
+    def test_export_job_queued(self, client, db_session, admin_headers):
+        """Test admins can queue an export job."""
+        response = client.post(
+            "/api/admin/analytics/export?format=arrow", headers=admin_headers
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = db_session.get(Job, uuid.UUID(response.json()["job_id"]))
+        assert (job.kind, job.payload) == ("diagnosis_export", {"format": "arrow"})
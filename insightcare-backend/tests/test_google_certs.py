@@ -0,0 +1,133 @@
+import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+from app.services.google_certs import GoogleCertCache, parse_max_age
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+
+
+def _make_key(kid):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, kid)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    cert_pem = cert.public_bytes(serialization.Encoding.PEM).decode()
+    return crypt.RSASigner.from_string(key_pem, key_id=kid), cert_pem
+
+
+def _id_token(signer, **claims):
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": "1234567890",
+        "email": "google.user@example.com",
+        "iat": now,
+        "exp": now + 300,
+    }
+    payload.update(claims)
+    return jwt.encode(signer, payload).decode()
+
+
+@pytest.fixture
+def cert_server():
+    """Local stand-in for Google's certificate endpoint."""
+    state = {"certs": {}, "hits": 0, "max_age": 3600}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["hits"] += 1
+            body = json.dumps(state["certs"]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header(
+                "Cache-Control", f"public, max-age={state['max_age']}, must-revalidate"
+            )
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/certs"
+    yield state
+    server.shutdown()
+
+
+class TestGoogleCertCache:
+    """Test cases for cached Google ID token verification."""
+
+    def test_parse_max_age(self):
+        """Test Cache-Control parsing."""
+        assert parse_max_age("public, max-age=19845, must-revalidate", 300) == 19845
+        assert parse_max_age("no-store", 300) == 0
+        assert parse_max_age(None, 300) == 300
+
+    @pytest.mark.asyncio
+    async def test_certs_fetched_once(self, cert_server):
+        """Test many verifications share one certificate fetch."""
+        signer, cert = _make_key("key-1")
+        cert_server["certs"] = {"key-1": cert}
+        cache = GoogleCertCache(certs_url=cert_server["url"])
+        try:
+            for _ in range(5):
+                idinfo = await cache.verify(_id_token(signer), CLIENT_ID)
+                assert idinfo["email"] == "google.user@example.com"
+            assert cert_server["hits"] == 1
+        finally:
+            cache.close()
+
+    @pytest.mark.asyncio
+    async def test_rotated_key_forces_refresh(self, cert_server):
+        """Test an unknown key id triggers one refresh."""
+        old_signer, old_cert = _make_key("key-1")
+        new_signer, new_cert = _make_key("key-2")
+        cert_server["certs"] = {"key-1": old_cert}
+        cache = GoogleCertCache(certs_url=cert_server["url"], min_forced_refresh=0)
+        try:
+            await cache.verify(_id_token(old_signer), CLIENT_ID)
+            cert_server["certs"] = {"key-1": old_cert, "key-2": new_cert}
+            await cache.verify(_id_token(new_signer), CLIENT_ID)
+            assert cert_server["hits"] == 2
+        finally:
+            cache.close()
+
+    @pytest.mark.asyncio
+    async def test_wrong_issuer_and_audience(self, cert_server):
+        """Test tokens for other issuers or clients are rejected."""
+        signer, cert = _make_key("key-1")
+        cert_server["certs"] = {"key-1": cert}
+        cache = GoogleCertCache(certs_url=cert_server["url"])
+        try:
+            with pytest.raises(ValueError):
+                await cache.verify(_id_token(signer, iss="evil.com"), CLIENT_ID)
+            with pytest.raises(ValueError):
+                await cache.verify(_id_token(signer, aud="other-client"), CLIENT_ID)
+        finally:
+            cache.close()
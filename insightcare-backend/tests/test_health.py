@@ -1,6 +1,10 @@
 # tests/test_health.py
+import asyncio
+import time
 import pytest
 from fastapi import status
+import app.api.health as health_api
+from app.services.health_prober import HealthProber
 
 
 class TestHealthCheck:
@@ -14,3 +18,120 @@ class TestHealthCheck:
         assert data["status"] == "healthy"
         assert "timestamp" in data
         assert "version" in data
+
+
+@pytest.fixture
+def prober():
+    """A prober with a switchable critical check."""
+    state = {"up": True}
+
+    def check():
+        if not state["up"]:
+            raise RuntimeError("connection refused")
+        return {"server": "stub"}
+
+    prober = HealthProber(interval=5, timeout=0.5, stale_after=30)
+    prober.register("database", check)
+    prober.register("smtp", lambda: None, critical=False)
+    return prober, state
+
+
+class TestHealthProber:
+    """Test cases for the background dependency prober."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot(self, prober):
+        """Test readiness follows critical checks only."""
+        prober, state = prober
+        assert prober.snapshot() == {"ready": False, "reason": "starting", "checks": {}}
+
+        await prober.probe_once()
+        snapshot = prober.snapshot()
+        assert snapshot["ready"]
+        assert snapshot["checks"]["database"]["server"] == "stub"
+
+        state["up"] = False
+        prober._checks["database"].next_run = 0
+        await prober.probe_once()
+        snapshot = prober.snapshot()
+        assert not snapshot["ready"]
+        assert snapshot["reason"] == "failing: database"
+        assert snapshot["checks"]["database"]["error"] == "connection refused"
+
+    @pytest.mark.asyncio
+    async def test_interval_and_timeout(self, prober):
+        """Test checks aren't rerun early and hung ones time out."""
+        prober, _ = prober
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(1)
+
+        prober.register("slow", slow)
+        await prober.probe_once()
+        await prober.probe_once()
+        assert len(calls) == 1
+        assert "timed out" in prober.snapshot()["checks"]["slow"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_hung_check_not_restarted(self, prober):
+        """Test a timed-out run is waited on, not run again alongside."""
+        prober, _ = prober
+        calls = []
+        release = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def hung():
+            calls.append(1)
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+            return {"answered": True}
+
+        prober.register("hung", hung, interval=0.01)
+        for _ in range(3):
+            await prober.probe_once()
+            assert prober.check_status("hung") == "down"
+        assert len(calls) == 1
+
+        release.set()
+        await asyncio.sleep(0.05)
+        await prober.probe_once()
+        assert prober.snapshot()["checks"]["hung"]["answered"]
+        await asyncio.sleep(0.05)
+        await prober.probe_once()
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot(self, prober):
+        """Test an old snapshot is not ready even if it was healthy."""
+        prober, _ = prober
+        await prober.probe_once()
+        prober._checked_at -= 60
+        snapshot = prober.snapshot()
+        assert not snapshot["ready"]
+        assert snapshot["reason"] == "stale"
+
+
+class TestProbeEndpoints:
+    """Test cases for /livez and /readyz."""
+
+    def test_livez(self, client):
+        """Test liveness answers without rate limit headers."""
+        response = client.get("/livez")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"status": "alive"}
+        assert "X-RateLimit-Remaining" not in response.headers
+
+    def test_readyz(self, client, prober, monkeypatch):
+        """Test readiness is served from the snapshot."""
+        prober, state = prober
+        monkeypatch.setattr(health_api, "health_prober", prober)
+
+        response = client.get("/readyz")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+        asyncio.run(prober.probe_once())
+        response = client.get("/readyz")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "ready"
+        assert client.get("/api/health").json()["database"] == "connected"
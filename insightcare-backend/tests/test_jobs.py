@@ -0,0 +1,259 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import status
+from app.models.job import Job
+from app.models.user import User
+import app.api.jobs as jobs_api
+from app.services.job_queue import (
+    JOB_HANDLERS,
+    JobWorker,
+    claim_jobs,
+    enqueue_job,
+    heartbeat_jobs,
+    job_handler,
+    requeue_stale_jobs,
+    run_next_job,
+)
+from tests.conftest import TestingSessionLocal
+
+SYMPTOMS = {"symptoms": ["fever", "cough"], "severity": "mild"}
+
+
+@pytest.fixture
+def flaky_handler():
+    """A job kind that fails until told otherwise."""
+    state = {"fail": True, "runs": 0}
+
+    @job_handler("test_flaky")
+    def run(db, job):
+        state["runs"] += 1
+        if state["fail"]:
+            raise RuntimeError("model server unavailable")
+        return {"ok": True}
+
+    yield state
+    JOB_HANDLERS.pop("test_flaky")
+
+
+def _stop_heartbeat(db, job_id):
+    """Age a running job's heartbeat, as if its worker had died."""
+    db.expire_all()
+    db.get(Job, job_id).heartbeat_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+    db.commit()
+
+
+def _parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestJobQueue:
+    """Test cases for the database-backed job queue."""
+
+    def test_claims_are_exclusive(self, db_session, flaky_handler):
+        """Test each job is claimed once, oldest first."""
+        jobs = [enqueue_job(db_session, "test_flaky", {"n": n}) for n in range(3)]
+
+        first = claim_jobs(db_session, "worker-a", limit=2)
+        second = claim_jobs(db_session, "worker-b", limit=2)
+        assert {job.id for job in first} == {jobs[0].id, jobs[1].id}
+        assert [job.id for job in second] == [jobs[2].id]
+        assert claim_jobs(db_session, "worker-a") == []
+        assert {job.locked_by for job in first} == {"worker-a"}
+        assert all(job.status == "running" and job.attempts == 1 for job in first)
+
+    def test_retry_then_fail(self, db_session, flaky_handler):
+        """Test failures are retried with backoff, then marked failed."""
+        job = enqueue_job(db_session, "test_flaky", {}, max_attempts=2)
+
+        retried = run_next_job(TestingSessionLocal)
+        assert retried.status == "queued"
+        assert "model server unavailable" in retried.error
+        # Not due until the backoff has passed
+        assert run_next_job(TestingSessionLocal) is None
+
+        db_session.expire_all()
+        db_session.get(Job, job.id).run_at = datetime.now(timezone.utc)
+        db_session.commit()
+        failed = run_next_job(TestingSessionLocal)
+        assert failed.status == "failed"
+        assert failed.attempts == 2
+        assert flaky_handler["runs"] == 2
+
+    def test_stale_jobs_requeued(self, db_session, flaky_handler):
+        """Test jobs orphaned by a dead worker go back to the queue."""
+        job = enqueue_job(db_session, "test_flaky", {})
+        claim_jobs(db_session, "dead-worker")
+        assert requeue_stale_jobs(db_session, timeout=60) == 0
+
+        _stop_heartbeat(db_session, job.id)
+        assert requeue_stale_jobs(db_session, timeout=60) == 1
+        db_session.expire_all()
+        assert db_session.get(Job, job.id).status == "queued"
+
+    def test_stale_jobs_out_of_attempts_fail(self, db_session, flaky_handler):
+        """Test a job that keeps losing its worker isn't retried forever."""
+        job = enqueue_job(db_session, "test_flaky", {}, max_attempts=2)
+        for _ in range(2):
+            assert claim_jobs(db_session, "dying-worker")
+            _stop_heartbeat(db_session, job.id)
+            assert requeue_stale_jobs(db_session, timeout=60) == 1
+
+        db_session.expire_all()
+        job = db_session.get(Job, job.id)
+        assert job.status == "failed"
+        assert "no heartbeat" in job.error
+        assert claim_jobs(db_session, "worker-a") == []
+
+    def test_heartbeat_keeps_claim(self, db_session, flaky_handler):
+        """Test heartbeats extend only the claiming worker's jobs."""
+        job = enqueue_job(db_session, "test_flaky", {})
+        claim_jobs(db_session, "worker-a")
+        _stop_heartbeat(db_session, job.id)
+
+        assert heartbeat_jobs(db_session, "worker-b", [job.id]) == 0
+        assert heartbeat_jobs(db_session, "worker-a", [job.id]) == 1
+        assert requeue_stale_jobs(db_session, timeout=60) == 0
+
+    def test_lost_claim_discards_outcome(self, db_session):
+        """Test a run that lost its job records nothing, not even its writes."""
+
+        @job_handler("test_overrun")
+        def run(db, job):
+            # Meanwhile the sweep requeued the job and another worker took it
+            other = TestingSessionLocal()
+            try:
+                _stop_heartbeat(other, job.id)
+                requeue_stale_jobs(other, timeout=60)
+                claim_jobs(other, "worker-b")
+            finally:
+                other.close()
+            db.add(User(name="Side", email="side@example.com", password_hash="x"))
+            return {"by": "worker-a"}
+
+        try:
+            job = enqueue_job(db_session, "test_overrun", {})
+            lost = run_next_job(TestingSessionLocal, "worker-a")
+        finally:
+            JOB_HANDLERS.pop("test_overrun")
+
+        assert lost.id == job.id
+        assert (lost.status, lost.locked_by, lost.attempts) == (
+            "running",
+            "worker-b",
+            2,
+        )
+        assert lost.result is None
+        assert db_session.query(User).filter_by(email="side@example.com").count() == 0
+
+    def test_unknown_kind_rejected(self, db_session):
+        """Test jobs can only be queued for registered handlers."""
+        with pytest.raises(ValueError):
+            enqueue_job(db_session, "no_such_kind", {})
+
+    @pytest.mark.asyncio
+    async def test_worker_runs_and_drains(self, db_session, flaky_handler):
+        """Test a worker is woken by enqueue and drains on shutdown."""
+        flaky_handler["fail"] = False
+        worker = JobWorker(TestingSessionLocal, concurrency=2, poll_interval=30)
+        task = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.05)
+
+        job = enqueue_job(db_session, "test_flaky", {})
+        for _ in range(100):
+            db_session.expire_all()
+            if db_session.get(Job, job.id).status == "succeeded":
+                break
+            await asyncio.sleep(0.02)
+        assert db_session.get(Job, job.id).result == {"ok": True}
+
+        assert await worker.drain(1) == 0
+        await asyncio.wait_for(task, 1)
+
+    @pytest.mark.asyncio
+    async def test_worker_heartbeats_long_jobs(self, db_session):
+        """Test a long-running job's heartbeat advances while it runs."""
+        release = threading.Event()
+
+        @job_handler("test_long")
+        def run(db, job):
+            release.wait(5)
+            return {}
+
+        worker = JobWorker(
+            TestingSessionLocal, poll_interval=30, heartbeat_interval=0.05
+        )
+        task = asyncio.create_task(worker.run())
+        try:
+            job = enqueue_job(db_session, "test_long", {})
+            await asyncio.sleep(0.3)
+            db_session.expire_all()
+            running = db_session.get(Job, job.id)
+            assert running.status == "running"
+            assert running.heartbeat_at > running.started_at
+        finally:
+            release.set()
+            await worker.drain(1)
+            await asyncio.wait_for(task, 1)
+            JOB_HANDLERS.pop("test_long")
+
+
+class TestDiagnosisJobs:
+    """Test cases for queued diagnoses and job status endpoints."""
+
+    def test_enqueue_and_poll(self, client, auth_headers):
+        """Test a queued diagnosis runs on a worker and is visible to its owner."""
+        response = client.post(
+            "/api/diagnosis/jobs", json=SYMPTOMS, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = response.json()
+        assert job["status"] == "queued"
+        assert response.headers["Location"] == f"/api/jobs/{job['job_id']}"
+
+        finished = run_next_job(TestingSessionLocal)
+        assert finished.status == "succeeded"
+
+        polled = client.get(response.headers["Location"], headers=auth_headers).json()
+        assert polled["status"] == "succeeded"
+        diagnosis = client.get(
+            f"/api/diagnosis/{polled['result']['diagnosis_id']}", headers=auth_headers
+        ).json()
+        assert diagnosis["symptoms_analyzed"] == ["fever", "cough"]
+
+    def test_other_users_job_hidden(self, client, db_session, auth_headers):
+        """Test job ids aren't readable by other users."""
+        job = Job(kind="diagnosis", status="queued", payload={}, attempts=0)
+        db_session.add(job)
+        db_session.commit()
+        response = client.get(f"/api/jobs/{job.id}", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_event_stream(self, client, auth_headers, monkeypatch):
+        """Test the SSE stream reports each status change and then closes."""
+        monkeypatch.setattr(jobs_api, "JOB_EVENTS_POLL_SECONDS", 0.01)
+        job = client.post(
+            "/api/diagnosis/jobs", json=SYMPTOMS, headers=auth_headers
+        ).json()
+
+        # A worker finishes the job while the stream is open
+        worker = threading.Timer(0.2, run_next_job, args=(TestingSessionLocal,))
+        worker.start()
+        response = client.get(f"/api/jobs/{job['job_id']}/events", headers=auth_headers)
+        worker.join()
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _parse_events(response.text)
+        statuses = [data["status"] for event, data in events if event == "status"]
+        assert statuses[0] == "queued"
+        assert statuses[-1] == "succeeded"
+        # The diagnosis handler reports its progress in between
+        stages = [data["stage"] for event, data in events if event == "progress"]
+        assert stages == ["normalized", "partial"]
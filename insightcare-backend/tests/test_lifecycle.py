@@ -0,0 +1,144 @@
+import asyncio
+import signal
+import time
+import pytest
+import uvicorn
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from app.main import app
+from app.middleware.drain import DrainMiddleware
+from app.server import GracefulServer
+from app.services.lifecycle import ShutdownCoordinator, shutdown_coordinator
+
+
+class FakeEngine:
+    disposed = False
+
+    def dispose(self):
+        self.disposed = True
+
+
+@pytest.fixture
+def coordinator():
+    return ShutdownCoordinator(drain_timeout=0.5)
+
+
+@pytest.fixture
+def global_coordinator():
+    """The app's coordinator, reset afterwards."""
+    yield shutdown_coordinator
+    shutdown_coordinator.reset()
+
+
+class TestShutdownCoordinator:
+    """Test cases for draining requests and queues at shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_drains_in_order(self, coordinator):
+        """Test requests finish before queues drain, then tasks and the pool go."""
+        events = []
+
+        async def drain_audit(timeout):
+            events.append(("audit", coordinator.in_flight))
+            return 0
+
+        async def finish_request():
+            await asyncio.sleep(0.1)
+            coordinator.in_flight -= 1
+
+        coordinator.register_queue("audit", drain_audit)
+        coordinator.add_task("sweeper", asyncio.create_task(asyncio.sleep(60)))
+        coordinator.in_flight = 1
+        finishing = asyncio.create_task(finish_request())
+        engine = FakeEngine()
+
+        report = await coordinator.shutdown(engine)
+        await finishing
+
+        assert events == [("audit", 0)]
+        assert engine.disposed
+        assert coordinator._tasks["sweeper"].cancelled()
+        assert report["requests_unfinished"] == 0
+        assert report["queues_dropped"] == {"audit": 0}
+
+    @pytest.mark.asyncio
+    async def test_reports_dropped_work(self, coordinator):
+        """Test stuck requests and queues are cut off at the deadline and reported."""
+
+        async def drain_email(timeout):
+            await asyncio.sleep(10)
+
+        async def drain_audit(timeout):
+            return 3
+
+        coordinator.register_queue("email", drain_email)
+        coordinator.register_queue("audit", drain_audit)
+        coordinator.in_flight = 2
+
+        start = time.monotonic()
+        report = await coordinator.shutdown()
+        assert time.monotonic() - start < 3
+        assert report["requests_unfinished"] == 2
+        assert report["queues_dropped"] == {"email": "timed out", "audit": 3}
+
+
+class TestDrainMiddleware:
+    """Test cases for refusing new work while shutting down."""
+
+    def test_closing_rejects_new_requests(self, coordinator):
+        """Test a closing worker answers 503 + Connection: close, probes still pass."""
+        mini = FastAPI()
+
+        @mini.get("/work")
+        def work():
+            return {"in_flight": coordinator.in_flight}
+
+        @mini.get("/livez")
+        def livez():
+            return {"status": "alive"}
+
+        mini.add_middleware(DrainMiddleware, coordinator=coordinator)
+        client = TestClient(mini)
+
+        assert client.get("/work").json() == {"in_flight": 1}
+        assert coordinator.in_flight == 0
+
+        coordinator.close()
+        response = client.get("/work")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Connection"] == "close"
+        assert response.headers["Retry-After"] == "1"
+        assert coordinator.rejected == 1
+        assert client.get("/livez").status_code == status.HTTP_200_OK
+
+    def test_readiness_fails_while_draining(self, client, global_coordinator):
+        """Test /readyz reports draining as soon as the drain begins."""
+        global_coordinator.begin_drain()
+        response = client.get("/readyz")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["reason"] == "draining"
+        assert client.get("/api/health").status_code == status.HTTP_200_OK
+
+
+class TestGracefulServer:
+    """Test cases for the SIGTERM grace period."""
+
+    @pytest.mark.asyncio
+    async def test_sigterm_waits_for_grace(self, global_coordinator):
+        """Test SIGTERM fails readiness first and stops the server after the grace."""
+        server = GracefulServer(uvicorn.Config(app), grace=0.05)
+        server.handle_exit(signal.SIGTERM, None)
+        assert global_coordinator.draining
+        assert not server.should_exit
+
+        await asyncio.sleep(0.1)
+        assert server.should_exit
+        assert global_coordinator.closing
+
+    def test_lifespan_shutdown_report(self, db_session, global_coordinator):
+        """Test the app's lifespan drains and records a shutdown report."""
+        with TestClient(app) as client:
+            assert client.get("/livez").status_code == status.HTTP_200_OK
+        report = app.state.shutdown_report
+        assert report["requests_unfinished"] == 0
+        assert report["requests_cancelled"] == 0
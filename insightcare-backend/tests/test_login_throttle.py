@@ -0,0 +1,148 @@
+import uuid
+from datetime import timedelta
+import pytest
+from fastapi import status
+from app.models.audit_log import AuditLog
+from app.models.user import User
+from app.utils.login_throttle import LoginThrottle, MemoryThrottleStore
+
+
+@pytest.fixture
+def throttle():
+    return LoginThrottle(
+        store=MemoryThrottleStore(bits=8192),
+        window=60,
+        max_per_email=3,
+        max_per_ip=5,
+        bloom_capacity=500,
+        bloom_error_rate=0.01,
+    )
+
+
+def _add_user(db_session, email, created_at):
+    db_session.add(
+        User(
+            id=uuid.uuid4(),
+            name="Elsewhere",
+            email=email,
+            password_hash="x",
+            created_at=created_at,
+        )
+    )
+    db_session.commit()
+
+
+class TestLoginThrottle:
+    """Test cases for the sliding-window login throttle."""
+
+    @pytest.mark.asyncio
+    async def test_email_limit(self, throttle):
+        """Test an email is refused after too many failures."""
+        for _ in range(3):
+            assert await throttle.check("a@example.com", "1.1.1.1") is None
+            await throttle.record_failure("a@example.com", "1.1.1.1")
+        assert await throttle.check("a@example.com", "2.2.2.2") > 0
+        assert await throttle.check("b@example.com", "2.2.2.2") is None
+
+    @pytest.mark.asyncio
+    async def test_ip_limit_signals_stuffing_once(self, throttle):
+        """Test many emails from one IP trip the IP limit."""
+        signals = [
+            await throttle.record_failure(f"user{i}@example.com", "6.6.6.6")
+            for i in range(5)
+        ]
+        assert signals == [False, False, False, False, True]
+        assert await throttle.check("fresh@example.com", "6.6.6.6") > 0
+
+    @pytest.mark.asyncio
+    async def test_success_resets_email(self, throttle):
+        """Test a successful login clears the email counter."""
+        for _ in range(3):
+            await throttle.record_failure("a@example.com", "1.1.1.1")
+        await throttle.record_success("a@example.com")
+        assert await throttle.check("a@example.com", "3.3.3.3") is None
+
+    @pytest.mark.asyncio
+    async def test_bloom_filter(self, throttle, db_session, test_user):
+        """Test the filter is loaded from users and extended on registration."""
+        assert await throttle.might_exist(db_session, test_user.email)
+        assert not await throttle.might_exist(db_session, "nobody@example.com")
+        await throttle.add_email("new@example.com")
+        assert await throttle.might_exist(db_session, "new@example.com")
+
+    @pytest.mark.asyncio
+    async def test_other_workers_registrations(
+        self, throttle, db_session, test_user, monkeypatch
+    ):
+        """Test misses are trusted, with the filter topped up once per interval."""
+        assert await throttle.might_exist(db_session, test_user.email)
+        _add_user(db_session, "elsewhere@example.com", test_user.created_at)
+        queries = []
+        monkeypatch.setattr(
+            throttle, "_load_emails", lambda *args: queries.append(args) or []
+        )
+        for _ in range(3):
+            assert not await throttle.might_exist(db_session, "nobody@example.com")
+        assert not await throttle.might_exist(db_session, "elsewhere@example.com")
+        assert queries == []
+
+        monkeypatch.undo()
+        throttle._last_refresh -= throttle.refresh_interval
+        assert await throttle.might_exist(db_session, "elsewhere@example.com")
+
+    @pytest.mark.asyncio
+    async def test_refresh_overlaps(self, db_session, test_user):
+        """Test refreshes pick up users committed with an older created_at."""
+        throttle = LoginThrottle(
+            store=MemoryThrottleStore(bits=8192),
+            bloom_capacity=500,
+            bloom_error_rate=0.01,
+            refresh_interval=0,
+        )
+        assert await throttle.might_exist(db_session, test_user.email)
+        late = test_user.created_at - timedelta(seconds=30)
+        _add_user(db_session, "late@example.com", late)
+        assert await throttle.might_exist(db_session, "late@example.com")
+
+
+class TestLoginEndpointThrottling:
+    """Test cases for throttling on /api/auth/login."""
+
+    def test_lockout_after_failures(self, client, test_user):
+        """Test the correct password is refused once the email is locked out."""
+        for _ in range(5):
+            response = client.post(
+                "/api/auth/login",
+                json={"email": test_user.email, "password": "Wrong123!"},
+            )
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = client.post(
+            "/api/auth/login", json={"email": test_user.email, "password": "Test123!"}
+        )
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert "Retry-After" in response.headers
+
+    def test_unknown_email_skips_audit_row(self, client, db_session):
+        """Test unknown emails are rejected without a DB audit write."""
+        response = client.post(
+            "/api/auth/login",
+            json={"email": "ghost@example.com", "password": "Password123!"},
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert db_session.query(AuditLog).count() == 0
+
+    def test_registered_user_can_login(self, client, test_user):
+        """Test an account registered after the filter loaded can log in."""
+        client.post(
+            "/api/auth/login", json={"email": test_user.email, "password": "Test123!"}
+        )
+        client.post(
+            "/api/auth/register",
+            json={"name": "Late", "email": "late@example.com", "password": "Late1234"},
+        )
+        response = client.post(
+            "/api/auth/login",
+            json={"email": "late@example.com", "password": "Late1234"},
+        )
+        assert response.status_code == status.HTTP_200_OK
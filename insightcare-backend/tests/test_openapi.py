@@ -0,0 +1,46 @@
+import gzip
+import orjson
+import pytest
+import app.openapi as openapi_module
+from app.main import app
+
+
+@pytest.fixture
+def fresh_schema():
+    """Drop the cached schema before and after the test."""
+    app.state.openapi_payload = None
+    yield
+    app.state.openapi_payload = None
+
+
+class TestOpenAPI:
+    """Test cases for the cached OpenAPI schema and docs routes."""
+
+    def test_schema_served_precompressed(self, client, fresh_schema):
+        """Test the schema is generated once and sent precompressed."""
+        with client.stream(
+            "GET", "/openapi.json", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            raw = b"".join(response.iter_raw())
+        assert response.headers["Content-Encoding"] == "gzip"
+        schema = orjson.loads(gzip.decompress(raw))
+        assert "/api/diagnosis/analyze" in schema["paths"]
+        assert "/openapi.json" not in schema["paths"]
+
+        payload = app.state.openapi_payload
+        client.get("/openapi.json")
+        assert app.state.openapi_payload is payload
+
+    def test_schema_from_build_file(self, client, fresh_schema, tmp_path, monkeypatch):
+        """Test a schema written at build time is served as-is."""
+        path = tmp_path / "openapi.json"
+        openapi_module.main(["--output", str(path)])
+        monkeypatch.setattr(openapi_module, "OPENAPI_SCHEMA_FILE", str(path))
+
+        response = client.get("/openapi.json")
+        assert response.content == path.read_bytes()
+
+    def test_docs_routes(self, client):
+        """Test the docs UIs are mounted outside production."""
+        assert client.get("/docs").status_code == 200
+        assert client.get("/redoc").status_code == 200
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException, status
+from app.models.patient import Patient
+from app.services.patient_service import list_patient_page
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def patients(db_session):
+    """25 patients: ages 20-44, alternating diagnoses, a day apart."""
+    start = datetime(2026, 1, 1)
+    rows = [
+        Patient(
+            name=f"Patient {n}",
+            age=20 + n,
+            diagnosis="asthma" if n % 2 else "diabetes",
+            created_at=start + timedelta(days=n),
+        )
+        for n in range(25)
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+class TestPatientListing:
+    """Test cases for keyset-paginated patient listing."""
+
+    def test_pages_cover_all_newest_first(self, db_session, patients):
+        """Test following cursors visits every patient once, newest first."""
+        seen, cursor = [], None
+        while True:
+            items, cursor = list_patient_page(db_session, limit=10, cursor=cursor)
+            seen.extend(item["id"] for item in items)
+            if cursor is None:
+                break
+        assert seen == [p.id for p in reversed(patients)]
+
+    def test_projection(self, db_session, patients):
+        """Test only PatientResponse fields are returned."""
+        items, _ = list_patient_page(db_session, limit=1)
+        assert set(items[0]) == {
+            "id",
+            "name",
+            "age",
+            "blood_pressure",
+            "cholesterol",
+            "diagnosis",
+        }
+
+    def test_filters(self, db_session, patients):
+        """Test age, diagnosis and creation time filters combine."""
+        items, cursor = list_patient_page(
+            db_session,
+            min_age=25,
+            max_age=35,
+            diagnosis="asthma",
+            created_after=datetime(2026, 1, 8),
+        )
+        assert [item["age"] for item in items] == [35, 33, 31, 29, 27]
+        assert cursor is None
+
+        items, _ = list_patient_page(
+            db_session, created_before=datetime(2026, 1, 3), limit=50
+        )
+        assert [item["age"] for item in items] == [21, 20]
+
+    def test_cursor_round_trip(self):
+        """Test cursors are opaque and validated."""
+        assert decode_cursor(encode_cursor(42), 1) == [42]
+        for bad in ("not a cursor", encode_cursor(1, 2)):
+            with pytest.raises(HTTPException) as exc:
+                decode_cursor(bad, 1)
+            assert exc.value.status_code == 400
+
+    def test_cursor_id_must_be_int(self, db_session, patients):
+        """Test a well-formed cursor with a non-integer id is refused."""
+        for bad in ("a", 1.5, True, None):
+            with pytest.raises(HTTPException) as exc:
+                list_patient_page(db_session, cursor=encode_cursor(bad))
+            assert exc.value.status_code == 400
+
+
+@pytest.fixture
+def doctor_headers(db_session, test_user, auth_headers):
+    test_user.role = "doctor"
+    db_session.commit()
+    return auth_headers
+
+
+class TestPatientAPI:
+    """Test cases for the /api/patient endpoints."""
+
+    def test_list_pages(self, client, doctor_headers, patients):
+        """Test the listing pages through every patient over HTTP."""
+        seen, params = [], {"limit": 10, "diagnosis": "asthma"}
+        while True:
+            response = client.get(
+                "/api/patient/", params=params, headers=doctor_headers
+            )
+            assert response.status_code == status.HTTP_200_OK
+            page = response.json()
+            seen.extend(item["age"] for item in page["items"])
+            if page["next_cursor"] is None:
+                break
+            params["cursor"] = page["next_cursor"]
+        assert seen == list(range(43, 20, -2))
+
+    def test_requires_auth(self, client, patients):
+        """Test anonymous requests are refused."""
+        response = client.get("/api/patient/")
+        assert response.status_code in (
+            status.HTTP_401_UNAUTHORIZED,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    def test_patients_cant_read_records(self, client, auth_headers, patients):
+        """Test patients (the default role) can't list or fetch records."""
+        response = client.get("/api/patient/", headers=auth_headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        response = client.get(f"/api/patient/{patients[0].id}", headers=auth_headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_bad_cursor(self, client, doctor_headers):
+        """Test malformed cursors are a 400."""
+        response = client.get(
+            "/api/patient/", params={"cursor": "junk"}, headers=doctor_headers
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_create_and_get(self, client, doctor_headers):
+        """Test doctors create patients that can then be fetched."""
+        response = client.post(
+            "/api/patient/",
+            json={"name": "Ana Lima", "age": 34, "diagnosis": "asthma"},
+            headers=doctor_headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        created = response.json()
+
+        response = client.get(f"/api/patient/{created['id']}", headers=doctor_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["name"] == "Ana Lima"
+
+        response = client.get("/api/patient/999999", headers=doctor_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_create_needs_doctor(self, client, auth_headers):
+        """Test patients (the default role) can't create records."""
+        response = client.post(
+            "/api/patient/", json={"name": "Ana"}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,119 @@
+import time
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+import app.api.profiling as profiling_api
+from app.middleware.logging import LoggingMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.utils.profiler import (
+    ProfileStore,
+    SamplingProfiler,
+    sign_profile_token,
+    verify_profile_token,
+)
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture
+def profiling_enabled(monkeypatch):
+    monkeypatch.setattr(profiling_api, "PROFILING_ENABLED", True)
+
+
+@pytest.fixture
+def admin_headers(db_session, test_user, auth_headers):
+    test_user.role = "admin"
+    db_session.commit()
+    return auth_headers
+
+
+class TestSamplingProfiler:
+    """Test cases for the sampling profiler and its output formats."""
+
+    def test_collapsed_and_speedscope(self):
+        """Test samples land in both output formats."""
+        profiler = SamplingProfiler(interval=0.001).start()
+        busy_wait(0.1)
+        profiler.stop()
+
+        assert profiler.samples > 0
+        collapsed = profiler.collapsed()
+        assert "busy_wait (tests/test_profiling.py:" in collapsed
+        stack, count = collapsed.splitlines()[0].rsplit(" ", 1)
+        assert int(count) > 0
+
+        speedscope = profiler.speedscope("test")
+        names = {frame["name"] for frame in speedscope["shared"]["frames"]}
+        assert "busy_wait" in names
+        assert speedscope["profiles"][0]["type"] == "sampled"
+
+    def test_profile_token(self):
+        """Test signed header values expire and can't be forged."""
+        token = sign_profile_token(int(time.time()) + 60)
+        assert verify_profile_token(token)
+        tampered = token[:-1] + ("1" if token.endswith("0") else "0")
+        assert not verify_profile_token(tampered)
+        assert not verify_profile_token(sign_profile_token(int(time.time()) - 1))
+        assert not verify_profile_token("garbage")
+
+
+class TestProfilingMiddleware:
+    """Test cases for per-request profiling."""
+
+    def test_signed_request_is_profiled(self):
+        """Test only requests with a valid header are profiled, by request ID."""
+        mini = FastAPI()
+
+        @mini.get("/slow")
+        def slow():
+            busy_wait(0.05)
+            return {"ok": True}
+
+        store = ProfileStore()
+        mini.add_middleware(LoggingMiddleware)
+        mini.add_middleware(ProfilingMiddleware, store=store)
+        client = TestClient(mini)
+
+        client.get("/slow")
+        client.get("/slow", headers={"X-Profile": "1.forged"})
+        assert store.list() == []
+
+        token = sign_profile_token(int(time.time()) + 60)
+        response = client.get("/slow", headers={"X-Profile": token})
+        request_id = response.headers["X-Request-ID"]
+        profiler = store.get(request_id)
+        assert profiler is not None
+        assert "busy_wait" in profiler.collapsed()
+
+
+class TestProfilingEndpoints:
+    """Test cases for the admin profiling API."""
+
+    def test_disabled_by_default(self, client, admin_headers):
+        """Test the endpoints don't exist unless enabled."""
+        response = client.post(
+            "/api/admin/profiling/capture?seconds=0.01", headers=admin_headers
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_admin_only(self, client, auth_headers, profiling_enabled):
+        """Test regular users are refused."""
+        response = client.post("/api/admin/profiling/token", headers=auth_headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_capture(self, client, admin_headers, profiling_enabled):
+        """Test a worker-wide capture returns a profile file."""
+        response = client.post(
+            "/api/admin/profiling/capture?seconds=0.05&format=speedscope",
+            headers=admin_headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Worker-PID" in response.headers
+        assert response.json()["exporter"] == "insightcare-profiler"
+
+        response = client.post("/api/admin/profiling/token", headers=admin_headers)
+        assert verify_profile_token(response.json()["value"])
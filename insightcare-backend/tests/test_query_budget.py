@@ -0,0 +1,84 @@
+import pytest
+from fastapi import status
+from app.models.user import User
+from app.utils.query_stats import QueryCounter, statement_shape
+from tests.conftest import engine
+
+# Maximum SQL statements per endpoint. Raise a budget only together with the
+# change that needs the extra query.
+QUERY_BUDGETS = {
+    "login": 5,
+    "diagnose": 3,
+    "history": 3,
+    "me": 1,
+}
+
+# Same statement shape this many times in one request fails the test
+REPEAT_LIMIT = 3
+
+
+def _call(client, auth_headers, endpoint):
+    if endpoint == "login":
+        return client.post(
+            "/api/auth/login",
+            json={"email": "test@example.com", "password": "Test123!"},
+        )
+    if endpoint == "diagnose":
+        return client.post(
+            "/api/diagnose", json={"symptoms": ["fever", "cough"]}, headers=auth_headers
+        )
+    if endpoint == "history":
+        return client.get("/api/history", headers=auth_headers)
+    return client.get("/api/auth/me", headers=auth_headers)
+
+
+class TestQueryBudgets:
+    """Test cases keeping per-endpoint query counts from regressing."""
+
+    @pytest.mark.parametrize("endpoint", sorted(QUERY_BUDGETS))
+    def test_endpoint_within_budget(self, client, auth_headers, endpoint):
+        """Test each endpoint stays within its query budget without N+1s."""
+        # Populate history so list endpoints would show an N+1
+        for _ in range(REPEAT_LIMIT + 1):
+            _call(client, auth_headers, "diagnose")
+
+        with QueryCounter(engine) as queries:
+            response = _call(client, auth_headers, endpoint)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert queries.count <= QUERY_BUDGETS[endpoint], queries.statements
+        assert queries.repeated(REPEAT_LIMIT) == []
+
+    def test_server_timing_header(self, client, auth_headers):
+        """Test debug mode reports the request's DB work."""
+        response = client.get("/api/auth/me", headers=auth_headers)
+        assert response.headers["Server-Timing"].endswith('desc="1 queries"')
+
+
+class TestQueryStats:
+    """Test cases for statement shapes and N+1 detection."""
+
+    def test_statement_shape(self):
+        """Test literals and IN-lists are collapsed."""
+        assert statement_shape("SELECT * FROM t WHERE a = 5 AND b = 'x'") == (
+            "SELECT * FROM t WHERE a = ? AND b = ?"
+        )
+        assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == (
+            statement_shape("SELECT * FROM t WHERE id IN (?)")
+        )
+
+    def test_lazy_loading_is_flagged(self, db_session, test_user):
+        """Test a lazy relationship in a loop shows up as a repeated shape."""
+        for i in range(4):
+            db_session.add(
+                User(name="Other", email=f"user{i}@example.com", password_hash="x")
+            )
+        db_session.commit()
+        db_session.expire_all()
+
+        with QueryCounter(engine) as queries:
+            for user in db_session.query(User).all():
+                user.diagnoses  # one SELECT per user
+        [(shape, count)] = queries.repeated(REPEAT_LIMIT)
+        assert count == 5
+        assert "FROM diagnoses" in shape
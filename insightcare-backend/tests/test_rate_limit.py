@@ -0,0 +1,129 @@
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from app.middleware.rate_limit import (
+    MemoryTokenBucketBackend,
+    RateLimitMiddleware,
+    get_client_ip,
+    get_rate_limit_key,
+    get_route_cost,
+    parse_trusted_proxies,
+)
+from app.utils.security import create_access_token
+
+
+def _request(peer="10.0.0.1", headers=None):
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": raw_headers,
+            "client": (peer, 1234),
+        }
+    )
+
+
+@pytest.fixture
+def limited_app():
+    backend = MemoryTokenBucketBackend()
+    app = FastAPI()
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=backend,
+        capacity=10,
+        per_minute=1,
+        route_costs={"/expensive": 10},
+        enabled=True,
+    )
+
+    @app.get("/cheap")
+    def cheap():
+        return {"ok": True}
+
+    @app.get("/expensive")
+    def expensive():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+class TestTokenBucket:
+    """Test cases for the in-memory token bucket backend."""
+
+    @pytest.mark.asyncio
+    async def test_consume_until_empty(self):
+        """Test tokens run out and a retry delay is reported."""
+        backend = MemoryTokenBucketBackend()
+        allowed, remaining, _ = await backend.consume("k", 3, capacity=5, rate=1)
+        assert allowed and remaining == pytest.approx(2, abs=0.01)
+        allowed, _, retry_after = await backend.consume("k", 3, capacity=5, rate=1)
+        assert not allowed
+        assert retry_after == pytest.approx(1, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_refilled_buckets_pruned(self, monkeypatch):
+        """Test idle, full buckets are dropped; draining ones are kept."""
+        backend = MemoryTokenBucketBackend()
+        backend.PRUNE_EVERY = 3
+        clock = [100.0]
+        monkeypatch.setattr("time.monotonic", lambda: clock[0])
+        await backend.consume("idle", 1, capacity=5, rate=1)
+        clock[0] += 6
+        await backend.consume("busy", 1, capacity=5, rate=1)
+        await backend.consume("busy", 1, capacity=5, rate=1)
+        assert set(backend._buckets) == {"busy"}
+
+
+class TestClientResolution:
+    """Test cases for rate limit keys behind proxies."""
+
+    def test_untrusted_peer_ignores_forwarded_for(self):
+        """Test X-Forwarded-For is ignored from untrusted peers."""
+        request = _request("203.0.113.9", {"X-Forwarded-For": "1.2.3.4"})
+        trusted = parse_trusted_proxies("10.0.0.0/8")
+        assert get_client_ip(request, trusted) == "203.0.113.9"
+
+    def test_trusted_proxy_chain(self):
+        """Test the rightmost untrusted hop is the client."""
+        request = _request(
+            "10.0.0.1", {"X-Forwarded-For": "6.6.6.6, 198.51.100.7, 10.0.0.2"}
+        )
+        trusted = parse_trusted_proxies("10.0.0.0/8")
+        assert get_client_ip(request, trusted) == "198.51.100.7"
+
+    def test_authenticated_requests_keyed_per_user(self):
+        """Test a valid bearer token gives a per-user key."""
+        token = create_access_token({"user_id": "abc", "email": "a@b.com"})
+        request = _request(headers={"Authorization": f"Bearer {token}"})
+        assert get_rate_limit_key(request, []) == "user:abc"
+
+    def test_invalid_token_falls_back_to_ip(self):
+        """Test a forged token is keyed by IP."""
+        request = _request(headers={"Authorization": "Bearer forged"})
+        assert get_rate_limit_key(request, []) == "ip:10.0.0.1"
+
+    def test_route_costs(self):
+        """Test diagnosis costs more than health."""
+        assert get_route_cost("/api/diagnose") > get_route_cost("/api/health")
+        assert get_route_cost("/api/unknown") == 1
+
+
+class TestRateLimitMiddleware:
+    """Test cases for the rate limit middleware."""
+
+    def test_headers_on_allowed_request(self, limited_app):
+        """Test limit headers are added."""
+        response = limited_app.get("/cheap")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["X-RateLimit-Limit"] == "10"
+        assert response.headers["X-RateLimit-Remaining"] == "9"
+
+    def test_weighted_route_exhausts_bucket(self, limited_app):
+        """Test an expensive route drains the shared bucket."""
+        assert limited_app.get("/expensive").status_code == status.HTTP_200_OK
+        response = limited_app.get("/cheap")
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response.headers["Retry-After"]) > 0
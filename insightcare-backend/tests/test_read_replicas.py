@@ -0,0 +1,129 @@
+import time
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine, text
+import app.database as database
+from app.database import Base, SessionLocal, get_db, get_read_db
+from app.main import app
+from app.models.user import User
+from app.utils.read_replicas import MemoryWriteMarks, ReadOnlySession, ReplicaRouter
+from tests.conftest import engine
+
+
+def _sqlite(path, name=None):
+    db = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    if name is not None:
+        with db.begin() as conn:
+            conn.execute(text("CREATE TABLE whoami (name TEXT)"))
+            conn.execute(text("INSERT INTO whoami VALUES (:name)"), {"name": name})
+    return db
+
+
+def _served_by(router, key=None):
+    with router.connect(key) as conn:
+        return conn.execute(text("SELECT name FROM whoami")).scalar()
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """A primary and two replicas, each knowing its name."""
+    engines = [
+        _sqlite(tmp_path / f"{name}.db", name)
+        for name in ("primary", "replica1", "replica2")
+    ]
+    yield engines
+    for db in engines:
+        db.dispose()
+
+
+class TestReplicaRouter:
+    """Test cases for routing read-only sessions."""
+
+    def test_reads_spread_over_replicas(self, databases):
+        """Test reads go round-robin to the replicas, never the primary."""
+        primary, *replicas = databases
+        router = ReplicaRouter(primary, replicas, MemoryWriteMarks(), 5, 30)
+        served = {_served_by(router) for _ in range(4)}
+        assert served == {"replica1", "replica2"}
+
+    def test_no_replicas(self, databases):
+        """Test everything reads from the primary without replicas."""
+        router = ReplicaRouter(databases[0], [], MemoryWriteMarks(), 5, 30)
+        router.note_write("user-1")
+        assert _served_by(router, "user-1") == "primary"
+
+    def test_read_your_writes(self, databases):
+        """Test a writer reads from the primary until the window ends."""
+        primary, replica, _ = databases
+        router = ReplicaRouter(primary, [replica], MemoryWriteMarks(), 0.2, 30)
+        router.note_write("user-1")
+
+        assert _served_by(router, "user-1") == "primary"
+        assert _served_by(router, "user-2") == "replica1"
+        assert _served_by(router) == "replica1"
+        time.sleep(0.25)
+        assert _served_by(router, "user-1") == "replica1"
+
+    def test_replica_down(self, databases, tmp_path):
+        """Test unreachable replicas are skipped, then retried later."""
+        primary, replica, _ = databases
+        down = _sqlite(tmp_path / "missing" / "replica.db")
+        router = ReplicaRouter(primary, [down, replica], MemoryWriteMarks(), 5, 0.2)
+        assert {_served_by(router) for _ in range(3)} == {"replica1"}
+        assert list(router._down_until) == [0]
+
+        only_down = ReplicaRouter(primary, [down], MemoryWriteMarks(), 5, 30)
+        assert _served_by(only_down) == "primary"
+        assert only_down._candidates() == []
+
+    def test_read_only_session(self, databases):
+        """Test read sessions refuse to write."""
+        db = ReadOnlySession(bind=databases[0])
+        try:
+            db.execute(text("SELECT 1"))
+            db.add(User(name="x", email="x@example.com", password_hash="x"))
+            with pytest.raises(RuntimeError):
+                db.flush()
+        finally:
+            db.close()
+
+
+@pytest.fixture
+def routed(db_session, tmp_path, monkeypatch):
+    """
+    The app's own get_db/get_read_db, with the test database as primary
+    and an empty replica.
+    """
+    replica = _sqlite(tmp_path / "replica.db")
+    Base.metadata.create_all(bind=replica)
+    router = ReplicaRouter(engine, [replica], MemoryWriteMarks(), 5, 30)
+    monkeypatch.setattr(database, "replica_router", router)
+    SessionLocal.configure(bind=engine)
+    yield router
+    SessionLocal.configure(bind=database.engine)
+    Base.metadata.drop_all(bind=replica)
+    replica.dispose()
+
+
+class TestReadYourWrites:
+    """Test cases for read-your-writes through the API."""
+
+    def test_new_diagnosis_in_history(self, client, auth_headers, routed):
+        """Test a user's new diagnosis is in their history at once."""
+        app.dependency_overrides.pop(get_db)
+        app.dependency_overrides.pop(get_read_db)
+
+        response = client.post(
+            "/api/diagnosis/analyze",
+            json={"symptoms": ["fever", "cough"]},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        history = client.get("/api/diagnosis/history", headers=auth_headers)
+        assert history.json()["total"] == 1
+
+        # Once the window is over, reads go to the (lagging) replica
+        routed.marks.reset()
+        history = client.get("/api/diagnosis/history", headers=auth_headers)
+        assert history.json()["total"] == 0
@@ -0,0 +1,111 @@
+import pytest
+from fastapi import HTTPException, status
+from app.models.patient import Patient
+from app.models.symptom import Symptom
+from app.models.user import User
+from app.schemas.diagnosis_schema import DiagnosisRequest
+from app.services.diagnosis_service import create_diagnosis
+from app.services.search_service import search_symptom_notes
+
+
+@pytest.fixture
+def notes(db_session):
+    """Symptom notes for two patients."""
+    first, second = Patient(name="Ana Lima"), Patient(name="Ben Ortiz")
+    db_session.add_all([first, second])
+    db_session.flush()
+    db_session.add_all(
+        [
+            Symptom(patient_id=first.id, text="Persistent dry cough, worse at night"),
+            Symptom(patient_id=first.id, text="Rash on both arms <itchy>"),
+            Symptom(patient_id=second.id, text="Fever and rash since Monday"),
+            Symptom(patient_id=second.id, text="Coughing fits after exercise"),
+        ]
+    )
+    db_session.commit()
+    return first, second
+
+
+class TestSymptomSearch:
+    """Test cases for full-text search over symptom notes."""
+
+    def test_prefix_matches_ranked(self, db_session, notes):
+        """Test words match as prefixes and every word must match."""
+        results, has_more = search_symptom_notes(db_session, "cough")
+        assert len(results) == 2
+        assert not has_more
+
+        results, _ = search_symptom_notes(db_session, "fever RASH")
+        assert [r["patient_id"] for r in results] == [notes[1].id]
+
+    def test_snippets_are_escaped_and_marked(self, db_session, notes):
+        """Test snippets highlight matches and escape the note's HTML."""
+        results, _ = search_symptom_notes(db_session, "rash", patient_id=notes[0].id)
+        assert results[0]["snippet"] == "<mark>Rash</mark> on both arms &lt;itchy&gt;"
+
+    def test_pagination(self, db_session, notes):
+        """Test pages of ranked results."""
+        first, has_more = search_symptom_notes(db_session, "cough", limit=1)
+        second, no_more = search_symptom_notes(db_session, "cough", page=2, limit=1)
+        assert has_more and not no_more
+        assert first[0]["id"] != second[0]["id"]
+
+    def test_query_needs_words(self, db_session):
+        """Test punctuation-only queries are refused."""
+        with pytest.raises(HTTPException) as exc:
+            search_symptom_notes(db_session, "*:()")
+        assert exc.value.status_code == 400
+
+    def test_search_endpoint(self, client, db_session, test_user, auth_headers, notes):
+        """Test doctors search notes over HTTP; patients can't."""
+        params = {"q": "rash", "patient_id": notes[0].id}
+        response = client.get(
+            "/api/symptoms/search", params=params, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        test_user.role = "doctor"
+        db_session.commit()
+        response = client.get(
+            "/api/symptoms/search", params=params, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert (body["page"], body["has_more"]) == (1, False)
+        assert [r["snippet"] for r in body["results"]] == [
+            "<mark>Rash</mark> on both arms &lt;itchy&gt;"
+        ]
+
+
+class TestDiagnosisSearch:
+    """Test cases for searching diagnoses by symptom."""
+
+    def test_search_own_diagnoses(self, client, db_session, auth_headers, test_user):
+        """Test users find their diagnoses with the matching symptoms."""
+        for symptoms in (["fever", "skin rash"], ["cough"], ["rash"]):
+            create_diagnosis(
+                db_session, test_user.id, DiagnosisRequest(symptoms=symptoms)
+            )
+
+        response = client.get(
+            "/api/diagnosis/search", params={"q": "ras"}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert sorted(r["matched_symptoms"][0] for r in results) == [
+            "rash",
+            "skin rash",
+        ]
+        assert all("top_prediction" in r for r in results)
+
+    def test_other_users_hidden(self, client, db_session, auth_headers):
+        """Test patients don't see other users' diagnoses."""
+        other = User(name="Other", email="other@example.com", password_hash="x")
+        db_session.add(other)
+        db_session.commit()
+        create_diagnosis(db_session, other.id, DiagnosisRequest(symptoms=["rash"]))
+
+        response = client.get(
+            "/api/diagnosis/search", params={"q": "rash"}, headers=auth_headers
+        )
+        assert response.json()["results"] == []
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import create_engine, text
+from app.startup import StartupTimer, check_schema_revision, get_alembic_head
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def _stamp(engine, revision):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32))"))
+        conn.execute(
+            text("INSERT INTO alembic_version (version_num) VALUES (:rev)"),
+            {"rev": revision},
+        )
+
+
+class TestSchemaCheck:
+    """Test cases for the startup schema revision check."""
+
+    def test_head_is_read_from_migration_scripts(self):
+        """Test the head revision comes from alembic/versions."""
+        head = get_alembic_head()
+        assert head and head != "c513f622e797"
+
+    def test_uninitialized_database(self, sqlite_engine):
+        """Test a database without alembic_version is reported, not fatal."""
+        result = check_schema_revision(sqlite_engine)
+        assert result["status"] == "uninitialized"
+        assert result["current"] is None
+
+    def test_current_database(self, sqlite_engine):
+        """Test a database stamped at head is current."""
+        _stamp(sqlite_engine, get_alembic_head())
+        result = check_schema_revision(sqlite_engine)
+        assert result["status"] == "current"
+
+    def test_out_of_date_database(self, sqlite_engine):
+        """Test a database behind head is flagged."""
+        _stamp(sqlite_engine, "c513f622e797")
+        result = check_schema_revision(sqlite_engine)
+        assert result["status"] == "out_of_date"
+        assert result["current"] == "c513f622e797"
+
+    def test_unavailable_database(self):
+        """Test an unreachable database doesn't raise."""
+        engine = create_engine("sqlite:////nonexistent-dir/insightcare.db")
+        result = check_schema_revision(engine)
+        assert result["status"] == "unavailable"
+
+
+class TestStartupTimer:
+    """Test cases for the startup-time breakdown."""
+
+    def test_marks_and_phases(self):
+        """Test sequential marks and explicit phases are both recorded."""
+        timer = StartupTimer()
+        timer.mark("imports")
+        with timer.phase("schema_check"):
+            pass
+        assert set(timer.phases) == {"imports", "schema_check"}
+        assert all(v.endswith("s") for v in timer.breakdown().values())
@@ -0,0 +1,216 @@
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from fastapi import HTTPException, status
+from app.models.audit_log import AuditLog
+from app.models.patient import Patient
+from app.models.symptom import Symptom
+from app.services.symptom_service import get_symptom_timeline, list_symptom_entries
+from app.utils.pagination import encode_cursor
+
+# A Wednesday
+START = datetime(2026, 3, 4, 9, 0)
+
+
+@pytest.fixture
+def patient(db_session):
+    """A patient with symptoms over ten days, two on most days."""
+    patient = Patient(name="Ana Lima", age=34)
+    db_session.add(patient)
+    db_session.flush()
+    severities = ["mild", "severe", None, "moderate"]
+    db_session.add_all(
+        Symptom(
+            patient_id=patient.id,
+            text=f"note {n}",
+            structured={"n": n},
+            severity=severities[n % 4],
+            created_at=START + timedelta(hours=12 * n),
+        )
+        for n in range(20)
+    )
+    db_session.commit()
+    return patient
+
+
+class TestSymptomTimeline:
+    """Test cases for bucketed symptom timelines."""
+
+    def test_daily_buckets(self, db_session, patient):
+        """Test days are counted with their worst severity."""
+        timeline = get_symptom_timeline(
+            db_session, patient.id, "day", START, START + timedelta(days=3)
+        )
+        assert timeline["buckets"] == [
+            {"start": date(2026, 3, 4), "count": 2, "max_severity": "severe"},
+            {"start": date(2026, 3, 5), "count": 2, "max_severity": "moderate"},
+            {"start": date(2026, 3, 6), "count": 2, "max_severity": "severe"},
+        ]
+
+    def test_weekly_buckets_start_monday(self, db_session, patient):
+        """Test weeks are keyed by their Monday."""
+        timeline = get_symptom_timeline(
+            db_session, patient.id, "week", START, START + timedelta(days=30)
+        )
+        assert [(b["start"], b["count"]) for b in timeline["buckets"]] == [
+            (date(2026, 3, 2), 10),
+            (date(2026, 3, 9), 10),
+        ]
+
+    def test_naive_start_with_default_end(self, db_session, patient):
+        """Test a naive start is compared with the aware default end."""
+        start = datetime.now() - timedelta(days=7)
+        timeline = get_symptom_timeline(db_session, patient.id, "day", start)
+        assert timeline["start"] == start.replace(tzinfo=timezone.utc)
+        assert timeline["buckets"] == []
+
+    def test_window_is_bounded(self, db_session, patient):
+        """Test windows wider than MAX_BUCKETS are refused."""
+        with pytest.raises(HTTPException) as exc:
+            get_symptom_timeline(
+                db_session, patient.id, "day", START, START + timedelta(days=400)
+            )
+        assert exc.value.status_code == 400
+
+    def test_entries_pages(self, db_session, patient):
+        """Test entries page newest first without the structured data."""
+        seen, cursor = [], None
+        while True:
+            items, cursor = list_symptom_entries(
+                db_session, patient.id, limit=6, cursor=cursor
+            )
+            seen.extend(items)
+            if cursor is None:
+                break
+        assert [item["text"] for item in seen] == [
+            f"note {n}" for n in reversed(range(20))
+        ]
+        assert "structured" not in seen[0]
+
+    def test_entries_cursor_id_must_be_int(self, db_session, patient):
+        """Test a well-formed cursor with a non-integer id is refused."""
+        created_at = START.isoformat()
+        for bad in ("a", 1.5, True, None):
+            with pytest.raises(HTTPException) as exc:
+                list_symptom_entries(
+                    db_session, patient.id, cursor=encode_cursor(created_at, bad)
+                )
+            assert exc.value.status_code == 400
+
+
+@pytest.fixture
+def doctor_headers(db_session, test_user, auth_headers):
+    test_user.role = "doctor"
+    db_session.commit()
+    return auth_headers
+
+
+class TestSymptomAPI:
+    """Test cases for the /api/symptoms endpoints."""
+
+    def test_list_pages(self, client, doctor_headers, patient):
+        """Test the entries page through every symptom over HTTP."""
+        seen, params = [], {"limit": 6}
+        while True:
+            response = client.get(
+                f"/api/symptoms/patient/{patient.id}",
+                params=params,
+                headers=doctor_headers,
+            )
+            assert response.status_code == status.HTTP_200_OK
+            page = response.json()
+            seen.extend(item["text"] for item in page["items"])
+            if page["next_cursor"] is None:
+                break
+            params["cursor"] = page["next_cursor"]
+        assert seen == [f"note {n}" for n in reversed(range(20))]
+
+    def test_timeline(self, client, doctor_headers, patient):
+        """Test the timeline is served over HTTP."""
+        response = client.get(
+            f"/api/symptoms/patient/{patient.id}/timeline",
+            params={
+                "bucket": "week",
+                "start": START.isoformat(),
+                "end": (START + timedelta(days=30)).isoformat(),
+            },
+            headers=doctor_headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        buckets = response.json()["buckets"]
+        assert [(b["start"], b["count"]) for b in buckets] == [
+            ("2026-03-02", 10),
+            ("2026-03-09", 10),
+        ]
+
+    def test_timeline_naive_start(self, client, doctor_headers, patient):
+        """Test a naive start with no end is a window, not a 500."""
+        response = client.get(
+            f"/api/symptoms/patient/{patient.id}/timeline",
+            params={"start": START.isoformat()},
+            headers=doctor_headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert sum(b["count"] for b in response.json()["buckets"]) == 20
+
+    def test_timeline_bucket_validated(self, client, doctor_headers, patient):
+        """Test only day and week buckets are accepted."""
+        response = client.get(
+            f"/api/symptoms/patient/{patient.id}/timeline",
+            params={"bucket": "month"},
+            headers=doctor_headers,
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_requires_auth(self, client, patient):
+        """Test symptoms aren't served without a token."""
+        response = client.get(f"/api/symptoms/patient/{patient.id}")
+        assert response.status_code in (
+            status.HTTP_401_UNAUTHORIZED,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    def test_patients_cant_read_or_record(self, client, auth_headers, patient):
+        """Test patients (the default role) can't read or record symptoms."""
+        for path in ("", "/timeline"):
+            response = client.get(
+                f"/api/symptoms/patient/{patient.id}{path}", headers=auth_headers
+            )
+            assert response.status_code == status.HTTP_403_FORBIDDEN
+        response = client.post(
+            "/api/symptoms/",
+            json={"patient_id": patient.id, "text": "fever"},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_create_shows_up_in_list(
+        self, client, db_session, test_user, doctor_headers
+    ):
+        """Test a recorded symptom is audited and listed."""
+        patient = Patient(name="Ben Ortiz")
+        db_session.add(patient)
+        db_session.commit()
+        response = client.post(
+            "/api/symptoms/",
+            json={"patient_id": patient.id, "text": "<b>fever</b>", "severity": "mild"},
+            headers=doctor_headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        created = response.json()
+        assert created["text"] == "fever"
+        assert created["reported_by"] == str(test_user.id)
+        assert db_session.query(AuditLog).filter_by(event_type="create_symptom").count()
+
+        items = client.get(
+            f"/api/symptoms/patient/{patient.id}", headers=doctor_headers
+        ).json()["items"]
+        assert [item["id"] for item in items] == [created["id"]]
+
+    def test_create_unknown_patient(self, client, doctor_headers):
+        """Test symptoms for unknown patients are refused."""
+        response = client.post(
+            "/api/symptoms/",
+            json={"patient_id": 999, "text": "fever"},
+            headers=doctor_headers,
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,115 @@
+from datetime import timedelta
+from fastapi import status
+from app.models.user_token import UserToken
+from app.services.token_service import (
+    EMAIL_VERIFICATION,
+    PASSWORD_RESET,
+    hash_token,
+    issue_token,
+    purge_expired_tokens,
+)
+
+
+class TestTokenStorage:
+    """Test cases for hashed user tokens."""
+
+    def test_only_hash_is_stored(self, db_session, test_user):
+        """Test the raw token never reaches the database."""
+        token = issue_token(
+            db_session, test_user.id, PASSWORD_RESET, timedelta(hours=1)
+        )
+        db_session.commit()
+        record = db_session.query(UserToken).one()
+        assert record.token_hash == hash_token(token)
+        assert token not in record.token_hash
+
+    def test_reissue_revokes_previous(self, db_session, test_user):
+        """Test a new token replaces the outstanding one."""
+        issue_token(db_session, test_user.id, PASSWORD_RESET, timedelta(hours=1))
+        issue_token(db_session, test_user.id, PASSWORD_RESET, timedelta(hours=1))
+        issue_token(db_session, test_user.id, EMAIL_VERIFICATION, timedelta(hours=1))
+        db_session.commit()
+        assert db_session.query(UserToken).count() == 2
+
+    def test_purge_expired_in_batches(self, db_session, test_user):
+        """Test the sweeper deletes only expired rows."""
+        for purpose in ("a", "b", "c", "d", "e"):
+            issue_token(db_session, test_user.id, purpose, timedelta(hours=-1))
+        issue_token(db_session, test_user.id, PASSWORD_RESET, timedelta(hours=1))
+        db_session.commit()
+        assert purge_expired_tokens(db_session, batch_size=2) == 5
+        assert db_session.query(UserToken).count() == 1
+
+
+class TestPasswordReset:
+    """Test cases for password reset redemption."""
+
+    def test_reset_password_success(self, client, db_session, test_user):
+        """Test a valid token resets the password once."""
+        token = issue_token(
+            db_session, test_user.id, PASSWORD_RESET, timedelta(hours=1)
+        )
+        db_session.commit()
+
+        response = client.post(
+            "/api/auth/reset-password",
+            json={"token": token, "new_password": "NewPass123"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = client.post(
+            "/api/auth/login", json={"email": test_user.email, "password": "NewPass123"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        # Tokens are single use
+        response = client.post(
+            "/api/auth/reset-password",
+            json={"token": token, "new_password": "Another123"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_reset_password_expired(self, client, db_session, test_user):
+        """Test an expired token is rejected."""
+        token = issue_token(
+            db_session, test_user.id, PASSWORD_RESET, timedelta(minutes=-1)
+        )
+        db_session.commit()
+        response = client.post(
+            "/api/auth/reset-password",
+            json={"token": token, "new_password": "NewPass123"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Reset token has expired"
+
+    def test_verification_token_not_valid_for_reset(
+        self, client, db_session, test_user
+    ):
+        """Test tokens are scoped to their purpose."""
+        token = issue_token(
+            db_session, test_user.id, EMAIL_VERIFICATION, timedelta(hours=1)
+        )
+        db_session.commit()
+        response = client.post(
+            "/api/auth/reset-password",
+            json={"token": token, "new_password": "NewPass123"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestEmailVerification:
+    """Test cases for email verification redemption."""
+
+    def test_verify_email_success(self, client, db_session, test_user):
+        """Test a valid token verifies the account."""
+        test_user.is_verified = False
+        token = issue_token(
+            db_session, test_user.id, EMAIL_VERIFICATION, timedelta(hours=1)
+        )
+        db_session.commit()
+
+        response = client.post("/api/auth/verify-email", json={"token": token})
+        assert response.status_code == status.HTTP_200_OK
+        db_session.refresh(test_user)
+        assert test_user.is_verified
+        assert db_session.query(UserToken).count() == 0